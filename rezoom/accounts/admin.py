@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from .models import User, UserProfile
+from skills.utils import intern_profile_skills
 
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
@@ -22,3 +23,7 @@ class UserProfileAdmin(admin.ModelAdmin):
         "github_url","resume",
     )
     search_fields = ("user__username","user__email","github_url","visa_status","contract_type")
+
+    def save_model(self, request, obj, form, change):
+        intern_profile_skills(obj)
+        super().save_model(request, obj, form, change)
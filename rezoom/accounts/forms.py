@@ -1,5 +1,8 @@
 from django import forms
 from .models import User, UserProfile
+from skills.utils import intern_profile_skills
+from tasks.queue import enqueue
+from django.db import transaction
 import json
 
 class ProfileForm(forms.ModelForm):
@@ -92,7 +95,14 @@ class ProfileForm(forms.ModelForm):
         prof.education  = self._lines_to_list(cd.get("education_text",""))
         prof.experience = self._lines_to_list(cd.get("experience_text",""))
         prof.projects   = cd.get("projects_json") or []
+        intern_profile_skills(prof)  # skills/project techs → Skill ids, once per save
+
+        new_resume = "resume" in self.changed_data
+        if new_resume:
+            prof.resume_text = None  # re-extracted off the request path
 
         if commit:
             prof.save()
+            if new_resume and prof.resume:
+                transaction.on_commit(lambda: enqueue("resume.extract", {"profile_id": prof.pk}))
         return prof
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_skill_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('ok', 'Extracted'), ('unsupported', 'Unsupported format'), ('error', 'Extraction failed')], default='ok', max_length=12)),
+                ('text', models.TextField(blank=True)),
+                ('skill_ids', models.JSONField(blank=True, default=list)),
+                ('extracted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='resume_text',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.resumetext'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_resumetext_userprofile_resume_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumetext',
+            name='terms',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
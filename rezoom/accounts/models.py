@@ -9,11 +9,36 @@ class User(AbstractUser):
         EMP  = "EMP", "Employee"   # interviewer/reviewer
     role = models.CharField(max_length=8, choices=Role.choices, default=Role.USER)
     google_sub = models.CharField(max_length=128, blank=True, null=True, unique=True)  # for OAuth later
+    # denormalized count of unread notifications (nav badge); kept in step by notifications.utils
+    unread_notifications = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
 
 
+class ResumeText(models.Model):
+    """
+    Plain text extracted from an uploaded resume, stored once per file content hash.
+    Profiles and applications point here, so the same file is never processed twice
+    (a failed extraction is retried the next time the file comes in).
+    """
+    class Status(models.TextChoices):
+        OK          = "ok", "Extracted"
+        UNSUPPORTED = "unsupported", "Unsupported format"
+        ERROR       = "error", "Extraction failed"
+
+    content_hash = models.CharField(max_length=64, unique=True)   # sha256 of the file bytes
+    size = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.OK)
+    text = models.TextField(blank=True)                           # capped at RESUME_TEXT_MAX_CHARS
+    skill_ids = models.JSONField(default=list, blank=True)        # skills.Skill ids found in the text
+    terms = models.JSONField(default=dict, blank=True)            # term → count over the full text (TF-IDF)
+    extracted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Resume {self.content_hash[:12]} [{self.status}]"
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
 
@@ -28,6 +53,7 @@ class UserProfile(models.Model):
     # Structured data
     education = models.JSONField(default=list, blank=True)          # [{degree, school, year, grade}]
     skills = models.JSONField(default=list, blank=True)             # ["Django","GSAP","Lenis",...]
+    skill_ids = models.JSONField(default=list, blank=True)          # interned skills.Skill ids for `skills`
     experience = models.JSONField(default=list, blank=True)         # [{company, title, start, end, years, desc}]
     projects = models.JSONField(default=list, blank=True)           # [{title, technologies:[...], github}]
     interests = models.JSONField(default=list, blank=True)
@@ -41,6 +67,7 @@ class UserProfile(models.Model):
 
     # Files
     resume = models.FileField(upload_to="resumes/", blank=True, null=True)
+    resume_text = models.ForeignKey(ResumeText, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
 
     # housekeeping
     created_at = models.DateTimeField(default=timezone.now)
@@ -0,0 +1,178 @@
+"""
+Resume text extraction. Everything streams: files are hashed and parsed in
+fixed-size chunks, so a 20 MB upload never sits in memory at once.
+"""
+import codecs
+import hashlib
+import logging
+import os
+import re
+import zipfile
+from collections import Counter
+from xml.etree.ElementTree import iterparse
+from django.conf import settings
+from django.utils import timezone
+from rezoom.text import term_counts
+from skills.models import SkillAlias
+from .models import ResumeText
+
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+MAX_NGRAM = 3  # longest alias we try to spot, in words ("amazon web services")
+MAX_WORD = 1024  # a whitespace-free run longer than this is cut anyway
+_WORDS = re.compile(r"[a-z0-9+#./-]+")
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# aliases that are also everyday words; fine in a skills list, noise in free text
+_AMBIGUOUS_ALIASES = {"go", "ci", "pg", "ts", "py"}
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF support is optional
+    PdfReader = None
+
+
+def file_sha256(field_file) -> tuple[str, int]:
+    h, size = hashlib.sha256(), 0
+    field_file.open("rb")
+    try:
+        for chunk in field_file.chunks(CHUNK_SIZE):
+            h.update(chunk)
+            size += len(chunk)
+    finally:
+        field_file.close()
+    return h.hexdigest(), size
+
+
+def _iter_txt(f):
+    dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield dec.decode(chunk)
+    yield dec.decode(b"", final=True)
+
+
+def _iter_docx(f):
+    with zipfile.ZipFile(f) as zf, zf.open("word/document.xml") as xml:
+        for _, el in iterparse(xml, events=("end",)):
+            if el.tag == _W_NS + "t" and el.text:
+                yield el.text
+            elif el.tag == _W_NS + "p":
+                yield "\n"
+                el.clear()  # drop parsed paragraphs as we go
+
+
+def _iter_pdf(f):
+    for page in PdfReader(f).pages:  # pages are parsed lazily, one at a time
+        yield (page.extract_text() or "") + "\n"
+
+
+def _whole_words(pieces):
+    """Re-cut a stream of text pieces at whitespace, so no word is split between two pieces."""
+    carry = ""
+    for piece in pieces:
+        piece = carry + piece
+        i = len(piece)
+        while i and not piece[i - 1].isspace():
+            i -= 1
+        if i == 0 and len(piece) < MAX_WORD:  # no whitespace yet: keep collecting
+            carry = piece
+            continue
+        i = i or len(piece)
+        yield piece[:i]
+        carry = piece[i:]
+    if carry:
+        yield carry
+
+
+def _reader_for(field_file):
+    ext = os.path.splitext(field_file.name)[1].lower()
+    if ext in (".txt", ".md", ".text"):
+        return _iter_txt
+    if ext == ".docx":
+        return _iter_docx
+    if ext == ".pdf" and PdfReader is not None:
+        return _iter_pdf
+    return None
+
+
+class _SkillSpotter:
+    """Finds alias n-grams in a stream of text pieces; carries words across piece boundaries."""
+    def __init__(self, aliases):
+        self.aliases = aliases
+        self.found = set()
+        self.tail = []
+
+    def feed(self, piece):
+        words = self.tail + [w.strip(".,/-") for w in _WORDS.findall(piece.lower())]
+        # keep the last MAX_NGRAM-1 words for the next piece so n-grams can span it
+        keep = len(words) - (MAX_NGRAM - 1)
+        for i in range(max(0, keep)):
+            self._match(words, i)
+        self.tail = words[max(0, keep):]
+
+    def close(self):
+        for i in range(len(self.tail)):
+            self._match(self.tail, i)
+        return self.found
+
+    def _match(self, words, i):
+        for n in range(1, MAX_NGRAM + 1):
+            if i + n > len(words):
+                break
+            sid = self.aliases.get(" ".join(words[i:i + n]))
+            if sid is not None:
+                self.found.add(sid)
+
+
+def alias_map() -> dict:
+    return dict(SkillAlias.objects.exclude(alias__in=_AMBIGUOUS_ALIASES).values_list("alias", "skill_id"))
+
+
+def extract_resume(field_file, aliases=None) -> ResumeText:
+    """
+    ResumeText for this file, extracting it only if its content hash is new or its
+    last extraction failed. Pass `aliases` (alias_map()) when processing many files
+    in one batch.
+    """
+    content_hash, size = file_sha256(field_file)
+    existing = ResumeText.objects.filter(content_hash=content_hash).first()
+    if existing and existing.status != ResumeText.Status.ERROR:
+        return existing
+
+    reader = _reader_for(field_file)
+    if reader is None:
+        rt, _ = ResumeText.objects.get_or_create(
+            content_hash=content_hash, defaults={"size": size, "status": ResumeText.Status.UNSUPPORTED})
+        return rt
+
+    max_chars = getattr(settings, "RESUME_TEXT_MAX_CHARS", 100_000)
+    spotter = _SkillSpotter(aliases if aliases is not None else alias_map())
+    terms = Counter()  # over the whole file, not just the stored prefix
+    parts, kept = [], 0
+    status = ResumeText.Status.OK
+    field_file.open("rb")
+    try:
+        for piece in _whole_words(reader(field_file)):
+            spotter.feed(piece)
+            terms.update(term_counts(piece))
+            if kept < max_chars:
+                parts.append(piece[:max_chars - kept])
+                kept += len(parts[-1])
+    except Exception:
+        log.exception("resume extraction failed for %s", field_file.name)
+        status = ResumeText.Status.ERROR
+    finally:
+        field_file.close()
+
+    fields = {"size": size, "status": status, "text": "".join(parts), "skill_ids": sorted(spotter.close()),
+              "terms": dict(terms)}
+    if existing:  # a retry: replace the failed row unless another worker already did
+        ResumeText.objects.filter(pk=existing.pk, status=ResumeText.Status.ERROR).update(
+            **fields, extracted_at=timezone.now())
+        existing.refresh_from_db()
+        return existing
+    rt, _ = ResumeText.objects.get_or_create(content_hash=content_hash, defaults=fields)
+    return rt
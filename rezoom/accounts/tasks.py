@@ -0,0 +1,23 @@
+import logging
+from django.db import transaction
+from tasks.queue import register
+from .models import UserProfile
+from .resumes import alias_map, extract_resume
+
+log = logging.getLogger(__name__)
+
+@register("resume.extract")
+def extract_profile_resumes(tasks):
+    """Extract text + skills from newly uploaded profile resumes. Payload: {"profile_id"}."""
+    profiles = list(UserProfile.objects.filter(id__in=[t.payload["profile_id"] for t in tasks]))
+    aliases = alias_map()
+    for prof in profiles:
+        prof.resume_text = None
+        if not prof.resume:
+            continue
+        try:
+            with transaction.atomic():  # one missing or unreadable file mustn't fail the batch
+                prof.resume_text = extract_resume(prof.resume, aliases)
+        except Exception:
+            log.exception("resume of profile %s could not be read", prof.id)
+    UserProfile.objects.bulk_update(profiles, ["resume_text"])
@@ -1,3 +1,117 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from skills.models import Skill
+from tasks.queue import enqueue_many
+from tasks.worker import run
+from . import resumes
+from .models import ResumeText, User, UserProfile
+from .resumes import extract_resume
 
-# Create your tests here.
+TEXT = ("Backend engineer. Five years of Python and Django on Amazon Web Services;\n"
+        "shipped Kubernetes operators, and I go hiking on weekends.\n")
+
+
+def docx(text):
+    paras = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in text.splitlines())
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml",
+                    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                    f"<w:body>{paras}</w:body></w:document>")
+    return buf.getvalue()
+
+
+def pdf(text):
+    """A one-page PDF showing `text` (one line per text line), built by hand."""
+    ops = " ".join(f"({line}) Tj T*" for line in text.splitlines())
+    stream = f"BT /F1 10 Tf 14 TL 40 740 Td {ops} ET".encode()
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>", b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+            b"/Resources << /Font << /F1 5 0 R >> >> >>",
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    out, offsets = b"%PDF-1.4\n", []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return out
+
+
+class ResumeExtractionTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.profile = User.objects.create_user("cand").profile
+
+    def _file(self, name, data):
+        self.profile.resume.save(name, ContentFile(data), save=False)
+        return self.profile.resume
+
+    def _skills(self, *names):
+        return sorted(Skill.objects.filter(name__in=names).values_list("id", flat=True))
+
+    def test_formats(self):
+        want = self._skills("Python", "Django", "Amazon Web Services", "Kubernetes")
+        for name, data in (("cv.txt", TEXT.encode()), ("cv.docx", docx(TEXT)), ("cv.pdf", pdf(TEXT))):
+            with self.subTest(name=name):
+                rt = extract_resume(self._file(name, data))
+                self.assertEqual(rt.status, ResumeText.Status.OK)
+                self.assertIn("Kubernetes operators", rt.text)
+                self.assertEqual(rt.skill_ids, want)  # "go" in free text is not Go
+                self.assertEqual(rt.terms["python"], 1)
+
+    def test_skills_span_chunk_boundaries_and_terms_cover_the_whole_file(self):
+        with mock.patch.object(resumes, "CHUNK_SIZE", 7), override_settings(RESUME_TEXT_MAX_CHARS=20):
+            rt = extract_resume(self._file("cv.txt", TEXT.encode()))
+        self.assertEqual(rt.skill_ids, self._skills("Python", "Django", "Amazon Web Services", "Kubernetes"))
+        self.assertEqual(rt.text, TEXT[:20])
+        self.assertEqual(rt.terms["kubernetes"], 1)
+
+    def test_same_content_is_extracted_once(self):
+        first = extract_resume(self._file("a.txt", TEXT.encode()))
+        with mock.patch.object(resumes, "_reader_for") as reader:
+            again = extract_resume(self._file("b.txt", TEXT.encode()))
+        reader.assert_not_called()
+        self.assertEqual(again.pk, first.pk)
+
+    def test_unsupported_and_broken_files(self):
+        self.assertEqual(extract_resume(self._file("cv.rtf", b"{\\rtf1 Python}")).status,
+                         ResumeText.Status.UNSUPPORTED)
+        with self.assertLogs("accounts.resumes", "ERROR"):
+            broken = extract_resume(self._file("cv.docx", b"not a zip"))
+        self.assertEqual((broken.status, broken.skill_ids), (ResumeText.Status.ERROR, []))
+
+    def test_failed_extraction_is_retried(self):
+        data = TEXT.encode()
+        with mock.patch.object(resumes, "_iter_txt", side_effect=OSError("disk hiccup")), \
+                self.assertLogs("accounts.resumes", "ERROR"):
+            failed = extract_resume(self._file("cv.txt", data))
+        self.assertEqual(failed.status, ResumeText.Status.ERROR)
+        retried = extract_resume(self._file("cv.txt", data))
+        self.assertEqual((retried.pk, retried.status), (failed.pk, ResumeText.Status.OK))
+        self.assertIn("Python", retried.text)
+
+    def test_extract_task_skips_unreadable_files(self):
+        good = self.profile
+        good.resume.save("cv.txt", ContentFile(TEXT.encode()))
+        missing = User.objects.create_user("other").profile
+        UserProfile.objects.filter(pk=missing.pk).update(resume="resumes/does-not-exist.pdf")
+        enqueue_many("resume.extract", [{"profile_id": p.pk} for p in (good, missing)])
+        with self.assertLogs("accounts.tasks", "ERROR"):
+            self.assertEqual(run(["resume.extract"]), (2, 0))
+        good.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual(good.resume_text.status, ResumeText.Status.OK)
+        self.assertIsNone(missing.resume_text)
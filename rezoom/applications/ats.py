@@ -1,60 +1,180 @@
 from __future__ import annotations
+import hashlib
+import json
+from django.conf import settings
+from skills.utils import normalize
+
+DEFAULT_WEIGHTS = {"req": 0.50, "tools": 0.20, "projects": 0.10, "github": 0.05}
+DEFAULT_THRESHOLD = 70
+DEFAULT_VISA_CAP = 50
+
+# overridable from settings; try new values with `manage.py simulate_ats` first
+ATS_WEIGHTS = {**DEFAULT_WEIGHTS, **getattr(settings, "ATS_WEIGHTS", {})}
+ATS_THRESHOLD = getattr(settings, "ATS_THRESHOLD", DEFAULT_THRESHOLD)  # >= threshold → employee_review, else rejected
+ATS_VISA_CAP = getattr(settings, "ATS_VISA_CAP", DEFAULT_VISA_CAP)
+
+def _blend_version(weights, visa_cap):
+    if weights == DEFAULT_WEIGHTS and visa_cap == DEFAULT_VISA_CAP:
+        return "v1"
+    key = json.dumps([weights, visa_cap], sort_keys=True)
+    return "v1-" + hashlib.sha1(key.encode()).hexdigest()[:8]
+
+# bump when the blend changes; stored on ApplicationScore / ATSScoreCache.
+# Custom weights get their own suffix so cached scores never mix blends.
+ATS_MODEL_VERSION = _blend_version(ATS_WEIGHTS, ATS_VISA_CAP)
+
+# the only fields the scorer reads — a change anywhere else must not invalidate cached scores
+PROFILE_SCORE_FIELDS = ("skills", "skill_ids", "projects", "github_url", "visa_status")
+JOB_SCORE_FIELDS = ("req_quals", "tools", "req_skill_ids", "tool_skill_ids", "visa_sponsorship")
 
 def _norm_list(xs):
-    return [x.strip().lower() for x in (xs or []) if str(x).strip()]
+    return [n for n in (normalize(x) for x in (xs or [])) if n]
 
-def score_profile_against_job(profile, job) -> tuple[int, dict]:
+def _get(obj, name, default=None):
+    """Read a field from a UserProfile or from an Application.profile_snapshot dict."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+def with_resume_skills(snapshot, resume_skill_ids) -> dict:
     """
-    Returns (score_0_100, summary_dict)
-    Heuristic blend:
-      - skills vs req_quals/tools (70%)
-      - projects (10%)
-      - github link (5%)
-      - simple visa sanity (15% cap adjustment)
+    The profile as scored: `snapshot` with the skills found in the application's resume
+    merged into skill_ids. The ATS worker, rescore_job and the simulator all score this.
+    """
+    snapshot = snapshot or {}
+    if not resume_skill_ids:
+        return snapshot
+    return {**snapshot, "skill_ids": list(dict.fromkeys((snapshot.get("skill_ids") or []) + resume_skill_ids))}
+
+def _mask(terms, index) -> int:
+    """Bitset of the terms that appear in the job vocabulary (unknown terms can't match anything)."""
+    m = 0
+    for t in terms:
+        bit = index.get(t)
+        if bit is not None:
+            m |= bit
+    return m
+
+def _vocab(req, tools):
+    index = {t: 1 << i for i, t in enumerate(sorted(req | tools))}
+    return {
+        "index": index,
+        "req_mask": _mask(req, index),
+        "tools_mask": _mask(tools, index),
+        "req_total": max(1, len(req)),
+        "tools_total": max(1, len(tools)),
+    }
+
+def _compile_job(job):
+    """
+    Encode the job's req_quals/tools over one shared vocabulary.
+    Each distinct term gets one bit, so set intersections become `&` + popcount.
+    Interned Skill ids are used when both job and profile have them; free text otherwise.
+    """
+    req_ids = set(getattr(job, "req_skill_ids", None) or [])
+    tool_ids = set(getattr(job, "tool_skill_ids", None) or [])
+    return {
+        "by_id": _vocab(req_ids, tool_ids) if (req_ids or tool_ids) else None,
+        "by_text": _vocab(set(_norm_list(job.req_quals)), set(_norm_list(job.tools))),
+        "sponsors": bool(job.visa_sponsorship),
+    }
+
+def _features(profile, cj) -> tuple:
     """
-    p_skills = set(_norm_list(profile.skills))
-    p_projects = profile.projects or []
-    p_has_github = bool((profile.github_url or "").strip())
+    (req_match, tools_match, proj_frac, github, visa_capped, proj_bonus) for one profile.
+    Everything the blend needs; the what-if simulator stores these per application.
+    """
+    p_skill_ids = _get(profile, "skill_ids")
+    by_id = cj["by_id"] is not None and bool(p_skill_ids)
+    v = cj["by_id"] if by_id else cj["by_text"]
+    index = v["index"]
+    all_mask = v["req_mask"] | v["tools_mask"]
 
-    j_req = set(_norm_list(job.req_quals))
-    j_tools = set(_norm_list(job.tools))
+    p_mask = _mask(p_skill_ids if by_id else _norm_list(_get(profile, "skills")), index)
+    p_projects = _get(profile, "projects") or []
+    p_has_github = bool((_get(profile, "github_url") or "").strip())
 
     # Skills/Tools match
-    req_total = max(1, len(j_req))
-    tools_total = max(1, len(j_tools))
-    req_match = len(p_skills & j_req) / req_total    # 0..1
-    tools_match = len(p_skills & j_tools) / tools_total
+    req_match = (p_mask & v["req_mask"]).bit_count() / v["req_total"]    # 0..1
+    tools_match = (p_mask & v["tools_mask"]).bit_count() / v["tools_total"]
 
     # Projects signal: counts + overlap of tech strings inside each project
     proj_count = min(5, len(p_projects))
     proj_bonus = 0.0
     for p in p_projects[:5]:
-        techs = set(_norm_list(p.get("technologies", [])))
-        if techs & (j_req | j_tools):
+        tech_ids = p.get("technology_ids") if by_id else None
+        if tech_ids is not None:
+            hit = _mask(tech_ids, index) & all_mask
+        else:
+            t = cj["by_text"]
+            hit = _mask(_norm_list(p.get("technologies", [])), t["index"]) & (t["req_mask"] | t["tools_mask"])
+        if hit:
             proj_bonus += 0.02  # +2% per relevant project, up to +10%
 
+    # Visa sanity: job doesn’t sponsor and profile likely needs it
+    prof_visa = (_get(profile, "visa_status") or "").lower()
+    visa_capped = not cj["sponsors"] and ("sponsor" in prof_visa or "visa" in prof_visa)
+
+    return req_match, tools_match, proj_count / 5.0, p_has_github, visa_capped, proj_bonus
+
+def _blend(features, weights=None, visa_cap=None) -> tuple[int, bool]:
+    """(score_0_100, visa_cap_applied) for a feature tuple under the given weights."""
+    w = ATS_WEIGHTS if weights is None else weights
+    cap = ATS_VISA_CAP if visa_cap is None else visa_cap
+    req_match, tools_match, proj_frac, github, visa_capped, _ = features
     base = (
-        0.50 * req_match +   # 50%
-        0.20 * tools_match + # 20%
-        0.10 * (proj_count / 5.0) +  # up to 10%
-        0.05 * (1.0 if p_has_github else 0.0)  # 5%
+        w["req"] * req_match +
+        w["tools"] * tools_match +
+        w["projects"] * proj_frac +
+        w["github"] * (1.0 if github else 0.0)
     )
-
     score = int(round(base * 100))
+    if visa_capped and score > cap:
+        return max(0, min(100, cap)), True
+    return max(0, min(100, score)), False
 
-    # Visa sanity: if job doesn’t sponsor and profile likely needs it → cap score
-    visa_cap_applied = False
-    prof_visa = (profile.visa_status or "").lower()
-    if not job.visa_sponsorship and ("sponsor" in prof_visa or "visa" in prof_visa):
-        if score > 50:
-            score = 50
-            visa_cap_applied = True
-
+def _score_one(profile, cj) -> tuple[int, dict]:
+    f = _features(profile, cj)
+    score, visa_cap_applied = _blend(f)
     summary = {
-        "req_match": round(req_match * 100),
-        "tools_match": round(tools_match * 100),
-        "proj_bonus_pct": int(proj_bonus * 100),
-        "github": p_has_github,
+        "req_match": round(f[0] * 100),
+        "tools_match": round(f[1] * 100),
+        "proj_bonus_pct": int(f[5] * 100),
+        "github": f[3],
         "visa_cap_applied": visa_cap_applied,
     }
-    return max(0, min(100, score)), summary
\ No newline at end of file
+    return score, summary
+
+def score_profiles_against_job(profiles, job) -> list[tuple[int, dict]]:
+    """
+    Batch version of score_profile_against_job: one job, N profiles.
+    `profiles` may be UserProfile instances or Application.profile_snapshot dicts.
+    The job vocabulary is encoded once; each profile then costs a few bit ops.
+    """
+    cj = _compile_job(job)
+    return [_score_one(p, cj) for p in profiles]
+
+def score_profile_against_job(profile, job) -> tuple[int, dict]:
+    """
+    Returns (score_0_100, summary_dict)
+    Heuristic blend (defaults; see ATS_WEIGHTS):
+      - skills vs req_quals/tools (50% + 20%)
+      - projects (10%)
+      - github link (5%)
+      - simple visa sanity (score capped at ATS_VISA_CAP)
+    """
+    return _score_one(profile, _compile_job(job))
+
+def ats_outcome(score: int, threshold=None) -> str:
+    return "pass" if score >= (ATS_THRESHOLD if threshold is None else threshold) else "below"
+
+def _fingerprint(obj, fields) -> str:
+    payload = json.dumps([_get(obj, f) for f in fields], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def profile_fingerprint(profile) -> str:
+    """Content hash of the scored profile fields (UserProfile or snapshot dict)."""
+    return _fingerprint(profile, PROFILE_SCORE_FIELDS)
+
+def job_fingerprint(job) -> str:
+    return _fingerprint(job, JOB_SCORE_FIELDS)
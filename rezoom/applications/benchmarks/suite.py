@@ -0,0 +1,167 @@
+"""
+ATS throughput benchmarks. Each bench returns {"ops", "seconds", "ops_per_sec", "peak_kb"}.
+
+Absolute ops/sec only mean something on the machine that produced them, so a baseline
+records that machine (machine_info) and is only compared in full there. The
+batch_speedup@N entries (bench_speedup) cancel out the host and are compared everywhere.
+"""
+import gc
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from applications.ats import score_profile_against_job, score_profiles_against_job
+from tasks.queue import claim
+from tasks.worker import run_group
+from .synthetic import SyntheticData
+
+
+def _repeats(ops):
+    """Timed runs per bench: best-of-5 for small sizes (noise dominates), one run at 1M pairs."""
+    return max(1, min(5, 300_000 // max(1, ops)))
+
+
+def _measure(fn, ops, memory=True, repeats=1):
+    seconds = None
+    for _ in range(repeats):  # best of: noise from other processes only ever adds time
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    peak_kb = None
+    if memory:  # separate traced run: tracing distorts timings
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return {"ops": ops, "seconds": round(seconds, 4),
+            "ops_per_sec": round(ops / seconds, 1) if seconds else None, "peak_kb": peak_kb}
+
+
+def _pairs_fixture(pairs, data, n_jobs=100):
+    n_jobs = min(n_jobs, pairs)
+    return data.profiles(max(1, pairs // n_jobs)), data.jobs(n_jobs)
+
+
+def bench_single(pairs, data, memory=True):
+    """score_profile_against_job, one call per (profile, job) pair."""
+    profiles, jobs = _pairs_fixture(pairs, data)
+
+    def run():
+        for job in jobs:
+            for prof in profiles:
+                score_profile_against_job(prof, job)
+    ops = len(profiles) * len(jobs)
+    return _measure(run, ops, memory, _repeats(ops))
+
+
+def bench_batch(pairs, data, memory=True):
+    """score_profiles_against_job, one call per job over all profiles."""
+    profiles, jobs = _pairs_fixture(pairs, data)
+
+    def run():
+        for job in jobs:
+            score_profiles_against_job(profiles, job)
+    ops = len(profiles) * len(jobs)
+    return _measure(run, ops, memory, _repeats(ops))
+
+
+def bench_speedup(pairs, data, rounds=None):
+    """
+    How many times faster the batch scorer is than one call per pair, on the same data:
+    the median of alternating single/batch rounds, so both sides see the same machine load.
+    """
+    profiles, jobs = _pairs_fixture(pairs, data)
+    rounds = rounds or max(3, min(15, 1_000_000 // pairs))
+    ratios = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for job in jobs:
+            for prof in profiles:
+                score_profile_against_job(prof, job)
+        t1 = time.perf_counter()
+        for job in jobs:
+            score_profiles_against_job(profiles, job)
+        ratios.append((t1 - t0) / (time.perf_counter() - t1))
+    return {"ratio": round(statistics.median(ratios), 2), "rounds": rounds}
+
+
+def bench_apply(pairs, data, memory=False):
+    """
+    End-to-end: POST apply_to_job for each pair, then drain the ATS queue.
+    Runs against the real database inside a transaction that is rolled back.
+    """
+    n_jobs = min(10, pairs)
+    n_cands = max(1, pairs // n_jobs)
+    result = {}
+    with transaction.atomic(), override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"):
+        users, jobs = data.create_rows(n_cands, n_jobs)
+        client = Client(HTTP_HOST="localhost")
+
+        def apply_all():
+            for u in users:
+                client.force_login(u)
+                for job in jobs:
+                    client.post(f"/apps/apply/{job.id}/", {})
+
+        def drain():
+            while True:
+                tasks = claim(["ats.score"], 1000)
+                if not tasks:
+                    break
+                by_job = {}
+                for t in tasks:
+                    by_job.setdefault(t.payload["job_id"], []).append(t.id)
+                for ids in by_job.values():
+                    run_group("ats.score", ids, tasks[0].locked_by)
+
+        ops = len(users) * len(jobs)
+        result["apply"] = _measure(apply_all, ops, memory=False)
+        result["ats_worker"] = _measure(drain, ops, memory=False)
+        transaction.set_rollback(True)
+    return result
+
+
+def machine_info() -> dict:
+    return {"node": platform.node(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "python": platform.python_version()}
+
+
+def run_suite(sizes, apply_pairs=0, seed=42, memory=True, log=None):
+    """{"single@1000": {...}, "batch@1000": {...}, "batch_speedup@1000": {"ratio"}, "apply@1000": {...}, ...}"""
+    results = {}
+    for n in sizes:
+        for name, bench in (("single", bench_single), ("batch", bench_batch)):
+            results[f"{name}@{n}"] = r = bench(n, SyntheticData(seed), memory=memory)
+            if log:
+                log(f"{name}@{n}", r)
+        results[f"batch_speedup@{n}"] = bench_speedup(n, SyntheticData(seed))
+    if apply_pairs:
+        for name, r in bench_apply(apply_pairs, SyntheticData(seed)).items():
+            results[f"{name}@{apply_pairs}"] = r
+            if log:
+                log(f"{name}@{apply_pairs}", r)
+    return results
+
+
+def compare(results, baseline, tolerance, same_machine=True):
+    """
+    (name, now, baseline) for every figure that fell more than `tolerance` (0..1) below
+    the baseline: speedup ratios always, ops/sec only when `same_machine`.
+    """
+    regressions = []
+    for name, r in results.items():
+        key = "ratio" if "ratio" in r else "ops_per_sec"
+        if key == "ops_per_sec" and not same_machine:
+            continue
+        base = (baseline.get(name) or {}).get(key)
+        if base and r[key] is not None and r[key] < base * (1 - tolerance):
+            regressions.append((name, r[key], base))
+    return regressions
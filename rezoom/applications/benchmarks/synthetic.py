@@ -0,0 +1,76 @@
+"""
+Synthetic candidates and jobs for ATS benchmarks.
+Skills follow a Zipf-like skew (a few very common, a long tail), like real profiles.
+"""
+import random
+from accounts.models import User, UserProfile
+from companies.models import Company
+from jobs.models import Job
+
+COMMON_SKILLS = [
+    "Python", "JavaScript", "SQL", "React", "Django", "Docker", "AWS", "Git", "PostgreSQL", "TypeScript",
+    "Node.js", "Java", "Kubernetes", "Linux", "REST", "GraphQL", "Redis", "Go", "C++", "CSS",
+    "HTML", "MongoDB", "Terraform", "Kafka", "Spark", "Pandas", "Flask", "Vue.js", "Azure", "GCP",
+]
+VISA_STATUSES = ["", "", "US Citizen", "Green card", "No", "Needs sponsorship", "H-1B visa", "F-1 OPT visa"]
+
+
+class SyntheticData:
+    def __init__(self, seed=42, vocab_size=500, skew=1.1):
+        self.rng = random.Random(seed)
+        self.vocab = COMMON_SKILLS + [f"skill-{i}" for i in range(vocab_size - len(COMMON_SKILLS))]
+        self.ids = {name: i + 1 for i, name in enumerate(self.vocab)}  # stand-in Skill ids
+        self.weights = [1.0 / (rank + 1) ** skew for rank in range(len(self.vocab))]
+
+    def skills(self, lo, hi):
+        picked = self.rng.choices(self.vocab, weights=self.weights, k=self.rng.randint(lo, hi))
+        return list(dict.fromkeys(picked))
+
+    def profile_fields(self):
+        skills = self.skills(0, 25)
+        projects = []
+        for i in range(self.rng.randint(0, 20)):
+            techs = self.skills(1, 5)
+            projects.append({"title": f"Project {i}", "technologies": techs,
+                             "technology_ids": [self.ids[t] for t in techs], "github": ""})
+        return {
+            "skills": skills,
+            "skill_ids": [self.ids[s] for s in skills],
+            "projects": projects,
+            "github_url": "https://github.com/someone" if self.rng.random() < 0.6 else "",
+            "visa_status": self.rng.choice(VISA_STATUSES),
+        }
+
+    def job_fields(self):
+        req, tools = self.skills(2, 8), self.skills(1, 6)
+        return {
+            "req_quals": req,
+            "req_skill_ids": [self.ids[s] for s in req],
+            "tools": tools,
+            "tool_skill_ids": [self.ids[s] for s in tools],
+            "visa_sponsorship": self.rng.random() < 0.4,
+        }
+
+    def profiles(self, n):
+        """Unsaved UserProfile instances (enough for the scorer)."""
+        return [UserProfile(**self.profile_fields()) for _ in range(n)]
+
+    def jobs(self, n):
+        return [Job(title=f"Synthetic job {i}", **self.job_fields()) for i in range(n)]
+
+    def create_rows(self, n_candidates, n_jobs, prefix="bench"):
+        """
+        Real rows for end-to-end benchmarks: candidates (role USER) with profiles,
+        one company and open jobs. Call inside a transaction you roll back.
+        """
+        users = User.objects.bulk_create([
+            User(username=f"{prefix}-cand-{i}", email=f"{prefix}-{i}@example.com", role=User.Role.USER)
+            for i in range(n_candidates)
+        ])
+        UserProfile.objects.bulk_create([UserProfile(user=u, **self.profile_fields()) for u in users])
+        hr = User.objects.create(username=f"{prefix}-hr", role=User.Role.HR)
+        company = Company.objects.create(name=f"{prefix} Inc", created_by=hr)
+        jobs = Job.objects.bulk_create([
+            Job(company=company, title=f"{prefix} job {i}", **self.job_fields()) for i in range(n_jobs)
+        ])
+        return users, jobs
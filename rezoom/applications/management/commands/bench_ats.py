@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from applications.benchmarks.suite import compare, machine_info, run_suite
+
+BASELINE = Path(__file__).resolve().parents[2] / "benchmarks" / "baseline.json"
+
+class Command(BaseCommand):
+    help = "Benchmark ATS scoring (single, batch, end-to-end apply) on synthetic data and compare to the stored baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pairs", default="1000,100000,1000000",
+                            help="Comma-separated (profile, job) pair counts, e.g. 1000,100000 for a quick run.")
+        parser.add_argument("--apply-pairs", type=int, default=1000,
+                            help="Pairs for the end-to-end apply + ATS worker bench (0 to skip).")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--no-memory", action="store_true", help="Skip the traced memory pass.")
+        parser.add_argument("--baseline", default=str(BASELINE))
+        parser.add_argument("--tolerance", type=float, default=0.30,
+                            help="Allowed drop vs baseline before failing (0.30 = 30%%). Absolute ops/sec are "
+                                 "only compared on the machine that recorded the baseline; elsewhere only "
+                                 "the batch/single speedup ratios are.")
+        parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline.")
+
+    def handle(self, *args, **opts):
+        try:
+            sizes = [int(x) for x in opts["pairs"].split(",") if x.strip()]
+        except ValueError:
+            raise CommandError("--pairs must be comma-separated integers.")
+
+        def log(name, r):
+            mem = f", peak {r['peak_kb']} KB" if r["peak_kb"] is not None else ""
+            self.stdout.write(f"{name:>22}: {r['ops_per_sec']:>12,.0f} ops/s ({r['ops']} ops in {r['seconds']}s{mem})")
+
+        results = run_suite(sizes, apply_pairs=opts["apply_pairs"], seed=opts["seed"],
+                            memory=not opts["no_memory"], log=log)
+        for name, r in results.items():
+            if "ratio" in r and r["ratio"] is not None:
+                self.stdout.write(f"{name:>22}: {r['ratio']:>12.2f}x single")
+
+        path = Path(opts["baseline"])
+        machine = machine_info()
+        if opts["save_baseline"]:
+            path.write_text(json.dumps({"machine": machine, "results": results}, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {path}."))
+            return
+        if not path.exists():
+            self.stdout.write(self.style.WARNING(f"No baseline at {path}; run with --save-baseline."))
+            return
+
+        baseline = json.loads(path.read_text())
+        same_machine = baseline["machine"] == machine
+        if not same_machine:
+            self.stdout.write(self.style.WARNING(
+                f"Baseline was recorded on another machine ({baseline['machine']}); comparing batch/single "
+                f"speedups only. Run with --save-baseline here to compare absolute throughput."))
+        regressions = compare(results, baseline["results"], opts["tolerance"], same_machine)
+        if regressions:
+            lines = [f"{name}: {now:,.2f} vs baseline {base:,.2f}" for name, now, base in regressions]
+            raise CommandError("ATS throughput regression:\n  " + "\n  ".join(lines))
+        self.stdout.write(self.style.SUCCESS("No regressions vs baseline."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from applications.textsim import build_model
+
+class Command(BaseCommand):
+    help = "Rebuild the TF-IDF document frequencies (jobs + extracted resumes) used by the text-similarity score."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        model = build_model(chunk_size=max(1, opts["chunk_size"]))
+        self.stdout.write(self.style.SUCCESS(
+            f"TF-IDF model {model.id}: {len(model.idf)} terms over {model.n_docs} documents."))
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from applications.ats import score_profiles_against_job, ats_outcome, with_resume_skills
+from applications.models import Application, ApplicationScore
+from applications.textsim import TEXT_MODEL_VERSION, current_model, text_scores
+from jobs.models import Job
+
+class Command(BaseCommand):
+    help = ("Re-score every application of a job against its current req_quals/tools (ats_score/ats_outcome) "
+            "and refresh its text-similarity score.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("job_id", type=int)
+        parser.add_argument("--chunk-size", type=int, default=2000,
+                            help="Applications scored and written per bulk_update.")
+        parser.add_argument("--dry-run", action="store_true", help="Score but don't write.")
+        parser.add_argument("--no-text", action="store_true", help="Skip the TF-IDF text-similarity score.")
+
+    def handle(self, *args, **opts):
+        try:
+            job = Job.objects.get(pk=opts["job_id"])
+        except Job.DoesNotExist:
+            raise CommandError(f"Job {opts['job_id']} does not exist.")
+
+        chunk_size = max(1, opts["chunk_size"])
+        qs = (Application.objects
+              .filter(job=job)
+              .select_related("resume_text")
+              .only("id", "profile_snapshot", "ats_score", "ats_outcome", "ats_summary",
+                    "resume_text__terms", "resume_text__skill_ids")
+              .order_by("id"))
+        text_model = None if opts["no_text"] else current_model()
+        if not opts["no_text"] and text_model is None:
+            self.stdout.write(self.style.WARNING("No TF-IDF model yet (run build_text_model); skipping text scores."))
+
+        seen = changed = 0
+        chunk = []
+
+        def flush():
+            nonlocal changed
+            dirty = []
+            # resume skills merged in, exactly as the ATS worker scored them
+            profiles = [with_resume_skills(a.profile_snapshot, a.resume_text and a.resume_text.skill_ids)
+                        for a in chunk]
+            for app, (score, summary) in zip(chunk, score_profiles_against_job(profiles, job)):
+                outcome = ats_outcome(score)
+                if (app.ats_score, app.ats_outcome, app.ats_summary) != (score, outcome, summary):
+                    app.ats_score, app.ats_outcome, app.ats_summary = score, outcome, summary
+                    dirty.append(app)
+            if dirty and not opts["dry_run"]:
+                Application.objects.bulk_update(dirty, ["ats_score", "ats_outcome", "ats_summary"])
+            if text_model and not opts["dry_run"]:
+                texts = text_scores(job, [(a.profile_snapshot or {}, a.resume_text) for a in chunk], text_model)
+                ApplicationScore.objects.bulk_create(
+                    [ApplicationScore(application=a, ats_score=score, reasons=reasons,
+                                      model_version=TEXT_MODEL_VERSION)
+                     for a, (score, reasons) in zip(chunk, texts)],
+                    update_conflicts=True, unique_fields=["application", "model_version"],
+                    update_fields=["ats_score", "reasons", "updated_at"],
+                )
+            changed += len(dirty)
+            chunk.clear()
+
+        for app in qs.iterator(chunk_size=chunk_size):
+            chunk.append(app)
+            seen += 1
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+
+        verb = "would change" if opts["dry_run"] else "updated"
+        self.stdout.write(self.style.SUCCESS(f"Job {job.id}: scored {seen} applications, {verb} {changed}."))
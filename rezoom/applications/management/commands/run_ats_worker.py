@@ -0,0 +1,7 @@
+from tasks.management.commands.run_tasks import Command as RunTasksCommand
+
+class Command(RunTasksCommand):
+    help = "Shorthand for `run_tasks --kind ats.score`: batch-score queued applications per job and route them."
+
+    def handle(self, *args, **opts):
+        super().handle(*args, **{**opts, "kind": ["ats.score"]})
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_ats_outcome_application_ats_score_and_more'),
+        ('jobs', '0002_job_req_skill_ids_job_tool_skill_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ATSScoreCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_version', models.CharField(max_length=32)),
+                ('profile_hash', models.CharField(max_length=40)),
+                ('job_hash', models.CharField(max_length=40)),
+                ('ats_score', models.IntegerField(default=0)),
+                ('reasons', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ats_cache', to='jobs.job')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ats_cache', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job'], name='application_job_id_7e0a84_idx')],
+                'unique_together': {('user', 'job', 'model_version')},
+            },
+        ),
+    ]
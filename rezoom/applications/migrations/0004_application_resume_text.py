@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_resumetext_userprofile_resume_text'),
+        ('applications', '0003_atsscorecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='resume_text',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.resumetext'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_resumetext_terms'),
+        ('applications', '0004_application_resume_text'),
+        ('jobs', '0002_job_req_skill_ids_job_tool_skill_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('n_docs', models.PositiveIntegerField(default=0)),
+                ('idf', models.JSONField(blank=True, default=dict)),
+                ('default_idf', models.FloatField(default=1.0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='applicationscore',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='applications.application'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='applicationscore',
+            unique_together={('application', 'model_version')},
+        ),
+        migrations.CreateModel(
+            name='ResumeTextNorm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sqnorm', models.FloatField(default=0.0)),
+                ('resume_text', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.resumetext')),
+                ('text_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.textmodel')),
+            ],
+            options={
+                'unique_together': {('resume_text', 'text_model')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobTextVector',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision', models.CharField(max_length=40)),
+                ('vector', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='text_vectors', to='jobs.job')),
+                ('text_model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='applications.textmodel')),
+            ],
+            options={
+                'unique_together': {('job', 'text_model')},
+            },
+        ),
+    ]
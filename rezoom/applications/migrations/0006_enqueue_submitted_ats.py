@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def enqueue_submitted(apps, schema_editor):
+    """
+    The review queue used to pull `submitted` applications directly; it now only
+    pulls employee_review, which the ATS worker routes to. Give every application
+    still in `submitted` (and not already queued) an ats.score task.
+    """
+    Application = apps.get_model("applications", "Application")
+    Task = apps.get_model("tasks", "Task")
+    queued = set(
+        Task.objects.filter(kind="ats.score").exclude(status="failed")
+        .values_list("payload__application_id", flat=True)
+    )
+    now = timezone.now()
+    rows = [
+        Task(kind="ats.score", payload={"application_id": app_id, "job_id": job_id}, run_after=now)
+        for app_id, job_id in Application.objects.filter(status="submitted").values_list("id", "job_id")
+        if app_id not in queued
+    ]
+    Task.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_textmodel_alter_applicationscore_application_and_more'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(enqueue_submitted, migrations.RunPython.noop),
+    ]
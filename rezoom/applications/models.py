@@ -3,6 +3,8 @@ from django.utils import timezone
 from accounts.models import User
 from jobs.models import Job
 from companies.models import Employee
+from accounts.models import UserProfile, ResumeText
+from .ats import profile_fingerprint, job_fingerprint
 
 class Application(models.Model):
     class Stage(models.TextChoices):
@@ -21,6 +23,7 @@ class Application(models.Model):
 
     # optional: store the resume used at apply time (even if profile resume later changes)
     resume_file = models.FileField(upload_to="resumes/apps/", blank=True, null=True)
+    resume_text = models.ForeignKey(ResumeText, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
 
     # optional: keep a frozen snapshot of key profile fields at apply time
     profile_snapshot = models.JSONField(default=dict, blank=True)
@@ -52,18 +55,82 @@ class Application(models.Model):
 
 
 class ApplicationScore(models.Model):
-    """ATS score + transparent reasons used to route (>= threshold → employee_review)."""
-    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name="score")
+    """
+    ATS score + transparent reasons, one row per scoring model.
+    The blend (ATS_MODEL_VERSION) routes (>= threshold → employee_review); others are signals.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name="scores")
     ats_score = models.IntegerField(default=0)                 # 0–100
     reasons = models.JSONField(default=dict, blank=True)       # e.g. {"matched_skills":[...],"missing_skills":[...]}
     model_version = models.CharField(max_length=32, default="v1")
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        unique_together = ("application", "model_version")
+
     def __str__(self):
         return f"ATS {self.ats_score} for app {self.application_id}"
 
 
+class ATSScoreCache(models.Model):
+    """
+    Memoized ATS result for (candidate, job, model_version).
+    A row is only a hit while both content hashes still match the live profile/job.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ats_cache")
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="ats_cache")
+    model_version = models.CharField(max_length=32)
+    profile_hash = models.CharField(max_length=40)
+    job_hash = models.CharField(max_length=40)
+    ats_score = models.IntegerField(default=0)
+    reasons = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "job", "model_version")
+        indexes = [models.Index(fields=["job"])]
+
+    def __str__(self):
+        return f"ATS {self.ats_score} cached for user {self.user_id} × job {self.job_id}"
+
+
+class TextModel(models.Model):
+    """IDF table for the TF-IDF text signal (applications.textsim); the latest row is live."""
+    n_docs = models.PositiveIntegerField(default=0)
+    idf = models.JSONField(default=dict, blank=True)   # term → idf, for terms seen in >= 2 documents
+    default_idf = models.FloatField(default=1.0)       # idf for every rarer term
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"TF-IDF model {self.id} ({len(self.idf)} terms / {self.n_docs} docs)"
+
+
+class JobTextVector(models.Model):
+    """A job's L2-normalised TF-IDF vector, valid while `revision` matches the job text."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="text_vectors")
+    text_model = models.ForeignKey(TextModel, on_delete=models.CASCADE, related_name="+")
+    revision = models.CharField(max_length=40)         # sha1 of the job's text fields
+    vector = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("job", "text_model")
+
+    def __str__(self):
+        return f"Text vector for job {self.job_id} (model {self.text_model_id})"
+
+
+class ResumeTextNorm(models.Model):
+    """Squared TF-IDF norm of a resume's terms under one TextModel (so scoring never re-weighs them)."""
+    resume_text = models.ForeignKey(ResumeText, on_delete=models.CASCADE, related_name="+")
+    text_model = models.ForeignKey(TextModel, on_delete=models.CASCADE, related_name="+")
+    sqnorm = models.FloatField(default=0.0)
+
+    class Meta:
+        unique_together = ("resume_text", "text_model")
+
+
 class ApplicationAssignment(models.Model):
     """
     Distributes an application to Employee reviewers (those who accepted the job assignment).
@@ -86,3 +153,19 @@ class ApplicationAssignment(models.Model):
     def __str__(self):
         who = self.employee.user.get_full_name() or self.employee.user.username
         return f"{who} reviewing app {self.application_id}"
+
+# drop cached scores as soon as the scored content changes
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_profile_scores(sender, instance, created, **kwargs):
+    if not created:
+        ATSScoreCache.objects.filter(user_id=instance.user_id).exclude(
+            profile_hash=profile_fingerprint(instance)).delete()
+
+@receiver(post_save, sender=Job)
+def invalidate_job_scores(sender, instance, created, **kwargs):
+    if not created:
+        ATSScoreCache.objects.filter(job_id=instance.pk).exclude(
+            job_hash=job_fingerprint(instance)).delete()
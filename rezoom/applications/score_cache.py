@@ -0,0 +1,80 @@
+from .ats import (ATS_MODEL_VERSION, score_profile_against_job, score_profiles_against_job,
+                  profile_fingerprint, job_fingerprint)
+from .models import ATSScoreCache
+
+def cached_scores(profile, jobs, model_version=ATS_MODEL_VERSION) -> dict:
+    """
+    {job_id: (score, reasons)} for one profile against many jobs.
+    One SELECT for the cached rows, scorer only runs for misses, one upsert to store them.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return {}
+    p_hash = profile_fingerprint(profile)
+    j_hash = {j.id: job_fingerprint(j) for j in jobs}
+
+    out = {}
+    rows = (ATSScoreCache.objects
+            .filter(user_id=profile.user_id, job_id__in=j_hash, model_version=model_version,
+                    profile_hash=p_hash)
+            .values_list("job_id", "job_hash", "ats_score", "reasons"))
+    for job_id, h, score, reasons in rows:
+        if j_hash[job_id] == h:
+            out[job_id] = (score, reasons)
+
+    misses = []
+    for j in jobs:
+        if j.id in out:
+            continue
+        score, reasons = score_profile_against_job(profile, j)
+        out[j.id] = (score, reasons)
+        misses.append(ATSScoreCache(
+            user_id=profile.user_id, job_id=j.id, model_version=model_version,
+            profile_hash=p_hash, job_hash=j_hash[j.id], ats_score=score, reasons=reasons,
+        ))
+    if misses:
+        ATSScoreCache.objects.bulk_create(
+            misses, update_conflicts=True,
+            unique_fields=["user", "job", "model_version"],
+            update_fields=["profile_hash", "job_hash", "ats_score", "reasons", "updated_at"],
+        )
+    return out
+
+def cached_score(profile, job, model_version=ATS_MODEL_VERSION) -> tuple[int, dict]:
+    return cached_scores(profile, [job], model_version)[job.id]
+
+def cached_scores_for_job(job, profiles, model_version=ATS_MODEL_VERSION) -> dict:
+    """
+    {user_id: (score, reasons)} for many candidates against one job.
+    `profiles` maps user_id → UserProfile or profile_snapshot dict; misses go
+    through the batch scorer in one pass.
+    """
+    if not profiles:
+        return {}
+    j_hash = job_fingerprint(job)
+    p_hash = {uid: profile_fingerprint(p) for uid, p in profiles.items()}
+
+    out = {}
+    rows = (ATSScoreCache.objects
+            .filter(job_id=job.id, user_id__in=p_hash, model_version=model_version, job_hash=j_hash)
+            .values_list("user_id", "profile_hash", "ats_score", "reasons"))
+    for uid, h, score, reasons in rows:
+        if p_hash[uid] == h:
+            out[uid] = (score, reasons)
+
+    miss_ids = [uid for uid in profiles if uid not in out]
+    scored = score_profiles_against_job([profiles[uid] for uid in miss_ids], job)
+    misses = []
+    for uid, (score, reasons) in zip(miss_ids, scored):
+        out[uid] = (score, reasons)
+        misses.append(ATSScoreCache(
+            user_id=uid, job_id=job.id, model_version=model_version,
+            profile_hash=p_hash[uid], job_hash=j_hash, ats_score=score, reasons=reasons,
+        ))
+    if misses:
+        ATSScoreCache.objects.bulk_create(
+            misses, batch_size=1000, update_conflicts=True,
+            unique_fields=["user", "job", "model_version"],
+            update_fields=["profile_hash", "job_hash", "ats_score", "reasons", "updated_at"],
+        )
+    return out
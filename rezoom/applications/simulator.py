@@ -0,0 +1,105 @@
+"""
+What-if ATS simulator: replay historical applications under other thresholds/weights.
+
+Applications are loaded once into columns of blend features (the expensive part:
+skill matching against each job). Identical feature rows are collapsed with a count,
+so evaluating a configuration is a pass over the distinct rows, and threshold-only
+variations reuse one score histogram.
+"""
+from collections import Counter
+from jobs.models import Job
+from .ats import (ATS_THRESHOLD, ATS_VISA_CAP, ATS_WEIGHTS, JOB_SCORE_FIELDS,
+                  _blend, _compile_job, _features, with_resume_skills)
+from .models import Application
+
+
+class Simulator:
+    """
+    Feature columns for a set of applications. Each distinct row is
+    (req_match, tools_match, proj_frac, github, visa_capped, status, recorded_outcome)
+    with its multiplicity in `counts`.
+    Jobs are scored as they are now; snapshots are the candidate as they applied.
+    """
+    def __init__(self, rows: Counter):
+        keys = list(rows)
+        self.req = [k[0] for k in keys]
+        self.tools = [k[1] for k in keys]
+        self.proj = [k[2] for k in keys]
+        self.github = [k[3] for k in keys]
+        self.capped = [k[4] for k in keys]
+        self.status = [k[5] for k in keys]
+        self.recorded = [k[6] for k in keys]
+        self.counts = [rows[k] for k in keys]
+        self.total = sum(self.counts)
+
+    @classmethod
+    def load(cls, job=None, company=None, since=None, until=None, chunk_size=2000):
+        qs = Application.objects.all()
+        if job is not None:
+            qs = qs.filter(job=job)
+        if company is not None:
+            qs = qs.filter(job__company=company)
+        if since is not None:
+            qs = qs.filter(created_at__gte=since)
+        if until is not None:
+            qs = qs.filter(created_at__lt=until)
+
+        compiled = {}
+        rows = Counter()
+        values = qs.order_by("job_id").values_list(
+            "job_id", "profile_snapshot", "resume_text__skill_ids", "status", "ats_outcome")
+        for job_id, snap, resume_ids, status, outcome in values.iterator(chunk_size=chunk_size):
+            cj = compiled.get(job_id)
+            if cj is None:
+                cj = compiled[job_id] = _compile_job(Job.objects.only(*JOB_SCORE_FIELDS).get(pk=job_id))
+            rows[_features(with_resume_skills(snap, resume_ids), cj)[:5] + (status, outcome)] += 1
+        return cls(rows)
+
+    def _histograms(self, weights, visa_cap):
+        """Per score 0..100: counts by current status, and by recorded outcome."""
+        by_status = [Counter() for _ in range(101)]
+        by_recorded = [Counter() for _ in range(101)]
+        for i, n in enumerate(self.counts):
+            score, _ = _blend((self.req[i], self.tools[i], self.proj[i], self.github[i], self.capped[i], 0),
+                              weights, visa_cap)
+            by_status[score][self.status[i]] += n
+            by_recorded[score][self.recorded[i]] += n
+        return by_status, by_recorded
+
+    def evaluate(self, configs) -> list[dict]:
+        """
+        One result per config ({"threshold", "weights", "visa_cap"}; missing keys
+        fall back to the live settings). Configs sharing weights/visa_cap share a pass.
+        """
+        results, hist_cache = [], {}
+        for cfg in configs:
+            weights = {**ATS_WEIGHTS, **(cfg.get("weights") or {})}
+            visa_cap = cfg.get("visa_cap", ATS_VISA_CAP)
+            threshold = cfg.get("threshold", ATS_THRESHOLD)
+            key = (tuple(sorted(weights.items())), visa_cap)
+            if key not in hist_cache:
+                hist_cache[key] = self._histograms(weights, visa_cap)
+            by_status, by_recorded = hist_cache[key]
+
+            passed, below = Counter(), Counter()
+            newly_passed = newly_rejected = score_sum = 0
+            for score in range(101):
+                n = sum(by_status[score].values())
+                score_sum += score * n
+                if score >= threshold:
+                    passed.update(by_status[score])
+                    newly_passed += by_recorded[score]["below"]
+                else:
+                    below.update(by_status[score])
+                    newly_rejected += by_recorded[score]["pass"]
+            n_pass = sum(passed.values())
+            results.append({
+                "threshold": threshold, "weights": weights, "visa_cap": visa_cap,
+                "total": self.total, "passed": n_pass,
+                "pass_rate": round(n_pass / self.total, 4) if self.total else 0.0,
+                "mean_score": round(score_sum / self.total, 2) if self.total else 0.0,
+                "newly_passed": newly_passed, "newly_rejected": newly_rejected,
+                # where the applications on each side of the line actually ended up
+                "stages": {"pass": dict(passed), "below": dict(below)},
+            })
+        return results
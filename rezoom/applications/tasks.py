@@ -0,0 +1,82 @@
+import logging
+from django.db import transaction
+from django.urls import reverse
+from accounts.resumes import alias_map, extract_resume
+from notifications.utils import notify_many
+from tasks.queue import register
+from .ats import ATS_MODEL_VERSION, ats_outcome, with_resume_skills
+from .models import Application, ApplicationScore
+from .score_cache import cached_scores_for_job
+from .textsim import TEXT_MODEL_VERSION, text_scores
+
+log = logging.getLogger(__name__)
+
+@register("ats.score", group_by="job_id")
+def score_applications(tasks):
+    """
+    Score freshly submitted applications of one job in a single batch and route them:
+    pass → employee_review, below → rejected. Payload: {"application_id", "job_id"}.
+    """
+    apps = list(
+        Application.objects.select_related("job__company", "user", "resume_text")
+        .filter(id__in=[t.payload["application_id"] for t in tasks], status=Application.Stage.SUBMITTED)
+    )
+    if not apps:
+        return
+    job = apps[0].job
+
+    # resume text feeds the scorer; files seen before (same content hash) cost one lookup.
+    # A missing or unreadable file only costs that applicant the resume signal, never the batch.
+    pending = [a for a in apps if a.resume_file and a.resume_text_id is None]
+    if pending:
+        aliases = alias_map()
+        for app in pending:
+            try:
+                with transaction.atomic():  # savepoint: a failed insert mustn't poison the batch
+                    app.resume_text = extract_resume(app.resume_file, aliases)
+            except Exception:
+                log.exception("resume of application %s could not be read; scoring without it", app.id)
+                app.resume_text = None
+
+    scores = cached_scores_for_job(job, {
+        a.user_id: with_resume_skills(a.profile_snapshot, a.resume_text and a.resume_text.skill_ids) for a in apps
+    })
+
+    for app in apps:
+        app.ats_score, app.ats_summary = scores[app.user_id]
+        app.ats_outcome = ats_outcome(app.ats_score)
+        if app.ats_outcome == "pass":
+            app.status = Application.Stage.EMPLOYEE_REVIEW  # ready for EMP queue
+        else:
+            app.status = Application.Stage.REJECTED
+            app.rejection_reason = "ATS screening below threshold."
+    Application.objects.bulk_update(
+        apps, ["ats_score", "ats_summary", "ats_outcome", "status", "rejection_reason", "resume_text", "updated_at"]
+    )
+    # text similarity is recorded next to the routing score; it doesn't route (yet),
+    # and is skipped (no rows) until build_text_model has run
+    texts = text_scores(job, [(a.profile_snapshot or {}, a.resume_text) for a in apps])
+    ApplicationScore.objects.bulk_create(
+        [ApplicationScore(application=a, ats_score=a.ats_score, reasons=a.ats_summary,
+                          model_version=ATS_MODEL_VERSION) for a in apps]
+        + [ApplicationScore(application=a, ats_score=score, reasons=reasons, model_version=TEXT_MODEL_VERSION)
+           for a, (score, reasons) in zip(apps, texts)],
+        update_conflicts=True, unique_fields=["application", "model_version"],
+        update_fields=["ats_score", "reasons", "updated_at"],
+    )
+
+    url = reverse("job_public_detail", args=[job.id])
+    notify_many(
+        [a.user for a in apps if a.ats_outcome == "pass"],
+        title="Passed ATS",
+        message=f"You passed initial screening for {job.title} at {job.company.name}.",
+        url=url,
+        send_email=True,
+    )
+    notify_many(
+        [a.user for a in apps if a.ats_outcome != "pass"],
+        title="Application update",
+        message=f"Your application for {job.title} at {job.company.name} did not pass initial screening.",
+        url=url,
+        send_email=True,
+    )
@@ -1,3 +1,360 @@
-from django.test import TestCase
+import json
+import math
+import random
+from collections import Counter
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from accounts.models import ResumeText, User, UserProfile
+from companies.models import Company
+from jobs.models import Job
+from notifications.models import Notification
+from rezoom.text import term_counts
+from tasks.models import Task
+from tasks.queue import enqueue_many
+from tasks.worker import run
+from . import ats
+from .ats import (DEFAULT_VISA_CAP, DEFAULT_WEIGHTS, JOB_SCORE_FIELDS, _blend_version, ats_outcome,
+                  score_profile_against_job, score_profiles_against_job, with_resume_skills)
+from .benchmarks.suite import compare
+from .models import ATSScoreCache, Application, JobTextVector, ResumeTextNorm, TextModel
+from .score_cache import cached_scores, cached_scores_for_job
+from .simulator import Simulator
+from .textsim import build_model, job_vector, profile_counts, text_scores
 
-# Create your tests here.
+TERMS = ["Python", "django", " React ", "Docker", "redis", "SQL", "aws", "Rust", "excel", "Kafka", "go", "Java"]
+VISA = ["", "Needs sponsorship", "Citizen", "H1B visa"]
+
+
+def reference_score(profile, job):
+    """The set-based scorer the bitset engine replaced (baseline ats.py), for free-text profiles."""
+    norm = lambda xs: {str(x).strip().lower() for x in (xs or []) if str(x).strip()}
+    p_skills, j_req, j_tools = norm(profile.skills), norm(job.req_quals), norm(job.tools)
+    req_match = len(p_skills & j_req) / max(1, len(j_req))
+    tools_match = len(p_skills & j_tools) / max(1, len(j_tools))
+    projects = profile.projects or []
+    proj_bonus = sum(0.02 for p in projects[:5] if norm(p.get("technologies", [])) & (j_req | j_tools))
+    has_github = bool((profile.github_url or "").strip())
+    score = int(round((0.50 * req_match + 0.20 * tools_match + 0.10 * (min(5, len(projects)) / 5.0)
+                       + 0.05 * (1.0 if has_github else 0.0)) * 100))
+    capped = False
+    visa = (profile.visa_status or "").lower()
+    if not job.visa_sponsorship and ("sponsor" in visa or "visa" in visa) and score > 50:
+        score, capped = 50, True
+    return max(0, min(100, score)), {
+        "req_match": round(req_match * 100), "tools_match": round(tools_match * 100),
+        "proj_bonus_pct": int(proj_bonus * 100), "github": has_github, "visa_cap_applied": capped,
+    }
+
+
+def random_profile(rng, ids=False):
+    projects = [{"title": f"p{i}", "technologies": rng.sample(TERMS, rng.randint(0, 3))}
+                for i in range(rng.randint(0, 7))]
+    profile = UserProfile(skills=rng.sample(TERMS, rng.randint(0, 8)), projects=projects,
+                          github_url=rng.choice(["", "https://github.com/x"]), visa_status=rng.choice(VISA))
+    if ids:
+        profile.skill_ids = rng.sample(range(1, 15), rng.randint(0, 6))
+        for p in projects:
+            p["technology_ids"] = rng.sample(range(1, 15), rng.randint(0, 3))
+    return profile
+
+
+def random_job(rng, ids=False):
+    job = Job(req_quals=rng.sample(TERMS, rng.randint(0, 6)), tools=rng.sample(TERMS, rng.randint(0, 4)),
+              visa_sponsorship=rng.random() < 0.3)
+    if ids:
+        job.req_skill_ids = rng.sample(range(1, 15), rng.randint(0, 5))
+        job.tool_skill_ids = rng.sample(range(1, 15), rng.randint(0, 3))
+    return job
+
+
+def job_fields(job):
+    return {f: getattr(job, f) for f in JOB_SCORE_FIELDS}
+
+
+class BatchScorerTests(SimpleTestCase):
+    """The bitset batch scorer gives exactly what one-at-a-time and the original set-based scorer give."""
+
+    def setUp(self):
+        self.rng = random.Random(1)
+
+    def test_matches_reference_scorer(self):
+        for _ in range(200):
+            job = random_job(self.rng)
+            profiles = [random_profile(self.rng) for _ in range(10)]
+            self.assertEqual(score_profiles_against_job(profiles, job),
+                             [reference_score(p, job) for p in profiles])
+
+    def test_batch_matches_single(self):
+        for _ in range(200):
+            job = random_job(self.rng, ids=self.rng.random() < 0.7)
+            profiles = [random_profile(self.rng, ids=self.rng.random() < 0.7) for _ in range(10)]
+            self.assertEqual(score_profiles_against_job(profiles, job),
+                             [score_profile_against_job(p, job) for p in profiles])
+
+    def test_snapshot_dicts_score_like_profiles(self):
+        job = random_job(self.rng, ids=True)
+        profiles = [random_profile(self.rng, ids=True) for _ in range(20)]
+        snapshots = [{f: getattr(p, f) for f in ("skills", "skill_ids", "projects", "github_url", "visa_status")}
+                     for p in profiles]
+        self.assertEqual(score_profiles_against_job(snapshots, job), score_profiles_against_job(profiles, job))
+
+
+class BenchCompareTests(SimpleTestCase):
+    BASELINE = {"single@1000": {"ops_per_sec": 100.0}, "batch_speedup@1000": {"ratio": 3.0}}
+
+    def test_ops_per_sec_only_on_the_same_machine(self):
+        results = {"single@1000": {"ops_per_sec": 50.0}, "batch_speedup@1000": {"ratio": 2.9},
+                   "batch@1000": {"ops_per_sec": 1.0}}  # not in the baseline: skipped
+        self.assertEqual(compare(results, self.BASELINE, 0.3), [("single@1000", 50.0, 100.0)])
+        self.assertEqual(compare(results, self.BASELINE, 0.3, same_machine=False), [])
+
+    def test_speedup_compared_everywhere(self):
+        results = {"single@1000": {"ops_per_sec": 500.0}, "batch_speedup@1000": {"ratio": 1.5}}
+        for same_machine in (True, False):
+            self.assertEqual(compare(results, self.BASELINE, 0.3, same_machine),
+                             [("batch_speedup@1000", 1.5, 3.0)])
+
+
+class RescoreJobTests(TestCase):
+    def test_rescores_every_application(self):
+        rng = random.Random(2)
+        job = Job.objects.create(company=Company.objects.create(name="Acme"), title="Engineer",
+                                 req_quals=["Python", "Django"], tools=["Docker"])
+        snapshots = []
+        for i in range(30):
+            p = random_profile(rng)
+            snapshots.append({"skills": p.skills, "projects": p.projects, "github_url": p.github_url,
+                              "visa_status": p.visa_status})
+            Application.objects.create(job=job, user=User.objects.create_user(f"cand{i}"),
+                                       profile_snapshot=snapshots[-1])
+        out = StringIO()
+        call_command("rescore_job", job.id, "--chunk-size", "7", "--no-text", stdout=out)
+        apps = list(Application.objects.filter(job=job).order_by("id"))
+        self.assertEqual([(a.ats_score, a.ats_summary) for a in apps],
+                         [score_profile_against_job(s, job) for s in snapshots])
+        self.assertEqual([a.ats_outcome for a in apps], [ats_outcome(a.ats_score) for a in apps])
+        self.assertIn("scored 30 applications", out.getvalue())
+
+
+class ScoreCacheTests(TestCase):
+    """Cached scores equal fresh ones and are dropped only when a scored field changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        cls.jobs = [Job.objects.create(company=company, title=f"Job {i}", req_quals=["Python", "Django"][:i + 1],
+                                       tools=["Docker"]) for i in range(2)]
+        cls.profile = User.objects.create_user("cand").profile
+        cls.profile.skills = ["python", "docker"]
+        cls.profile.save()
+
+    def test_hits_after_first_call(self):
+        fresh = {j.id: score_profile_against_job(self.profile, j) for j in self.jobs}
+        self.assertEqual(cached_scores(self.profile, self.jobs), fresh)
+        self.assertEqual(ATSScoreCache.objects.count(), 2)
+        with self.assertNumQueries(1):  # one SELECT, no scoring writes
+            self.assertEqual(cached_scores(self.profile, self.jobs), fresh)
+
+    def test_profile_changes(self):
+        cached_scores(self.profile, self.jobs)
+        self.profile.address = "Somewhere"  # not scored
+        self.profile.save()
+        self.assertEqual(ATSScoreCache.objects.count(), 2)
+        self.profile.skills = ["python", "django"]
+        self.profile.save()
+        self.assertFalse(ATSScoreCache.objects.exists())
+        self.assertEqual(cached_scores(self.profile, self.jobs)[self.jobs[1].id][0],
+                         score_profile_against_job(self.profile, self.jobs[1])[0])
+
+    def test_job_changes(self):
+        cached_scores(self.profile, self.jobs)
+        job = self.jobs[0]
+        job.title = "Renamed"  # not scored
+        job.save()
+        self.assertEqual(ATSScoreCache.objects.count(), 2)
+        job.tools = ["Kubernetes"]
+        job.save()
+        self.assertEqual(list(ATSScoreCache.objects.values_list("job_id", flat=True)), [self.jobs[1].id])
+
+    def test_weights_change_the_model_version(self):
+        self.assertEqual(_blend_version(DEFAULT_WEIGHTS, DEFAULT_VISA_CAP), "v1")
+        other = _blend_version({**DEFAULT_WEIGHTS, "req": 0.6}, DEFAULT_VISA_CAP)
+        self.assertNotEqual(other, "v1")
+        self.assertNotEqual(_blend_version(DEFAULT_WEIGHTS, 40), other)
+        cached_scores(self.profile, self.jobs)
+        with self.assertNumQueries(2):  # a miss under the new version: SELECT, then the upsert
+            cached_scores(self.profile, self.jobs, model_version=other)
+        self.assertEqual(ATSScoreCache.objects.filter(model_version=other).count(), 2)
+
+    def test_for_job_matches_direct_scoring(self):
+        rng = random.Random(3)
+        profiles = {}
+        for i in range(12):
+            p = random_profile(rng)
+            p.user = User.objects.create_user(f"c{i}")
+            profiles[p.user.id] = p
+        job = self.jobs[1]
+        want = {uid: score_profile_against_job(p, job) for uid, p in profiles.items()}
+        self.assertEqual(cached_scores_for_job(job, profiles), want)
+        with self.assertNumQueries(1):
+            self.assertEqual(cached_scores_for_job(job, profiles), want)
+
+
+class SimulatorTests(TestCase):
+    """The simulator's pass rates equal scoring every application directly under the same config."""
+
+    CONFIGS = [{}, {"threshold": 40}, {"threshold": 90}, {"weights": {"req": 0.6, "tools": 0.1}},
+               {"weights": {"github": 0.3}, "threshold": 50}, {"visa_cap": 20, "threshold": 30}]
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(4)
+        company = Company.objects.create(name="Acme")
+        cls.jobs = [Job.objects.create(company=company, title=f"Job {i}", **job_fields(random_job(rng, ids=i == 0)))
+                    for i in range(3)]
+        resume = ResumeText.objects.create(content_hash="r" * 64, skill_ids=[1, 2, 3])
+        stages = [Application.Stage.EMPLOYEE_REVIEW, Application.Stage.REJECTED, Application.Stage.HIRED]
+        for i in range(60):
+            p = random_profile(rng, ids=rng.random() < 0.5)
+            snap = {f: getattr(p, f) for f in ("skills", "skill_ids", "projects", "github_url", "visa_status")}
+            Application.objects.create(job=cls.jobs[i % 3], user=User.objects.create_user(f"cand{i}"),
+                                       profile_snapshot=snap, resume_text=resume if i % 4 == 0 else None,
+                                       status=rng.choice(stages), ats_outcome=rng.choice(["pass", "below"]))
+
+    def _direct(self, cfg, apps):
+        """What evaluate() should report, by scoring each application under the live settings patched to cfg."""
+        threshold = cfg.get("threshold", ats.ATS_THRESHOLD)
+        with mock.patch.object(ats, "ATS_WEIGHTS", {**ats.ATS_WEIGHTS, **cfg.get("weights", {})}), \
+                mock.patch.object(ats, "ATS_VISA_CAP", cfg.get("visa_cap", ats.ATS_VISA_CAP)):
+            scores = [score_profile_against_job(
+                with_resume_skills(a.profile_snapshot, a.resume_text.skill_ids if a.resume_text else None),
+                a.job)[0] for a in apps]
+        passed = [s >= threshold for s in scores]
+        stages = {"pass": Counter(), "below": Counter()}
+        for a, ok in zip(apps, passed):
+            stages["pass" if ok else "below"][a.status] += 1
+        return {"total": len(apps), "passed": sum(passed), "pass_rate": round(sum(passed) / len(apps), 4),
+                "mean_score": round(sum(scores) / len(apps), 2),
+                "newly_passed": sum(ok and a.ats_outcome == "below" for a, ok in zip(apps, passed)),
+                "newly_rejected": sum(not ok and a.ats_outcome == "pass" for a, ok in zip(apps, passed)),
+                "stages": {k: dict(v) for k, v in stages.items()}}
+
+    def _check(self, sim, apps):
+        for cfg, got in zip(self.CONFIGS, sim.evaluate(self.CONFIGS)):
+            with self.subTest(cfg=cfg):
+                self.assertEqual({k: got[k] for k in self._direct(cfg, apps)}, self._direct(cfg, apps))
+
+    def test_matches_direct_scoring(self):
+        apps = list(Application.objects.select_related("job", "resume_text"))
+        sim = Simulator.load(chunk_size=7)
+        self.assertEqual(sim.total, 60)
+        self._check(sim, apps)
+
+    def test_filtered_by_job(self):
+        job = self.jobs[1]
+        apps = list(Application.objects.filter(job=job).select_related("job", "resume_text"))
+        self._check(Simulator.load(job=job), apps)
+
+    def test_command_json(self):
+        out = StringIO()
+        call_command("simulate_ats", "--threshold", "40", "90", "--json", stdout=out)
+        got = json.loads(out.getvalue())
+        apps = list(Application.objects.select_related("job", "resume_text"))
+        self.assertEqual([r["passed"] for r in got],
+                         [self._direct({"threshold": t}, apps)["passed"] for t in (40, 90)])
+
+
+class TextSimTests(TestCase):
+    JOBS = ["Backend engineer\nPython Django services on Postgres\nOwn the API and the data pipeline",
+            "Frontend engineer\nReact TypeScript\nBuild the design system",
+            "Data engineer\nPython Spark pipeline\nOwn the warehouse"]
+    RESUMES = ["Python Django developer, built an API on Postgres and a Spark pipeline",
+               "React and TypeScript, design system maintainer", "Forklift operator"]
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        cls.jobs = []
+        for text in cls.JOBS:
+            title, purpose, description = text.split("\n")
+            cls.jobs.append(Job.objects.create(company=company, title=title, role_purpose=purpose,
+                                               description_md=description))
+        # the first resume predates term counts: build_model backfills them
+        cls.resumes = [ResumeText.objects.create(content_hash=str(i) * 64, text=text,
+                                                 terms={} if i == 0 else dict(term_counts(text)))
+                       for i, text in enumerate(cls.RESUMES)]
+        ResumeText.objects.create(content_hash="e" * 64, status=ResumeText.Status.ERROR, text="python python")
+
+    def _reference(self, job, counts, model):
+        """Cosine of the two TF-IDF vectors, computed densely from scratch."""
+        def vector(c):
+            return {t: (1 + math.log(n)) * model.idf.get(t, model.default_idf) for t, n in c.items() if n > 0}
+        a, b = vector(term_counts("\n".join([job.title, job.role_purpose, job.description_md]))), vector(counts)
+        dot = sum(w * b.get(t, 0.0) for t, w in a.items())
+        na, nb = math.sqrt(sum(w * w for w in a.values())), math.sqrt(sum(w * w for w in b.values()))
+        return dot / (na * nb) if na and nb else 0.0
+
+    def test_no_model_no_scores(self):
+        with self.assertLogs("applications.textsim", "WARNING"):
+            self.assertEqual(text_scores(self.jobs[0], [({}, None)]), [])
+
+    def test_build_model(self):
+        model = build_model(chunk_size=2)
+        self.assertEqual(model.n_docs, 6)  # three jobs, three extracted resumes (not the failed one)
+        self.assertEqual(ResumeText.objects.get(pk=self.resumes[0].pk).terms,
+                         dict(term_counts(self.RESUMES[0])))
+        df = Counter(t for text in self.JOBS + self.RESUMES for t in set(term_counts(text)))
+        self.assertEqual(set(model.idf), {t for t, n in df.items() if n >= 2})
+        self.assertAlmostEqual(model.idf["python"], math.log(7 / 4) + 1)
+        self.assertEqual(ResumeTextNorm.objects.filter(text_model=model).count(), 3)
+        self.assertEqual(build_model().id, TextModel.objects.get().id)  # the old model is dropped
+
+    def test_scores_match_dense_cosine(self):
+        model = build_model()
+        resumes = list(ResumeText.objects.filter(pk__in=[r.pk for r in self.resumes]).order_by("id"))
+        profiles = [{"skills": ["Python", "Kafka"], "projects": [{"title": "pipeline", "technologies": ["Spark"]}]},
+                    {"skills": ["React"]}, {}]
+        candidates = [(p, rt) for p in profiles for rt in resumes + [None]]
+        for job in self.jobs:
+            for (profile, rt), (score, reasons) in zip(candidates, text_scores(job, candidates, model)):
+                want = self._reference(job, Counter(rt.terms if rt else {}) + profile_counts(profile), model)
+                self.assertAlmostEqual(reasons["similarity"], round(min(1.0, want), 4), places=4)
+                self.assertEqual(score, int(round(min(1.0, want) * 100)))
+        best = text_scores(self.jobs[0], [({}, rt) for rt in resumes], model)
+        self.assertEqual(max(range(3), key=lambda i: best[i][0]), 0)
+        self.assertIn("django", best[0][1]["top_terms"])
+
+    def test_job_vector_cache(self):
+        model = build_model()
+        job = self.jobs[1]
+        vec = job_vector(job, model)
+        self.assertAlmostEqual(sum(w * w for w in vec.values()), 1.0)
+        with self.assertNumQueries(1):
+            self.assertEqual(job_vector(job, model), vec)
+        job.description_md = "Kotlin Android"
+        self.assertIn("kotlin", job_vector(job, model))
+        self.assertEqual(JobTextVector.objects.filter(job=job).count(), 1)
+
+
+class ATSWorkerTests(TestCase):
+    def test_unreadable_resume_does_not_fail_the_batch(self):
+        job = Job.objects.create(company=Company.objects.create(name="Acme"), title="Engineer",
+                                 req_quals=["Python"], tools=["Docker"])
+        ok = Application.objects.create(job=job, user=User.objects.create_user("ok"),
+                                        profile_snapshot={"skills": ["python", "docker"]})
+        broken = Application.objects.create(job=job, user=User.objects.create_user("broken"),
+                                            profile_snapshot={"skills": ["excel"]},
+                                            resume_file="resumes/apps/does-not-exist.pdf")
+        enqueue_many("ats.score", [{"application_id": a.id, "job_id": job.id} for a in (ok, broken)])
+        with self.assertLogs("applications", "WARNING") as logs:  # also: no TF-IDF model yet
+            self.assertEqual(run(["ats.score"]), (2, 0))
+        self.assertIn(f"resume of application {broken.id} could not be read", "\n".join(logs.output))
+        self.assertFalse(Task.objects.exists())
+        ok.refresh_from_db()
+        broken.refresh_from_db()
+        self.assertEqual((ok.status, broken.status),
+                         (Application.Stage.EMPLOYEE_REVIEW, Application.Stage.REJECTED))
+        self.assertIsNone(broken.resume_text)
+        self.assertEqual(Notification.objects.filter(user__in=[ok.user, broken.user]).count(), 2)
@@ -0,0 +1,198 @@
+"""
+Text-similarity ATS signal: cosine between sparse TF-IDF vectors of the job text
+(title, role purpose, description, responsibilities) and the candidate's resume +
+profile text. Recorded as its own ApplicationScore (TEXT_MODEL_VERSION); it does not route.
+
+IDF lives in the latest TextModel (`manage.py build_text_model`; there is no text score
+until it has run). Job vectors are cached per (job text revision, TextModel); resumes
+keep their term counts from extraction and their vector norm per TextModel (ResumeTextNorm). Scoring an application is then a
+sparse dot product over the job's terms, plus a norm correction for the few profile terms.
+"""
+import hashlib
+import logging
+import math
+from collections import Counter
+from django.db import transaction
+from jobs.models import Job
+from accounts.models import ResumeText
+from rezoom.text import term_counts, tokenize
+from .ats import _get
+from .models import TextModel, JobTextVector, ResumeTextNorm
+
+log = logging.getLogger(__name__)
+
+TEXT_MODEL_VERSION = "tfidf-v1"
+JOB_TEXT_FIELDS = ("title", "role_purpose", "description_md", "responsibilities_md")
+PROFILE_TEXT_FIELDS = ("skills", "experience", "projects", "education")
+TOP_TERMS = 5
+
+def _strings(value):
+    """Every string inside a JSON-ish value (lists of dicts from the profile)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _strings(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _strings(v)
+
+def job_text(job) -> str:
+    return "\n".join(getattr(job, f, "") or "" for f in JOB_TEXT_FIELDS)
+
+def profile_counts(profile) -> Counter:
+    """Term counts of the scored profile fields (UserProfile or profile_snapshot dict)."""
+    c = Counter()
+    for f in PROFILE_TEXT_FIELDS:
+        for s in _strings(_get(profile, f)):
+            c.update(tokenize(s))
+    return c
+
+# ---- IDF model ----
+
+def build_model(chunk_size=2000) -> TextModel:
+    """
+    Recompute document frequencies over all jobs and extracted resumes and store a new
+    TextModel. Resumes extracted before term counts existed are backfilled on the way.
+    Older models (and their cached job vectors) are dropped.
+    """
+    df, n_docs = Counter(), 0
+    for row in Job.objects.values_list(*JOB_TEXT_FIELDS).iterator(chunk_size=chunk_size):
+        df.update(set(tokenize("\n".join(x or "" for x in row))))
+        n_docs += 1
+
+    stale = []
+    resumes = ResumeText.objects.filter(status=ResumeText.Status.OK).only("id", "terms", "text")
+    for rt in resumes.iterator(chunk_size=chunk_size):
+        if not rt.terms and rt.text:
+            rt.terms = dict(term_counts(rt.text))
+            stale.append(rt)
+        df.update(rt.terms.keys())
+        n_docs += 1
+    if stale:
+        ResumeText.objects.bulk_update(stale, ["terms"], batch_size=chunk_size)
+
+    # smoothed idf; singletons share default_idf instead of bloating the table
+    idf = {t: math.log((1 + n_docs) / (1 + n)) + 1 for t, n in df.items() if n >= 2}
+    with transaction.atomic():
+        model = TextModel.objects.create(n_docs=n_docs, idf=idf,
+                                         default_idf=math.log((1 + n_docs) / 2) + 1)
+        TextModel.objects.exclude(pk=model.pk).delete()
+    _MODELS.clear()
+
+    ids = []
+    for rt_id in resumes.values_list("id", flat=True).iterator(chunk_size=chunk_size):
+        ids.append(rt_id)
+        if len(ids) >= chunk_size:
+            resume_norms(ids, model)
+            ids = []
+    if ids:
+        resume_norms(ids, model)
+    return model
+
+_MODELS = {}  # per-process: TextModel id → TextModel (idf tables are large, load once)
+
+def current_model():
+    """
+    Latest TextModel, or None before `manage.py build_text_model` has run. Never built
+    here: a full scan has no place inside an ATS worker batch.
+    """
+    latest = TextModel.objects.order_by("-id").values_list("id", flat=True).first()
+    if latest is None:
+        return None
+    if latest in _MODELS:
+        return _MODELS[latest]
+    model = TextModel.objects.get(pk=latest)
+    _MODELS.clear()
+    _MODELS[model.id] = model
+    return model
+
+# ---- vectors ----
+
+def _w(n, t, model) -> float:
+    """Sublinear tf × idf."""
+    return (1 + math.log(n)) * model.idf.get(t, model.default_idf)
+
+def _sqnorm(counts, model) -> float:
+    return sum(_w(n, t, model) ** 2 for t, n in counts.items() if n > 0)
+
+def _revision(job) -> str:
+    return hashlib.sha1(job_text(job).encode()).hexdigest()
+
+def job_vector(job, model=None) -> dict:
+    """The job's L2-normalised TF-IDF vector, from the cache while the job text is unchanged."""
+    model = model or current_model()
+    rev = _revision(job)
+    row = JobTextVector.objects.filter(job_id=job.id, text_model=model).only("revision", "vector").first()
+    if row and row.revision == rev:
+        return row.vector
+    counts = term_counts(job_text(job))
+    norm = math.sqrt(_sqnorm(counts, model))
+    vector = {t: _w(n, t, model) / norm for t, n in counts.items()} if norm else {}
+    JobTextVector.objects.update_or_create(job_id=job.id, text_model=model,
+                                           defaults={"revision": rev, "vector": vector})
+    return vector
+
+def resume_norms(resume_texts, model) -> dict:
+    """
+    {resume_text_id: squared norm} under `model`. Accepts ResumeText rows or ids;
+    norms not stored yet are computed (one terms fetch if only ids were given) and saved.
+    """
+    by_id = {getattr(rt, "id", rt): rt for rt in resume_texts}
+    if not by_id:
+        return {}
+    out = dict(ResumeTextNorm.objects.filter(resume_text_id__in=by_id, text_model=model)
+               .values_list("resume_text_id", "sqnorm"))
+    missing = [i for i in by_id if i not in out]
+    if missing:
+        if not all(isinstance(by_id[i], ResumeText) for i in missing):
+            terms = dict(ResumeText.objects.filter(id__in=missing).values_list("id", "terms"))
+        else:
+            terms = {i: by_id[i].terms for i in missing}
+        rows = [ResumeTextNorm(resume_text_id=i, text_model=model, sqnorm=_sqnorm(terms.get(i) or {}, model))
+                for i in missing]
+        ResumeTextNorm.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        out.update((r.resume_text_id, r.sqnorm) for r in rows)
+    return out
+
+def _similarity(job_vec, terms, sqnorm, extra, model) -> tuple[float, list]:
+    """
+    Cosine of (resume terms + extra profile terms) against a job vector.
+    `sqnorm` is the stored norm of `terms` alone; only the extra terms adjust it.
+    """
+    for t, n in extra.items():
+        old = terms.get(t, 0)
+        if old:
+            sqnorm -= _w(old, t, model) ** 2
+        sqnorm += _w(old + n, t, model) ** 2
+    if sqnorm <= 0:
+        return 0.0, []
+    parts = []
+    for t, w in job_vec.items():
+        n = terms.get(t, 0) + extra.get(t, 0)
+        if n:
+            parts.append((w * _w(n, t, model), t))
+    cos = sum(p for p, _ in parts) / math.sqrt(sqnorm)
+    top = [t for _, t in sorted(parts, reverse=True)[:TOP_TERMS]]
+    return min(1.0, cos), top
+
+def text_scores(job, candidates, model=None) -> list[tuple[int, dict]]:
+    """
+    (score_0_100, reasons) per candidate for one job. `candidates` yields
+    (profile_or_snapshot, ResumeText or None) pairs. Empty while no TextModel exists:
+    the text signal is skipped until one is built.
+    """
+    model = model or current_model()
+    if model is None:
+        log.warning("no TF-IDF model yet; skipping the text signal (run build_text_model)")
+        return []
+    jv = job_vector(job, model)
+    candidates = list(candidates)
+    norms = resume_norms([rt for _, rt in candidates if rt is not None], model)
+    out = []
+    for profile, rt in candidates:
+        terms, sqnorm = (rt.terms or {}, norms[rt.id]) if rt is not None else ({}, 0.0)
+        cos, top = _similarity(jv, terms, sqnorm, profile_counts(profile), model)
+        out.append((int(round(cos * 100)), {"similarity": round(cos, 4), "top_terms": top,
+                                            "text_model": model.id}))
+    return out
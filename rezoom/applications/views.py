@@ -3,66 +3,12 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils import timezone
 from django.urls import reverse
+from django.db import transaction
 from notifications.utils import notify
+from tasks.queue import enqueue
 from .models import Application
 from .forms import ApplyForm
 from jobs.models import Job
-from .ats import score_profile_against_job
-
-@login_required
-def apply_to_job(request, job_id):
-    job = get_object_or_404(Job, pk=job_id, status="open")
-    # Optional: restrict to candidate role
-    if request.user.role not in ("USER",) and not request.user.is_superuser:
-        messages.error(request, "Only candidates can apply.")
-        return redirect("job_public_detail", pk=job.id)
-
-    existing = Application.objects.filter(job=job, user=request.user).first()
-    if existing:
-        messages.info(request, "You already applied to this job.")
-        return redirect("job_public_detail", pk=job.id)
-
-    if request.method == "POST":
-        form = ApplyForm(request.POST, request.FILES)
-        if form.is_valid():
-            app = Application.objects.create(
-                job=job,
-                user=request.user,
-                status=Application.Stage.SUBMITTED,
-                created_at=timezone.now(),
-                profile_snapshot={
-                    "skills": request.user.profile.skills,
-                    "education": request.user.profile.education,
-                    "experience": request.user.profile.experience,
-                    "projects": request.user.profile.projects,
-                    "contract_type": request.user.profile.contract_type,
-                    "visa_status": request.user.profile.visa_status,
-                    "github_url": request.user.profile.github_url,
-                },
-            )
-            # attach uploaded resume or fall back to profile resume
-            up = form.cleaned_data.get("resume_file")
-            if up:
-                app.resume_file = up
-            elif request.user.profile.resume:
-                # reuse the candidate's saved resume file
-                app.resume_file = request.user.profile.resume
-            app.save()
-
-            notify(
-                request.user,
-                title="Application submitted",
-                message=f"You applied to {job.title} at {job.company.name}.",
-                url=reverse("job_public_detail", args=[job.id]),
-                send_email=True,
-            )
-
-            messages.success(request, "Application submitted.")
-            return redirect("user_dashboard")
-    else:
-        form = ApplyForm()
-
-    return render(request, "applications/apply.html", {"job": job, "form": form})
 
 from django.db.models import Q
 
@@ -138,17 +84,18 @@ def queue_decide(request, aa_id):
 def build_queue(request):
     """
     Auto-create ApplicationAssignment rows for jobs where this EMP is an ACCEPTED assignee.
-    Pull unassigned applications in Submitted/Employee Review status.
+    Pull unassigned applications that passed ATS (Employee Review status).
     """
     # find jobs this employee accepted
     accepted = JobAssignee.objects.select_related("job").filter(
         employee__user=request.user, status="accepted"
     ).values_list("job_id", flat=True)
 
-    # pull apps not yet assigned to this employee
+    # pull ATS-passed apps not yet assigned to this employee
+    # ("submitted" apps are still waiting for the ATS worker)
     apps = (
         Application.objects
-        .filter(job_id__in=accepted, status__in=["submitted","employee_review"])
+        .filter(job_id__in=accepted, status=Application.Stage.EMPLOYEE_REVIEW)
         .exclude(assignments__employee__user=request.user)
         .order_by("created_at")[:20]  # cap to avoid flooding
     )
@@ -159,10 +106,6 @@ def build_queue(request):
     created = 0
     for app in apps:
         ApplicationAssignment.objects.get_or_create(application=app, employee=emp)
-        # put app into employee_review if still submitted
-        if app.status == Application.Stage.SUBMITTED:
-            app.status = Application.Stage.EMPLOYEE_REVIEW
-            app.save()
         created += 1
 
     if created:
@@ -171,10 +114,13 @@ def build_queue(request):
         messages.info(request, "No new applications available.")
     return redirect("employee_queue")
 
-ATS_THRESHOLD = 70  # feel free to tweak or move to settings
-
 
+@login_required
 def apply_to_job(request, job_id):
+    """
+    Candidate applies. The request only inserts the Application (status=submitted) and
+    enqueues ATS scoring; `run_ats_worker` scores, routes and notifies off the request path.
+    """
     job = get_object_or_404(Job, pk=job_id, status="open")
 
     if request.user.role not in ("USER",) and not request.user.is_superuser:
@@ -189,59 +135,34 @@ def apply_to_job(request, job_id):
     if request.method == "POST":
         form = ApplyForm(request.POST, request.FILES)
         if form.is_valid():
-            # build the application
-            app = Application.objects.create(
-                job=job,
-                user=request.user,
-                status=Application.Stage.SUBMITTED,
-                created_at=timezone.now(),
-                profile_snapshot={
-                    "skills": request.user.profile.skills,
-                    "education": request.user.profile.education,
-                    "experience": request.user.profile.experience,
-                    "projects": request.user.profile.projects,
-                    "contract_type": request.user.profile.contract_type,
-                    "visa_status": request.user.profile.visa_status,
-                    "github_url": request.user.profile.github_url,
-                },
-            )
-            up = form.cleaned_data.get("resume_file")
-            if up:
-                app.resume_file = up
-            elif request.user.profile.resume:
-                app.resume_file = request.user.profile.resume
-
-            # --- ATS scoring ---
-            score, summary = score_profile_against_job(request.user.profile, job)
-            app.ats_score = score
-            app.ats_summary = summary
-            if score >= ATS_THRESHOLD:
-                app.ats_outcome = "pass"
-                app.status = Application.Stage.EMPLOYEE_REVIEW  # ready for EMP queue
-                notify(
-                    request.user,
-                    title="Passed ATS",
-                    message=f"You passed initial screening for {job.title} at {job.company.name}.",
-                    url=reverse("job_public_detail", args=[job.id]),
-                    send_email=True,
-                )
-            else:
-                app.ats_outcome = "below"
-                app.status = Application.Stage.REJECTED
-                app.rejection_reason = "ATS screening below threshold."
-                notify(
-                    request.user,
-                    title="Application update",
-                    message=f"Your application for {job.title} at {job.company.name} did not pass initial screening.",
-                    url=reverse("job_public_detail", args=[job.id]),
-                    send_email=True,
+            profile = request.user.profile
+            # uploaded resume, else reuse the candidate's saved resume file (and its extracted text)
+            upload = form.cleaned_data.get("resume_file")
+            resume = upload or profile.resume or None
+            with transaction.atomic():
+                app = Application.objects.create(
+                    job=job,
+                    user=request.user,
+                    status=Application.Stage.SUBMITTED,
+                    created_at=timezone.now(),
+                    resume_file=resume,
+                    resume_text=None if upload else profile.resume_text,
+                    profile_snapshot={
+                        "skills": profile.skills,
+                        "skill_ids": profile.skill_ids,
+                        "education": profile.education,
+                        "experience": profile.experience,
+                        "projects": profile.projects,
+                        "contract_type": profile.contract_type,
+                        "visa_status": profile.visa_status,
+                        "github_url": profile.github_url,
+                    },
                 )
-
-            app.save()
+                enqueue("ats.score", {"application_id": app.id, "job_id": job.id})
 
             messages.success(request, "Application submitted.")
             return redirect("user_dashboard")
     else:
         form = ApplyForm()
 
-    return render(request, "applications/apply.html", {"job": job, "form": form})
\ No newline at end of file
+    return render(request, "applications/apply.html", {"job": job, "form": form})
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import EmployeeAvailability, Interview, InterviewInterviewer
+from .models import AvailabilityException, AvailabilityRule, EmployeeAvailability, Interview, InterviewInterviewer
 
 @admin.register(EmployeeAvailability)
 class EmployeeAvailabilityAdmin(admin.ModelAdmin):
@@ -8,6 +8,19 @@ class EmployeeAvailabilityAdmin(admin.ModelAdmin):
     date_hierarchy = "start"
     search_fields = ("employee__user__username","employee__user__email")
 
+@admin.register(AvailabilityRule)
+class AvailabilityRuleAdmin(admin.ModelAdmin):
+    list_display = ("employee","weekdays","start_time","end_time","tz","valid_from","valid_until")
+    list_filter  = ("employee__company",)
+    search_fields = ("employee__user__username","employee__user__email")
+
+@admin.register(AvailabilityException)
+class AvailabilityExceptionAdmin(admin.ModelAdmin):
+    list_display = ("employee","start","end","note")
+    list_filter  = ("employee__company",)
+    date_hierarchy = "start"
+    search_fields = ("employee__user__username","employee__user__email","note")
+
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
     list_display = ("id","application","mode","status","start","end","location")
@@ -0,0 +1,157 @@
+"""
+Panel availability. Loads every candidate interviewer's availability (one-off slots
+plus weekly rules, expanded only over the requested window), exceptions and booked
+interviews in four queries, reduces them to sorted free intervals per employee, then
+sweeps all interval endpoints once (O(n log n)) to find when enough of them are free
+together. Bookable panel slots are fixed-length windows on a wall-clock grid inside
+those stretches.
+"""
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from .models import AvailabilityException, AvailabilityRule, EmployeeAvailability, Interview, InterviewInterviewer
+
+# interviews in these states hold their interviewers' time
+BUSY_EXCLUDE = (Interview.Status.CANCELLED,)
+
+
+def _merge(intervals):
+    """Sorted union of (start, end) intervals; touching intervals join."""
+    out = []
+    for s, e in sorted(intervals):
+        if out and s <= out[-1][1]:
+            if e > out[-1][1]:
+                out[-1] = (out[-1][0], e)
+        else:
+            out.append((s, e))
+    return out
+
+
+def _subtract(free, busy):
+    """Merged `free` minus merged `busy`, both sorted (two-pointer walk)."""
+    out, j = [], 0
+    for s, e in free:
+        while j < len(busy) and busy[j][1] <= s:
+            j += 1
+        k = j
+        while k < len(busy) and busy[k][0] < e:
+            if busy[k][0] > s:
+                out.append((s, busy[k][0]))
+            s = max(s, busy[k][1])
+            k += 1
+        if s < e:
+            out.append((s, e))
+    return out
+
+
+def expand_rule(weekdays, start_time, end_time, tz, valid_from, valid_until, since, until):
+    """A weekly rule's occurrences overlapping [since, until), as aware (start, end) pairs."""
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = ZoneInfo("UTC")
+    # from the day before: an overnight occurrence that started then (22:00–02:00) still runs into the window
+    first = max(valid_from, since.astimezone(zone).date() - timezone.timedelta(days=1))
+    last = until.astimezone(zone).date()
+    if valid_until and valid_until < last:
+        last = valid_until
+    out = []
+    for n in range((last - first).days + 1):
+        day = first + timezone.timedelta(days=n)
+        if day.weekday() not in weekdays:
+            continue
+        s = datetime.combine(day, start_time, tzinfo=zone)
+        e = datetime.combine(day, end_time, tzinfo=zone)
+        if e <= s:  # runs past midnight
+            e = datetime.combine(day + timezone.timedelta(days=1), end_time, tzinfo=zone)
+        s, e = s.astimezone(dt_timezone.utc), e.astimezone(dt_timezone.utc)  # slots and the grid are UTC
+        if s < until and e > since:
+            out.append((max(s, since), min(e, until)))
+    return out
+
+
+def free_intervals(employee_ids, since, until) -> dict:
+    """employee id → sorted free (start, end) intervals inside [since, until)."""
+    employee_ids = list(employee_ids)
+    avail, busy = {}, {}
+    for emp, s, e in (EmployeeAvailability.objects
+                      .filter(employee_id__in=employee_ids, is_bookable=True, start__lt=until, end__gt=since)
+                      .values_list("employee_id", "start", "end")):
+        avail.setdefault(emp, []).append((max(s, since), min(e, until)))
+    # dates are local to each rule's timezone: pad the window a day each side, expand_rule clips
+    pad = timezone.timedelta(days=1)
+    for emp, *rule in (AvailabilityRule.objects
+                       .filter(employee_id__in=employee_ids, valid_from__lte=(until + pad).date())
+                       .filter(Q(valid_until__isnull=True) | Q(valid_until__gte=(since - pad).date()))
+                       .values_list("employee_id", "weekdays", "start_time", "end_time", "tz",
+                                    "valid_from", "valid_until")):
+        avail.setdefault(emp, []).extend(expand_rule(*rule, since, until))
+    for emp, s, e in (AvailabilityException.objects
+                      .filter(employee_id__in=employee_ids, start__lt=until, end__gt=since)
+                      .values_list("employee_id", "start", "end")):
+        busy.setdefault(emp, []).append((s, e))
+    for emp, s, e in (InterviewInterviewer.objects
+                      .filter(employee_id__in=employee_ids, interview__start__lt=until, interview__end__gt=since)
+                      .exclude(interview__status__in=BUSY_EXCLUDE)
+                      .values_list("employee_id", "interview__start", "interview__end")):
+        busy.setdefault(emp, []).append((s, e))
+    return {emp: _subtract(_merge(ivs), _merge(busy.get(emp, ()))) for emp, ivs in avail.items()}
+
+
+def common_free(free, size):
+    """
+    [(start, end, frozenset(employee ids))] stretches where at least `size` employees
+    are free, split wherever the set of free employees changes. One sweep over the
+    sorted endpoints of every employee's free intervals.
+    """
+    events = sorted((t, delta, emp) for emp, ivs in free.items()
+                    for s, e in ivs for t, delta in ((s, 1), (e, -1)))
+    active, out, prev = set(), [], None
+    i = 0
+    while i < len(events):
+        t = events[i][0]
+        if active and len(active) >= size and prev < t:
+            out.append((prev, t, frozenset(active)))
+        while i < len(events) and events[i][0] == t:  # apply every endpoint at t before the next stretch
+            _, delta, emp = events[i]
+            if delta > 0:
+                active.add(emp)
+            else:
+                active.discard(emp)
+            i += 1
+        prev = t
+    return out
+
+
+def _grid(t, step):
+    """`t` rounded up to the next multiple of `step` (a timedelta) since midnight UTC."""
+    day = t.replace(hour=0, minute=0, second=0, microsecond=0)
+    n = -(-(t - day) // step)
+    return day + n * step
+
+
+def panel_slots(free, size, duration=None, step=None):
+    """
+    [(start, end, (employee ids…))] bookable `duration` windows on a `step` grid where
+    `size` employees are free for the whole window. The panel is the lowest ids among
+    those free, so repeated calls offer the same panel for the same window.
+    """
+    duration = duration or timezone.timedelta(minutes=getattr(settings, "INTERVIEW_SLOT_MINUTES", 60))
+    step = step or timezone.timedelta(minutes=getattr(settings, "INTERVIEW_SLOT_STEP_MINUTES", 30))
+    stretches = common_free(free, size)
+    slots = []
+    for i, (s, e, _) in enumerate(stretches):
+        t = _grid(s, step)
+        while t < e:
+            # extend across adjacent stretches until the window is covered, keeping who stays free
+            members, end, j = stretches[i][2], e, i
+            while end < t + duration and j + 1 < len(stretches) and stretches[j + 1][0] == end:
+                j += 1
+                members &= stretches[j][2]
+                end = stretches[j][1]
+            if end >= t + duration and len(members) >= size:
+                slots.append((t, t + duration, tuple(sorted(members)[:size])))
+            t += step
+    return slots
@@ -0,0 +1,68 @@
+"""
+Race-free interview booking. Everything happens in one transaction:
+
+1. a conditional UPDATE moves the application from interview_pending to
+   interview_scheduled, so a double-submitted form books once;
+2. the panel's free time is re-checked (rules, time off, interviews booked since the
+   page was rendered);
+3. the interview takes a SlotClaim row per interviewer per grid cell it covers.
+
+Two overlapping bookings for the same interviewer collide on the (employee, start)
+unique constraint and exactly one commits; bookings that share no interviewer time
+touch different keys and never wait on each other.
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from applications.models import Application
+from .availability import free_intervals
+from .models import Interview, InterviewInterviewer, SlotClaim
+
+
+def cells(start, end, step=None):
+    """
+    Grid cells (their start times) that [start, end) touches, on the panel_slots grid.
+    Slots start on the grid and last a whole number of cells (checked at startup by
+    interviews.E001), so back-to-back interviews never share a cell.
+    """
+    step = step or timezone.timedelta(minutes=getattr(settings, "INTERVIEW_SLOT_STEP_MINUTES", 30))
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    t = start - (start - day) % step
+    out = []
+    while t < end:
+        out.append(t)
+        t += step
+    return out
+
+
+def book(app, start, end, panel, mode, location=None, location_text=""):
+    """The new Interview, or None when the slot or the application was taken first."""
+    try:
+        with transaction.atomic():
+            moved = Application.objects.filter(id=app.id, status=Application.Stage.INTERVIEW_PENDING).update(
+                status=Application.Stage.INTERVIEW_SCHEDULED
+            )
+            if not moved:
+                return None
+            free = free_intervals(panel, start, end)
+            if not all(any(s <= start and e >= end for s, e in free.get(emp, ())) for emp in panel):
+                transaction.set_rollback(True)
+                return None
+            iv = Interview.objects.create(
+                application=app,
+                mode=mode,
+                start=start,
+                end=end,
+                status=Interview.Status.AWAITING_EMP_CONFIRM,
+                location=location if mode == Interview.Mode.INPERSON else None,
+                location_text=location_text if mode == Interview.Mode.INPERSON else "",
+                invite_sent_at=timezone.now(),
+            )
+            InterviewInterviewer.objects.bulk_create([InterviewInterviewer(interview=iv, employee_id=e) for e in panel])
+            SlotClaim.objects.bulk_create(
+                [SlotClaim(employee_id=e, start=t, interview=iv) for e in panel for t in cells(start, end)]
+            )
+    except IntegrityError:
+        return None  # another booking claimed one of these cells first
+    app.status = Application.Stage.INTERVIEW_SCHEDULED
+    return iv
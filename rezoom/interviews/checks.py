@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def slot_grid_check(app_configs, **kwargs):
+    """Bookings claim whole grid cells, so an interview must span a whole number of them."""
+    minutes = getattr(settings, "INTERVIEW_SLOT_MINUTES", 60)
+    step = getattr(settings, "INTERVIEW_SLOT_STEP_MINUTES", 30)
+    if step <= 0 or minutes <= 0 or minutes % step:
+        return [Error(
+            f"INTERVIEW_SLOT_MINUTES ({minutes}) must be a positive multiple of "
+            f"INTERVIEW_SLOT_STEP_MINUTES ({step}).",
+            hint="Otherwise back-to-back interviews share a partial grid cell and the second can't be booked.",
+            id="interviews.E001",
+        )]
+    return []
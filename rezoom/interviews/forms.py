@@ -1,5 +1,7 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from django import forms
-from .models import EmployeeAvailability
+from .models import AvailabilityException, AvailabilityRule, EmployeeAvailability
 from companies.models import OfficeLocation
 
 class AvailabilityForm(forms.ModelForm):
@@ -12,19 +14,76 @@ class AvailabilityForm(forms.ModelForm):
         }
 
 
+class AvailabilityRuleForm(forms.ModelForm):
+    weekdays = forms.TypedMultipleChoiceField(choices=AvailabilityRule.WEEKDAYS, coerce=int,
+                                              widget=forms.CheckboxSelectMultiple)
+
+    class Meta:
+        model = AvailabilityRule
+        fields = ["weekdays", "start_time", "end_time", "tz", "valid_from", "valid_until"]
+        labels = {"tz": "Timezone"}
+        widgets = {
+            "start_time": forms.TimeInput(attrs={"type":"time"}),
+            "end_time": forms.TimeInput(attrs={"type":"time"}),
+            "valid_from": forms.DateInput(attrs={"type":"date"}),
+            "valid_until": forms.DateInput(attrs={"type":"date"}),
+        }
+
+    def clean_tz(self):
+        tz = self.cleaned_data["tz"].strip() or "UTC"
+        try:
+            ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise forms.ValidationError("Unknown timezone (use a name like Europe/Berlin).")
+        return tz
+
+    def clean(self):
+        data = super().clean()
+        if data.get("start_time") and data["start_time"] == data.get("end_time"):
+            raise forms.ValidationError("End time must differ from start time (an earlier end runs past midnight).")
+        if data.get("valid_from") and data.get("valid_until") and data["valid_until"] < data["valid_from"]:
+            raise forms.ValidationError("Valid until can't be before valid from.")
+        return data
+
+
+class AvailabilityExceptionForm(forms.ModelForm):
+    class Meta:
+        model = AvailabilityException
+        fields = ["start", "end", "note"]
+        widgets = {
+            "start": forms.DateTimeInput(attrs={"type":"datetime-local"}),
+            "end": forms.DateTimeInput(attrs={"type":"datetime-local"}),
+        }
+
+    def clean(self):
+        data = super().clean()
+        if data.get("start") and data.get("end") and data["end"] <= data["start"]:
+            raise forms.ValidationError("End must be after start.")
+        return data
+
+
+def slot_value(start, panel):
+    return f"{start.isoformat()}|{','.join(map(str, panel))}"
+
+def parse_slot_value(value):
+    """(start, employee ids) from a slot choice value; choices are validated by the form first."""
+    start, panel = value.split("|")
+    return datetime.fromisoformat(start), [int(e) for e in panel.split(",")]
+
+
 class CandidateScheduleForm(forms.Form):
     slot = forms.ChoiceField(choices=[], widget=forms.RadioSelect)
     mode = forms.ChoiceField(choices=[("online","Online"), ("inperson","In person")])
     location = forms.ModelChoiceField(queryset=OfficeLocation.objects.none(), required=False)
     location_text = forms.CharField(required=False)
 
-    def set_slot_choices(self, slots):
-        # slots = queryset of EmployeeAvailability with select_related("employee__user")
+    def set_slot_choices(self, slots, employees):
+        # slots = availability.panel_slots(...) tuples; employees = {id: Employee with user}
         choices = []
-        for s in slots:
-            who = s.employee.user.get_full_name() or s.employee.user.username
-            label = f"{who} — {s.start:%b %d, %Y %I:%M %p} → {s.end:%I:%M %p}"
-            choices.append((str(s.id), label))
+        for start, end, panel in slots:
+            who = ", ".join(employees[e].user.get_full_name() or employees[e].user.username for e in panel)
+            label = f"{who} — {start:%b %d, %Y %I:%M %p} → {end:%I:%M %p}"
+            choices.append((slot_value(start, panel), label))
         self.fields["slot"].choices = choices
 
     def set_location_qs(self, qs):
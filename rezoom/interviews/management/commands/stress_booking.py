@@ -0,0 +1,122 @@
+import datetime as dt
+import multiprocessing
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.utils import timezone
+from accounts.models import User
+from applications.models import Application
+from companies.models import Company, Employee
+from jobs.models import Job, JobAssignee
+from interviews.availability import free_intervals, panel_slots
+from interviews.booking import book
+from interviews.models import AvailabilityRule, Interview, InterviewInterviewer
+
+
+def _attempt(args):
+    """One booking try; runs in a worker thread or process. Returns "won", "lost" or "error"."""
+    app_id, start, end, panel = args
+    try:
+        app = Application.objects.get(id=app_id)
+        return "won" if book(app, start, end, list(panel), Interview.Mode.ONLINE) else "lost"
+    except OperationalError:  # e.g. SQLite lock timeout under heavy contention
+        return "error"
+    finally:
+        connection.close()  # each thread/process opened its own
+
+
+def _init_process():
+    import django
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = ("Fire concurrent bookings at a few hot interview slots and check that nobody is double-booked. "
+            "Builds a throwaway company/job/candidates and removes them afterwards (unless --keep).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidates", type=int, default=200, help="Booking attempts (one per candidate).")
+        parser.add_argument("--employees", type=int, default=3)
+        parser.add_argument("--panel", type=int, default=2, help="Interviewers per interview.")
+        parser.add_argument("--slots", type=int, default=6, help="Hot slots the attempts compete for.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--processes", type=int, default=0, help="Use a process pool instead of threads.")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--keep", action="store_true", help="Leave the fixture data in place.")
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        tag = f"stress-{uuid.uuid4().hex[:8]}"
+        users = []
+        company = Company.objects.create(name=tag)
+        try:
+            job, emps, apps, users = self._fixture(company, tag, opts)
+            now = timezone.now()
+            slots = panel_slots(free_intervals([e.id for e in emps], now, now + dt.timedelta(days=7)), opts["panel"])
+            if not slots:
+                raise CommandError("Fixture produced no bookable slots.")
+            hot = slots[:opts["slots"]]
+            work = [(a.id, *rng.choice(hot)) for a in apps]
+
+            t0 = time.perf_counter()
+            if opts["processes"]:
+                connections.close_all()  # children must open their own DB connections
+                with multiprocessing.Pool(opts["processes"], initializer=_init_process) as pool:
+                    results = pool.map(_attempt, work)
+            else:
+                with ThreadPoolExecutor(opts["threads"]) as pool:
+                    results = list(pool.map(_attempt, work))
+            elapsed = time.perf_counter() - t0
+
+            won, lost, errors = (results.count(k) for k in ("won", "lost", "error"))
+            double = self._double_bookings(emps)
+            booked = Interview.objects.filter(application__job=job).count()
+            workers = f"{opts['processes']} processes" if opts["processes"] else f"{opts['threads']} threads"
+            self.stdout.write(
+                f"{len(work)} attempts on {len(hot)} hot slots with {workers}: {won} booked, {lost} lost the race, "
+                f"{errors} errors in {elapsed:.2f}s ({len(work) / elapsed:.0f} attempts/s)"
+            )
+            if double or booked != won:
+                raise CommandError(f"Double-booked: {double} overlapping interviewer pairs; "
+                                   f"{booked} interviews for {won} reported wins.")
+            self.stdout.write(self.style.SUCCESS("No double bookings."))
+        finally:
+            if not opts["keep"]:
+                company.delete()
+                User.objects.filter(id__in=[u.id for u in users]).delete()
+
+    def _fixture(self, company, tag, opts):
+        emp_users = [User(username=f"{tag}-emp{i}", role=User.Role.EMP) for i in range(opts["employees"])]
+        cand_users = [User(username=f"{tag}-cand{i}", role=User.Role.USER) for i in range(opts["candidates"])]
+        users = User.objects.bulk_create(emp_users + cand_users)
+        emps = Employee.objects.bulk_create(
+            [Employee(user=u, company=company, job_role="Interviewer") for u in emp_users]
+        )
+        job = Job.objects.create(company=company, title=f"{tag} job", interview_panel_size=opts["panel"])
+        JobAssignee.objects.bulk_create(
+            [JobAssignee(job=job, employee=e, status=JobAssignee.InviteStatus.ACCEPTED) for e in emps]
+        )
+        AvailabilityRule.objects.bulk_create(
+            [AvailabilityRule(employee=e, weekdays=list(range(7)), start_time=dt.time(9), end_time=dt.time(17))
+             for e in emps]
+        )
+        apps = Application.objects.bulk_create(
+            [Application(job=job, user=u, status=Application.Stage.INTERVIEW_PENDING) for u in cand_users]
+        )
+        return job, emps, apps, users
+
+    def _double_bookings(self, emps):
+        """Pairs of live interviews that overlap for the same interviewer."""
+        rows = (InterviewInterviewer.objects.filter(employee__in=emps)
+                .exclude(interview__status=Interview.Status.CANCELLED)
+                .order_by("employee_id", "interview__start")
+                .values_list("employee_id", "interview__start", "interview__end"))
+        overlaps, prev = 0, None
+        for emp, s, e in rows:
+            if prev and prev[0] == emp and s < prev[2]:
+                overlaps += 1
+            prev = (emp, s, e) if not prev or prev[0] != emp or e > prev[2] else prev
+        return overlaps
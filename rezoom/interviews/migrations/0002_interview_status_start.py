@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_textmodel_alter_applicationscore_application_and_more'),
+        ('companies', '0002_officelocation'),
+        ('interviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['status', 'start'], name='interviews__status_ac8b7d_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_officelocation'),
+        ('interviews', '0003_availability_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotClaim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_claims', to='companies.employee')),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='claims', to='interviews.interview')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('employee', 'start'), name='uniq_slot_claim')],
+            },
+        ),
+    ]
@@ -19,6 +19,44 @@ class EmployeeAvailability(models.Model):
         return f"{self.employee} · {self.start:%Y-%m-%d %H:%M} → {self.end:%H:%M}"
 
 
+class AvailabilityRule(models.Model):
+    """
+    Weekly recurring availability (RRULE FREQ=WEEKLY;BYDAY=…), e.g. 9:00–17:00 Mon–Fri
+    in the employee's timezone. One row replaces a slot row per hour; interviews.availability
+    expands it only over the window being queried.
+    """
+    WEEKDAYS = ((0, "Mon"), (1, "Tue"), (2, "Wed"), (3, "Thu"), (4, "Fri"), (5, "Sat"), (6, "Sun"))
+
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="availability_rules")
+    weekdays = models.JSONField(default=list)                       # [0..6], Monday = 0
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    tz = models.CharField(max_length=64, default="UTC")             # IANA timezone the times are in
+    valid_from = models.DateField(default=timezone.localdate)
+    valid_until = models.DateField(null=True, blank=True)           # inclusive; open-ended if empty
+
+    class Meta:
+        indexes = [models.Index(fields=["employee","valid_from"])]
+
+    def __str__(self):
+        days = ",".join(label for d, label in self.WEEKDAYS if d in self.weekdays)
+        return f"{self.employee} · {days} {self.start_time:%H:%M}–{self.end_time:%H:%M} {self.tz}"
+
+
+class AvailabilityException(models.Model):
+    """Time carved out of an employee's rules and slots (holiday, blocked afternoon)."""
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="availability_exceptions")
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    note = models.CharField(max_length=140, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["employee","start"])]
+
+    def __str__(self):
+        return f"{self.employee} · off {self.start:%Y-%m-%d %H:%M} → {self.end:%Y-%m-%d %H:%M}"
+
+
 class Interview(models.Model):
     class Mode(models.TextChoices):
         ONLINE = "online", "Online"
@@ -66,6 +104,7 @@ class Interview(models.Model):
         indexes = [
             models.Index(fields=["application","status"]),
             models.Index(fields=["start"]),
+            models.Index(fields=["status","start"]),  # due-reminder scans
         ]
 
     def __str__(self):
@@ -83,3 +122,30 @@ class InterviewInterviewer(models.Model):
 
     def __str__(self):
         return f"{self.employee} on {self.interview_id}"
+
+
+class SlotClaim(models.Model):
+    """
+    One interviewer's grid cell (INTERVIEW_SLOT_STEP_MINUTES long) held by an interview.
+    The unique (employee, start) row is the booking lock: of two concurrent bookings
+    that overlap for any interviewer, exactly one can insert its claims.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="slot_claims")
+    start = models.DateTimeField()
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name="claims")
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["employee", "start"], name="uniq_slot_claim")]
+
+    def __str__(self):
+        return f"{self.employee} · {self.start:%Y-%m-%d %H:%M} → interview {self.interview_id}"
+
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+@receiver(post_save, sender=Interview)
+def release_slot_claims(sender, instance, update_fields=None, **kwargs):
+    # a cancelled interview gives its interviewers' time back
+    if instance.status == Interview.Status.CANCELLED and (update_fields is None or "status" in update_fields):
+        SlotClaim.objects.filter(interview=instance).delete()
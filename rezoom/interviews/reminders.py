@@ -0,0 +1,103 @@
+"""
+Interview reminders. A reminder is due once `start - hours <= now` and its flag is
+unset, so a late or missed run catches up instead of skipping. The windows don't
+overlap: an interview already inside 24h gets only the 24h reminder, and both flags
+flip together. The text counts down from when it is actually sent, so a catch-up
+for an interview confirmed 2 hours out says "in 2 hours", not "tomorrow".
+
+Each batch is one locked id query, one select/prefetch load, one notify_bulk fan-out
+and one UPDATE of the flags, all in one transaction.
+"""
+import time
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from notifications.utils import notify_bulk
+from .models import Interview
+
+# (hours before start, flag field, flags set when sent)
+REMINDERS = (
+    (24, "reminder_24h_sent", ("reminder_24h_sent", "reminder_48h_sent")),
+    (48, "reminder_48h_sent", ("reminder_48h_sent",)),
+)
+
+
+def reminder_text(job, start, now) -> tuple[str, str]:
+    """(title, message) for an interview starting at `start`, worded from `now`."""
+    hours = max(1, round((start - now).total_seconds() / 3600))
+    when = f"{hours} hour" if hours == 1 else f"{hours} hours"
+    return (f"Interview in {when}",
+            f"Reminder: your interview for {job} is in {when}, on {start:%b %d, %Y %I:%M %p}.")
+
+
+def _due(hours, flag, now, inner_hours):
+    qs = Interview.objects.filter(status=Interview.Status.CONFIRMED, start__gt=now,
+                                  start__lte=now + timezone.timedelta(hours=hours), **{flag: False})
+    if inner_hours:  # closer than the next reminder's window: that one is sent instead
+        qs = qs.filter(start__gt=now + timezone.timedelta(hours=inner_hours))
+    return qs
+
+
+def send_due(now=None, batch_size=500):
+    """Send every due reminder. Returns {"48h"/"24h": interviews reminded}."""
+    now = now or timezone.now()
+    sent = {}
+    inner = 0
+    for hours, flag, flags in REMINDERS:
+        due = _due(hours, flag, now, inner)
+        while True:
+            with transaction.atomic():
+                # skip_locked lets parallel runners split the work (no-op on SQLite, which serializes writers)
+                ids = list(due.order_by("start", "id").select_for_update(skip_locked=True)
+                           .values_list("id", flat=True)[:batch_size])
+                if not ids:
+                    break
+                interviews = (Interview.objects.filter(id__in=ids)
+                              .select_related("application__user", "application__job")
+                              .prefetch_related("interviewers__employee__user"))
+                entries = []
+                for iv in interviews:
+                    title, msg = reminder_text(iv.application.job.title, iv.start, now)
+                    users = {iv.application.user_id: iv.application.user}
+                    users.update((ii.employee.user_id, ii.employee.user) for ii in iv.interviewers.all())
+                    entries += [(u, title, msg, None) for u in users.values()]
+                notify_bulk(entries)
+                Interview.objects.filter(id__in=ids).update(**{f: True for f in flags})
+            sent[f"{hours}h"] = sent.get(f"{hours}h", 0) + len(ids)
+        inner = hours
+    return sent
+
+
+def next_due(now=None):
+    """When the next reminder falls due, or None if nothing is scheduled."""
+    now = now or timezone.now()
+    times = []
+    inner = 0
+    for hours, flag, _ in REMINDERS:
+        # same windows as send_due: inside the next reminder's window this one is never sent
+        first = (Interview.objects.filter(status=Interview.Status.CONFIRMED, **{flag: False},
+                                          start__gt=now + timezone.timedelta(hours=inner))
+                 .aggregate(first=Min("start"))["first"])
+        if first:
+            times.append(first - timezone.timedelta(hours=hours))
+        inner = hours
+    return min(times) if times else None
+
+
+def run(loop=False, batch_size=500, max_sleep=None, stdout=None):
+    """
+    send_due() once, or with `loop` forever: after each pass sleep until the next
+    reminder is due, capped at max_sleep so newly confirmed interviews are picked up.
+    """
+    max_sleep = getattr(settings, "REMINDER_MAX_SLEEP_SECONDS", 300) if max_sleep is None else max_sleep
+    while True:
+        sent = send_due(batch_size=batch_size)
+        if stdout and sent:
+            stdout.write(", ".join(f"{name} reminders: {n}" for name, n in sent.items()))
+        if not loop:
+            return sent
+        now = timezone.now()
+        due = next_due(now)
+        wait = max_sleep if due is None else (due - now).total_seconds()
+        time.sleep(min(max(wait, 1), max_sleep))
@@ -1,3 +1,217 @@
-from django.test import TestCase
+import random
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User
+from applications.models import Application
+from companies.models import Company, Employee
+from jobs.models import Job
+from notifications.models import Notification
+from .availability import _merge, _subtract, common_free, expand_rule, panel_slots
+from .booking import cells
+from .forms import AvailabilityRuleForm
+from .models import EmployeeAvailability, Interview, InterviewInterviewer
+from .reminders import send_due
 
-# Create your tests here.
+BASE = datetime(2026, 3, 2, tzinfo=dt_timezone.utc)  # midnight, so the slot grid starts at minute 0
+HORIZON = 24 * 60
+
+
+def _at(minute):
+    return BASE + timedelta(minutes=minute)
+
+
+def _minutes(intervals):
+    """The set of whole minutes covered by half-open (start, end) datetime intervals."""
+    return {m for s, e in intervals for m in range(int((s - BASE).total_seconds()) // 60,
+                                                    int((e - BASE).total_seconds()) // 60)}
+
+
+def _random_intervals(rng, n, longest=180):
+    out = []
+    for _ in range(n):
+        s = rng.randrange(HORIZON)
+        out.append((_at(s), _at(min(HORIZON, s + rng.randint(1, longest)))))
+    return out
+
+
+class AvailabilityOracleTests(SimpleTestCase):
+    """The interval helpers agree with a brute-force minute grid on random data."""
+
+    def setUp(self):
+        self.rng = random.Random(20260302)
+
+    def _assert_normal(self, intervals):
+        # sorted, non-empty, and neither overlapping nor touching
+        for s, e in intervals:
+            self.assertLess(s, e)
+        for (_, e), (s, _) in zip(intervals, intervals[1:]):
+            self.assertLess(e, s)
+
+    def _per_minute(self, free):
+        """For each minute of the horizon, the employees free during it."""
+        covered = {emp: _minutes(ivs) for emp, ivs in free.items()}
+        return [frozenset(emp for emp, ms in covered.items() if m in ms) for m in range(HORIZON)]
+
+    def _free(self):
+        """employee id → merged free intervals, some employees with none."""
+        return {emp: _merge(_random_intervals(self.rng, self.rng.randint(0, 6)))
+                for emp in range(1, self.rng.randint(2, 6))}
+
+    def test_merge(self):
+        for _ in range(300):
+            ivs = _random_intervals(self.rng, self.rng.randint(0, 12))
+            merged = _merge(ivs)
+            self._assert_normal(merged)
+            self.assertEqual(_minutes(merged), _minutes(ivs))
+
+    def test_subtract(self):
+        for _ in range(300):
+            free = _merge(_random_intervals(self.rng, self.rng.randint(0, 8)))
+            busy = _merge(_random_intervals(self.rng, self.rng.randint(0, 8), longest=60))
+            out = _subtract(free, busy)
+            self.assertEqual(out, sorted(out))
+            for s, e in out:
+                self.assertLess(s, e)
+            self.assertEqual(_minutes(out), _minutes(free) - _minutes(busy))
+
+    def test_common_free(self):
+        for _ in range(200):
+            free, size = self._free(), self.rng.randint(1, 3)
+            per_minute = self._per_minute(free)
+            stretches = common_free(free, size)
+            expected = {m for m, who in enumerate(per_minute) if len(who) >= size}
+            self.assertEqual(_minutes((s, e) for s, e, _ in stretches), expected)
+            for s, e, who in stretches:
+                self.assertTrue(all(per_minute[m] == who for m in _minutes([(s, e)])))
+            for (_, e, a), (s, _, b) in zip(stretches, stretches[1:]):
+                self.assertTrue(e < s or a != b)  # split only where the free set changes
+
+    def test_panel_slots(self):
+        for _ in range(200):
+            free, size = self._free(), self.rng.randint(1, 3)
+            step, duration = self.rng.choice([(15, 30), (30, 60), (20, 45), (30, 30)])
+            per_minute = self._per_minute(free)
+            expected = []
+            for t in range(0, HORIZON - duration + 1, step):
+                together = frozenset.intersection(*per_minute[t:t + duration])
+                if len(together) >= size:
+                    expected.append((_at(t), _at(t + duration), tuple(sorted(together)[:size])))
+            got = panel_slots(free, size, timedelta(minutes=duration), timedelta(minutes=step))
+            self.assertEqual(got, expected)
+
+
+class AvailabilityRuleTests(SimpleTestCase):
+    def test_overnight_occurrence_from_the_previous_day(self):
+        # Monday 22:00–02:00; the window opens Tuesday midnight
+        since = BASE + timedelta(days=1)
+        got = expand_rule([0], time(22), time(2), "UTC", date(2026, 1, 1), None, since, since + timedelta(hours=6))
+        self.assertEqual(got, [(since, since + timedelta(hours=2))])
+
+    def test_previous_day_respects_valid_from(self):
+        since = BASE + timedelta(days=1)
+        got = expand_rule([0], time(22), time(2), "UTC", since.date(), None, since, since + timedelta(hours=6))
+        self.assertEqual(got, [])
+
+    def test_form_rejects_empty_and_inverted_rules(self):
+        base = {"weekdays": ["0"], "start_time": "09:00", "end_time": "17:00", "tz": "UTC",
+                "valid_from": "2026-03-02"}
+        self.assertTrue(AvailabilityRuleForm(base).is_valid())
+        self.assertTrue(AvailabilityRuleForm({**base, "start_time": "22:00", "end_time": "02:00"}).is_valid())
+        for bad in ({"end_time": "09:00"}, {"valid_until": "2026-03-01"}):
+            with self.subTest(bad=bad):
+                self.assertFalse(AvailabilityRuleForm({**base, **bad}).is_valid())
+
+
+class AvailabilityPageTests(TestCase):
+    def test_booked_slots_show_as_booked(self):
+        company = Company.objects.create(name="Acme")
+        user = User.objects.create_user("emp", password="x", role=User.Role.EMP)
+        emp = Employee.objects.create(user=user, company=company, job_role="Engineer")
+        cand = User.objects.create_user("cand", password="x", role=User.Role.USER)
+        app = Application.objects.create(job=Job.objects.create(company=company, title="Engineer"), user=cand)
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        taken, free, cancelled = (EmployeeAvailability.objects.create(
+            employee=emp, start=start + timedelta(hours=h), end=start + timedelta(hours=h + 1)) for h in (0, 2, 4))
+        for slot, status in ((taken, Interview.Status.CONFIRMED), (cancelled, Interview.Status.CANCELLED)):
+            interview = Interview.objects.create(application=app, start=slot.start, end=slot.end, status=status)
+            InterviewInterviewer.objects.create(interview=interview, employee=emp)
+        self.client.force_login(user)
+        resp = self.client.get(reverse("availability_list"))
+        self.assertEqual({s.id: s.booked for s in resp.context["slots"]},
+                         {taken.id: True, free.id: False, cancelled.id: False})
+        self.assertContains(resp, "<td>Booked</td>", count=1)
+
+
+class ReminderTests(TestCase):
+    """Each reminder goes out once, worded from when it is sent, even when sent late."""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        cls.emp_user = User.objects.create_user("emp", role=User.Role.EMP)
+        cls.emp = Employee.objects.create(user=cls.emp_user, company=company, job_role="Engineer")
+        cls.cand = User.objects.create_user("cand", role=User.Role.USER)
+        cls.app = Application.objects.create(job=Job.objects.create(company=company, title="Engineer"), user=cls.cand)
+
+    def _interview(self, start):
+        iv = Interview.objects.create(application=self.app, start=start, end=start + timedelta(hours=1),
+                                      status=Interview.Status.CONFIRMED)
+        InterviewInterviewer.objects.create(interview=iv, employee=self.emp)
+        return iv
+
+    def _sent(self, now):
+        """send_due at `now`, then the titles it notified, one per interview (candidate and interviewer agree)."""
+        Notification.objects.all().delete()
+        send_due(now=now)
+        cand, emp = (sorted(Notification.objects.filter(user=u).values_list("title", flat=True))
+                     for u in (self.cand, self.emp_user))
+        self.assertEqual(cand, emp)
+        return cand
+
+    def test_on_time(self):
+        self._interview(BASE + timedelta(hours=48))
+        self.assertEqual(self._sent(BASE - timedelta(minutes=1)), [])
+        self.assertEqual(self._sent(BASE), ["Interview in 48 hours"])
+        self.assertEqual(self._sent(BASE + timedelta(hours=1)), [])
+        self.assertEqual(self._sent(BASE + timedelta(hours=24, minutes=10)), ["Interview in 24 hours"])
+        self.assertEqual(self._sent(BASE + timedelta(hours=30)), [])
+
+    def test_confirmed_late(self):
+        iv = self._interview(BASE + timedelta(hours=2))
+        self.assertEqual(self._sent(BASE), ["Interview in 2 hours"])
+        self.assertIn("is in 2 hours, on Mar 02, 2026 02:00 AM", Notification.objects.first().message)
+        iv.refresh_from_db()
+        self.assertTrue(iv.reminder_24h_sent and iv.reminder_48h_sent)
+        self.assertEqual(self._sent(BASE + timedelta(minutes=30)), [])
+
+    def test_late_cron_run(self):
+        self._interview(BASE + timedelta(hours=48))
+        self.assertEqual(self._sent(BASE + timedelta(hours=18)), ["Interview in 30 hours"])  # missed the 48h mark
+        self.assertEqual(self._sent(BASE + timedelta(hours=47, minutes=20)), ["Interview in 1 hour"])
+
+
+class BookingTests(SimpleTestCase):
+    def test_back_to_back_interviews_share_no_cell(self):
+        step = timedelta(minutes=30)
+        first = cells(_at(540), _at(600), step)
+        second = cells(_at(600), _at(660), step)
+        self.assertEqual(first, [_at(540), _at(570)])
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(cells(_at(545), _at(575), step), [_at(540), _at(570)])  # off-grid touches both
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    """Threads racing for the same few slots never double-book an interviewer."""
+
+    def test_no_double_bookings(self):
+        out = StringIO()
+        # raises CommandError on any overlapping interviews or a win without an interview
+        call_command("stress_booking", candidates=60, employees=3, panel=2, slots=6, threads=8, seed=7, stdout=out)
+        self.assertIn("No double bookings.", out.getvalue())
+        self.assertGreater(int(re.search(r"(\d+) booked", out.getvalue()).group(1)), 0)
+        self.assertFalse(Interview.objects.exists())  # fixture cleaned up
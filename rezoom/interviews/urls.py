@@ -1,10 +1,17 @@
 from django.urls import path
-from .views import availability_list, availability_add, availability_delete, schedule_invite, pending_confirms, confirm_interview
+from .views import (availability_list, availability_add, availability_delete, availability_rule_add,
+                    availability_rule_delete, availability_exception_add, availability_exception_delete,
+                    schedule_invite, pending_confirms, confirm_interview)
 
 urlpatterns = [
     path("availability/", availability_list, name="availability_list"),
     path("availability/add/", availability_add, name="availability_add"),
     path("availability/delete/<int:slot_id>/", availability_delete, name="availability_delete"),
+    path("availability/rules/add/", availability_rule_add, name="availability_rule_add"),
+    path("availability/rules/delete/<int:rule_id>/", availability_rule_delete, name="availability_rule_delete"),
+    path("availability/off/add/", availability_exception_add, name="availability_exception_add"),
+    path("availability/off/delete/<int:exception_id>/", availability_exception_delete,
+         name="availability_exception_delete"),
 
     path("schedule/<int:app_id>/", schedule_invite, name="schedule_invite"),
     path("pending/", pending_confirms, name="pending_confirms"),
@@ -1,24 +1,82 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from django.contrib import messages
+from django.db.models import Exists, OuterRef
 import time
-from notifications.utils import notify
+from notifications.utils import notify, notify_many
 from django.urls import reverse
 from companies.models import Employee, OfficeLocation
 from jobs.models import JobAssignee
 from applications.models import Application
-from .models import EmployeeAvailability, Interview, InterviewInterviewer
-from .forms import AvailabilityForm, CandidateScheduleForm
+from .models import AvailabilityException, AvailabilityRule, EmployeeAvailability, Interview, InterviewInterviewer
+from .availability import BUSY_EXCLUDE, free_intervals, panel_slots
+from .booking import book
+from .forms import (AvailabilityForm, AvailabilityExceptionForm, AvailabilityRuleForm, CandidateScheduleForm,
+                    parse_slot_value)
 
 @login_required
 def availability_list(request):
     emp = Employee.objects.get(user=request.user)
+    # booking no longer flips is_bookable; a slot is taken when a live interview of ours overlaps it
+    booked = (InterviewInterviewer.objects
+              .filter(employee=emp, interview__start__lt=OuterRef("end"), interview__end__gt=OuterRef("start"))
+              .exclude(interview__status__in=BUSY_EXCLUDE))
     slots = (EmployeeAvailability.objects
              .filter(employee=emp)
+             .annotate(booked=Exists(booked))
              .order_by("start"))
-    form = AvailabilityForm()
-    return render(request, "interviews/availability.html", {"slots": slots, "form": form})
+    return render(request, "interviews/availability.html", {
+        "slots": slots,
+        "rules": emp.availability_rules.order_by("valid_from", "start_time"),
+        "exceptions": emp.availability_exceptions.filter(end__gte=timezone.now()).order_by("start"),
+        "form": AvailabilityForm(),
+        "rule_form": AvailabilityRuleForm(initial={"tz": settings.TIME_ZONE, "weekdays": [0, 1, 2, 3, 4]}),
+        "exception_form": AvailabilityExceptionForm(),
+    })
+
+@login_required
+def availability_rule_add(request):
+    emp = Employee.objects.get(user=request.user)
+    if request.method == "POST":
+        form = AvailabilityRuleForm(request.POST)
+        if form.is_valid():
+            rule = form.save(commit=False)
+            rule.employee = emp
+            rule.save()
+            messages.success(request, "Weekly availability added.")
+        else:
+            messages.error(request, "Could not add rule: " + " ".join(e for errs in form.errors.values() for e in errs))
+    return redirect("availability_list")
+
+@login_required
+def availability_rule_delete(request, rule_id):
+    emp = Employee.objects.get(user=request.user)
+    AvailabilityRule.objects.filter(id=rule_id, employee=emp).delete()
+    messages.info(request, "Weekly availability removed.")
+    return redirect("availability_list")
+
+@login_required
+def availability_exception_add(request):
+    emp = Employee.objects.get(user=request.user)
+    if request.method == "POST":
+        form = AvailabilityExceptionForm(request.POST)
+        if form.is_valid():
+            exc = form.save(commit=False)
+            exc.employee = emp
+            exc.save()
+            messages.success(request, "Time off added.")
+        else:
+            messages.error(request, "Could not add time off: " + " ".join(e for errs in form.errors.values() for e in errs))
+    return redirect("availability_list")
+
+@login_required
+def availability_exception_delete(request, exception_id):
+    emp = Employee.objects.get(user=request.user)
+    AvailabilityException.objects.filter(id=exception_id, employee=emp).delete()
+    messages.info(request, "Time off removed.")
+    return redirect("availability_list")
 
 @login_required
 def availability_add(request):
@@ -45,8 +103,8 @@ def availability_delete(request, slot_id):
 @login_required
 def schedule_invite(request, app_id):
     """
-    Candidate picks a 1-hour slot with an accepted assignee.
-    Creates Interview(status=awaiting_emp_confirm). Marks slot unbookable.
+    Candidate picks a 1-hour slot when a panel of accepted assignees is free together.
+    Creates Interview(status=awaiting_emp_confirm); booked time drops out of later offers.
     """
     app = get_object_or_404(
         Application.objects.select_related("job__company", "user"),
@@ -56,70 +114,42 @@ def schedule_invite(request, app_id):
         messages.info(request, "This application is not ready for scheduling yet.")
         return redirect("user_dashboard")
 
-    # employees who ACCEPTED for this job
-    accepted_emps = Employee.objects.filter(
+    # employees who ACCEPTED for this job; a panel is job.interview_panel_size of them free together
+    accepted_emps = {e.id: e for e in Employee.objects.select_related("user").filter(
         assignments__job=app.job, assignments__status="accepted"
-    )
-    # bookable future slots (next 21 days)
+    )}
+    panel_size = max(1, min(app.job.interview_panel_size, len(accepted_emps)))
+    # bookable future slots (next 21 days), booked interviews already subtracted
     now = timezone.now()
     until = now + timezone.timedelta(days=21)
-    slots = (EmployeeAvailability.objects
-             .select_related("employee__user")
-             .filter(employee__in=accepted_emps, is_bookable=True, start__gte=now, start__lte=until)
-             .order_by("start"))
+    slots = panel_slots(free_intervals(accepted_emps, now, until), panel_size)
 
     form = CandidateScheduleForm()
-    form.set_slot_choices(slots)
+    form.set_slot_choices(slots, accepted_emps)
     form.set_location_qs(OfficeLocation.objects.filter(company=app.job.company))
 
     if request.method == "POST":
         form = CandidateScheduleForm(request.POST)
-        form.set_slot_choices(slots)  # must set choices again on POST
+        form.set_slot_choices(slots, accepted_emps)  # must set choices again on POST
         form.set_location_qs(OfficeLocation.objects.filter(company=app.job.company))
         if form.is_valid():
-            slot_id = int(form.cleaned_data["slot"])
+            start, panel = parse_slot_value(form.cleaned_data["slot"])
+            end = next(e for s, e, p in slots if s == start and list(p) == panel)
             mode = form.cleaned_data["mode"]
             loc = form.cleaned_data.get("location")
             loc_text = form.cleaned_data.get("location_text") or ""
 
-            # re-check slot still available & belongs to accepted employees
-            slot = EmployeeAvailability.objects.select_related("employee").filter(
-                id=slot_id, is_bookable=True, employee__in=accepted_emps
-            ).first()
-            if not slot:
+            iv = book(app, start, end, panel, mode, location=loc, location_text=loc_text)
+            if iv is None:
                 messages.error(request, "That slot is no longer available. Pick another.")
                 return redirect("schedule_invite", app_id=app.id)
-
-            # create interview
-            iv = Interview.objects.create(
-                application=app,
-                mode=mode,
-                start=slot.start,
-                end=slot.end,
-                status=Interview.Status.AWAITING_EMP_CONFIRM,
-                location=loc if mode == "inperson" else None,
-                location_text=loc_text if mode == "inperson" else "",
-                invite_sent_at=timezone.now(),
-            )
-
-            interviewer_user = slot.employee.user
-            notify(
-                interviewer_user,
+            notify_many(
+                [accepted_emps[e].user for e in panel],
                 title="Interview to confirm",
                 message=f"{app.user.username} requested {iv.start:%b %d, %Y %I:%M %p} for {app.job.title}.",
                 url=reverse("pending_confirms"),
                 send_email=True,
             )
-            # interviewer is the owner of the slot
-            InterviewInterviewer.objects.create(interview=iv, employee=slot.employee)
-
-            # mark slot taken
-            slot.is_bookable = False
-            slot.save(update_fields=["is_bookable"])
-
-            # advance application status
-            app.status = Application.Stage.INTERVIEW_SCHEDULED
-            app.save(update_fields=["status"])
 
             messages.success(request, "Interview requested! Waiting for interviewer to confirm.")
             return redirect("user_dashboard")
@@ -1,5 +1,7 @@
-from django.contrib import admin
-from .models import Job, JobAssignee
+from django.contrib import admin, messages
+from .models import Job, JobAssignee, JobMatch
+from skills.utils import intern_job_skills
+from .salary import apply_annual_salary
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
@@ -19,7 +21,8 @@ class JobAdmin(admin.ModelAdmin):
             "fields": ("req_quals","pref_quals","perf_metrics")
         }),
         ("Compensation & Benefits", {
-            "fields": ("salary_min","salary_max","currency","pay_period","benefits")
+            "fields": ("salary_min","salary_max","currency","pay_period",
+                       "salary_min_annual_usd","salary_max_annual_usd","benefits")
         }),
         ("Work Environment", {
             "fields": ("team_size","tools")
@@ -31,10 +34,22 @@ class JobAdmin(admin.ModelAdmin):
             "fields": ("created_at","updated_at"),
         }),
     )
-    readonly_fields = ("created_at","updated_at")
+    readonly_fields = ("created_at","updated_at","salary_min_annual_usd","salary_max_annual_usd")
+
+    def save_model(self, request, obj, form, change):
+        unmatched = intern_job_skills(obj)
+        if unmatched:
+            self.message_user(request, "Not in the skill vocabulary: " + ", ".join(unmatched), messages.WARNING)
+        apply_annual_salary(obj)
+        super().save_model(request, obj, form, change)
 
 @admin.register(JobAssignee)
 class JobAssigneeAdmin(admin.ModelAdmin):
     list_display = ("job","employee","status","priority")
     list_filter  = ("status","job__company")
     search_fields = ("job__title","employee__user__username","employee__user__email")
+
+@admin.register(JobMatch)
+class JobMatchAdmin(admin.ModelAdmin):
+    list_display = ("user","job","score","updated_at")
+    search_fields = ("user__username","job__title")
@@ -0,0 +1,122 @@
+"""
+Read-only JSON API for open job listings and details.
+
+Built for pollers: every response carries a strong ETag and Last-Modified, and a
+matching If-None-Match / If-Modified-Since gets a bare 304 after one aggregate
+query, before any rows are loaded or serialized. Anything that changes a served
+field must bump Job.updated_at (bulk writers set it by hand), or pollers keep
+getting 304s for stale rows.
+
+Access follows the HTML job pages (signed-in users) unless JOBS_API_PUBLIC is set;
+anonymous requests then get a 401 before any conditional-GET work.
+"""
+import hashlib
+from functools import wraps
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+from rezoom.pagination import keyset_page
+from .models import Job
+from . import facets, search
+
+API_VERSION = "1"  # part of every ETag: bump when the payload shape changes
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+LIST_FIELDS = ("id", "title", "company__id", "company__name", "location_mode", "location_text", "emp_type",
+               "deadline", "salary_min", "salary_max", "currency", "pay_period",
+               "salary_min_annual_usd", "salary_max_annual_usd", "created_at", "updated_at")
+DETAIL_FIELDS = LIST_FIELDS + ("department", "role_purpose", "description_md", "responsibilities_md",
+                               "req_quals", "pref_quals", "tools", "benefits", "visa_sponsorship")
+
+
+def _api_auth(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not getattr(settings, "JOBS_API_PUBLIC", False) and not request.user.is_authenticated:
+            return JsonResponse({"detail": "Authentication required."}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _etag(*parts) -> str:
+    return hashlib.sha1("|".join(map(str, (API_VERSION,) + parts)).encode()).hexdigest()
+
+
+def _listing(request):
+    """(queryset, cursor, size, filter key) for this request, plus its ETag state, computed once."""
+    if not hasattr(request, "_job_listing"):
+        qs = Job.objects.filter(status=Job.Status.OPEN)
+        q = request.GET.get("q", "").strip()
+        selected = facets.selected_filters(request.GET)
+        # newest first, not by relevance: the filter set is every match
+        qs = search.matching(facets.apply_filters(qs, selected), q)
+        limit = request.GET.get("limit", "")
+        size = min(int(limit), MAX_PAGE_SIZE) if limit.isdigit() and int(limit) > 0 else PAGE_SIZE
+        cursor = request.GET.get("cursor", "")
+        # newest change + row count over the filter set: any edit, close or delete moves one of them
+        state = qs.order_by().aggregate(last=Max("updated_at"), n=Count("id"))
+        key = sorted(selected.items()) + [("q", q), ("cursor", cursor), ("limit", size)]
+        request._job_listing = (qs, cursor, size, key, state)
+    return request._job_listing
+
+
+def _list_etag(request):
+    _, _, _, key, state = _listing(request)
+    return _etag(key, state["last"], state["n"])
+
+
+def _list_last_modified(request):
+    return _listing(request)[4]["last"]
+
+
+def _row(job, fields):
+    out = {f: getattr(job, f) for f in fields if "__" not in f}
+    out["company"] = {"id": job.company.id, "name": job.company.name}
+    out["url"] = reverse("job_detail_api", args=[job.id])
+    return out
+
+
+@require_GET
+@_api_auth
+@condition(etag_func=_list_etag, last_modified_func=_list_last_modified)
+def job_list_api(request):
+    qs, cursor, size, _, state = _listing(request)
+    qs = qs.select_related("company").only(*LIST_FIELDS)
+    jobs, next_cursor = keyset_page(qs, ("-created_at", "-id"), cursor, size)
+    next_url = None
+    if next_cursor:
+        params = request.GET.copy()
+        params["cursor"] = next_cursor
+        next_url = f"{request.path}?{params.urlencode()}"
+    response = JsonResponse({"count": state["n"], "next": next_url,
+                             "results": [_row(j, LIST_FIELDS) for j in jobs]})
+    patch_cache_control(response, no_cache=True)  # clients may store it, but must revalidate
+    return response
+
+
+def _detail_state(request, pk):
+    if not hasattr(request, "_job_detail"):
+        request._job_detail = (Job.objects.filter(pk=pk, status=Job.Status.OPEN)
+                               .values_list("updated_at", flat=True).first())
+    return request._job_detail
+
+
+def _detail_etag(request, pk):
+    updated = _detail_state(request, pk)
+    return _etag(pk, updated) if updated else None
+
+
+@require_GET
+@_api_auth
+@condition(etag_func=_detail_etag, last_modified_func=_detail_state)
+def job_detail_api(request, pk):
+    job = get_object_or_404(Job.objects.select_related("company").only(*DETAIL_FIELDS),
+                             pk=pk, status=Job.Status.OPEN)
+    response = JsonResponse(_row(job, DETAIL_FIELDS))
+    patch_cache_control(response, no_cache=True)
+    return response
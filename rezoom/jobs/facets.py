@@ -0,0 +1,120 @@
+"""
+Facet counts for the job browse sidebar, from one GROUP BY over the current filter set.
+
+Counts are disjunctive: each facet applies every *other* selected filter, so with
+"remote" picked the mode facet still shows how many onsite/hybrid jobs there are.
+The query groups by all facet dimensions at once; the per-facet sums run in Python
+over the grouped rows. Results are cached per normalized filter key for
+JOB_FACETS_TTL seconds, and any Job save/delete moves to a new cache generation.
+"""
+import hashlib
+import json
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, Count, IntegerField, Value, When
+from .models import Job
+
+SALARY_STEPS = (50_000, 100_000, 150_000, 200_000)
+COMPANY_LIMIT = 30
+_GEN_KEY = "jobs:facets:gen"
+
+
+def selected_filters(params) -> dict:
+    """The facet filters in a GET QueryDict, validated and normalized."""
+    selected = {}
+    mode = params.get("mode", "").strip()
+    if mode in Job.Mode.values:
+        selected["mode"] = mode
+    company = params.get("company", "").strip()
+    if company.isdigit():
+        selected["company"] = int(company)
+    emp_type = params.get("type", "").strip()
+    if emp_type:
+        selected["emp_type"] = emp_type
+    min_salary = params.get("min", "").strip()
+    if min_salary.isdigit():
+        selected["min"] = int(min_salary)
+    return selected
+
+
+def apply_filters(qs, selected):
+    if "mode" in selected:
+        qs = qs.filter(location_mode=selected["mode"])
+    if "company" in selected:
+        qs = qs.filter(company_id=selected["company"])
+    if "emp_type" in selected:
+        qs = qs.filter(emp_type=selected["emp_type"])
+    if "min" in selected:
+        qs = qs.filter(salary_min_annual_usd__gte=selected["min"])
+    return qs
+
+
+def bump_generation():
+    cache.set(_GEN_KEY, time.time_ns(), None)
+
+
+def facet_counts(base_qs, q, selected) -> dict:
+    """
+    {"total", "mode", "company", "emp_type", "salary"} for `base_qs` (open jobs matching
+    the search box, before facet filters) under the `selected` facet filters.
+    """
+    key = hashlib.sha1(json.dumps({"q": q, **selected}, sort_keys=True).encode()).hexdigest()
+    cache_key = f"jobs:facets:{cache.get_or_set(_GEN_KEY, 0, None)}:{key}"
+    result = cache.get(cache_key)
+    if result is None:
+        result = _compute(base_qs, selected)
+        cache.set(cache_key, result, getattr(settings, "JOB_FACETS_TTL", 60))
+    return result
+
+
+def _keep(row, selected, skip):
+    for facet, value in selected.items():
+        if facet == skip:
+            continue
+        if facet == "mode" and row["location_mode"] != value:
+            return False
+        if facet == "company" and row["company_id"] != value:
+            return False
+        if facet == "emp_type" and row["emp_type"] != value:
+            return False
+        if facet == "min" and not row["min_ok"]:
+            return False
+    return True
+
+
+def _compute(base_qs, selected):
+    groups = {"salary_bucket": Case(
+        *[When(salary_min_annual_usd__gte=s, then=Value(s)) for s in reversed(SALARY_STEPS)],
+        default=Value(0), output_field=IntegerField())}
+    if "min" in selected:  # arbitrary minimum: its own group column, buckets are too coarse
+        groups["min_ok"] = Case(When(salary_min_annual_usd__gte=selected["min"], then=Value(True)),
+                                default=Value(False), output_field=BooleanField())
+    rows = list(base_qs.order_by()
+                .annotate(**groups)
+                .values("location_mode", "company_id", "company__name", "emp_type", *groups)
+                .annotate(n=Count("id")))
+
+    def counts(skip, key):
+        c = Counter()
+        for row in rows:
+            if _keep(row, selected, skip):
+                c[key(row)] += row["n"]
+        return c
+
+    modes = counts("mode", lambda r: r["location_mode"])
+    companies = counts("company", lambda r: (r["company_id"], r["company__name"]))
+    top = companies.most_common(COMPANY_LIMIT)
+    if "company" in selected and all(cid != selected["company"] for (cid, _), _ in top):
+        top += [(k, n) for k, n in companies.items() if k[0] == selected["company"]]
+    emp_types = counts("emp_type", lambda r: r["emp_type"])
+    buckets = counts("min", lambda r: r["salary_bucket"])
+
+    return {
+        "total": sum(counts(None, lambda r: 0).values()),
+        "mode": [(value, label, modes.get(value, 0)) for value, label in Job.Mode.choices],
+        "company": sorted(((cid, name, n) for (cid, name), n in top), key=lambda x: x[1].lower()),
+        "emp_type": [(t, n) for t, n in emp_types.most_common() if t],
+        "salary": [(s, sum(n for b, n in buckets.items() if b >= s)) for s in SALARY_STEPS],
+    }
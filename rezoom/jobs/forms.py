@@ -1,6 +1,8 @@
 from django import forms
 from .models import Job, JobAssignee
 from companies.models import Company, Employee
+from skills.utils import intern_job_skills
+from .salary import apply_annual_salary
 
 BENEFIT_CHOICES = [
     ("healthcare","Healthcare"),("dental","Dental"),("vision","Vision"),
@@ -38,6 +40,7 @@ class JobForm(forms.ModelForm):
             "role_purpose","description_md","responsibilities_md",
             "salary_min","salary_max","currency","pay_period",
             "visa_sponsorship","background_check_required","security_clearance","eeo_text",
+            "interview_panel_size",
         ]
         widgets = {
             "role_purpose": forms.Textarea(attrs={"rows":3}),
@@ -75,6 +78,8 @@ class JobForm(forms.ModelForm):
         job.tools         = self._csv(cd.get("tools_text"))
         job.benefits      = cd.get("benefits_choice") or []
         job.pay_period    = cd.get("pay_period") or "year"
+        self.unmatched_skills = intern_job_skills(job)  # req_quals/tools → Skill ids, once per save
+        apply_annual_salary(job)
         if commit: job.save()
         self._assignees_ids = cd.get("assignees") or []  # stash for view to create JobAssignee rows
         return job
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from jobs.models import Job
+from jobs.salary import SALARY_FIELDS, SALARY_TABLE_VERSION, apply_annual_salary
+
+class Command(BaseCommand):
+    help = "Recompute salary_min/max_annual_usd for jobs stored under an older conversion table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute every job, not just stale ones.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        size = max(1, opts["batch_size"])
+        qs = Job.objects.only("id", *SALARY_FIELDS).order_by("id")
+        if not opts["all"]:
+            qs = qs.exclude(salary_table_version=SALARY_TABLE_VERSION)
+        # the API serves these columns and its ETags key on updated_at, which bulk_update leaves alone
+        fields = ["salary_min_annual_usd", "salary_max_annual_usd", "salary_table_version", "updated_at"]
+        batch, total = [], 0
+        for job in qs.iterator(chunk_size=size):
+            apply_annual_salary(job)
+            job.updated_at = timezone.now()
+            batch.append(job)
+            if len(batch) >= size:
+                Job.objects.bulk_update(batch, fields)
+                total += len(batch)
+                batch = []
+        if batch:
+            Job.objects.bulk_update(batch, fields)
+            total += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Annualized salaries for {total} jobs (table {SALARY_TABLE_VERSION})."))
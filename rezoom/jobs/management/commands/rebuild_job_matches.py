@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs.matches import refresh_jobs
+from jobs.models import Job, JobMatch
+
+class Command(BaseCommand):
+    help = "Rebuild the JobMatch table from scratch (open jobs × candidates sharing a skill)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        size = max(1, opts["chunk_size"])
+        total = 0
+        with transaction.atomic():
+            JobMatch.objects.all().delete()
+            ids = list(Job.objects.filter(status=Job.Status.OPEN).values_list("id", flat=True))
+            for i in range(0, len(ids), 100):
+                total += refresh_jobs(ids[i:i + 100], chunk_size=size)
+        self.stdout.write(self.style.SUCCESS(f"{total} job matches for {len(ids)} open jobs."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs import search
+
+class Command(BaseCommand):
+    help = "Rebuild the job full-text search index from the jobs table."
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            backend = search.rebuild()
+        if backend is None:
+            self.stdout.write(self.style.WARNING("No full-text backend for this database; search uses icontains."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Job search index rebuilt ({type(backend).__name__})."))
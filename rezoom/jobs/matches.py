@@ -0,0 +1,70 @@
+"""
+JobMatch maintenance. A row exists only when the candidate shares at least one
+skill with an open job; scores come from the same blend as the ATS.
+
+Both directions go through the skill indexes: a job is scored against the profiles
+sharing one of its interned skills (ProfileSkill), a profile against the jobs sharing
+one of its skills (JobSkill). Jobs without interned skills are matched on text, so
+they are scored against everyone.
+"""
+from django.db.models import Exists, OuterRef, Q
+from accounts.models import UserProfile
+from applications.ats import JOB_SCORE_FIELDS, PROFILE_SCORE_FIELDS, score_profiles_against_job
+from skills.index import job_ids_with_skills, job_skill_ids, profile_ids_with_skills
+from skills.models import JobSkill
+from .models import Job, JobMatch
+
+CANDIDATE_FIELDS = ("id", "user_id", *PROFILE_SCORE_FIELDS)
+
+
+def _rows(job, profiles):
+    return [JobMatch(user_id=p.user_id, job_id=job.id, score=score)
+            for p, (score, summary) in zip(profiles, score_profiles_against_job(profiles, job))
+            if summary["req_match"] or summary["tools_match"]]
+
+
+def refresh_jobs(job_ids, chunk_size=2000):
+    """Recompute the JobMatch column of each job (dropped entirely once it's no longer open)."""
+    JobMatch.objects.filter(job_id__in=job_ids).delete()
+    jobs = Job.objects.filter(id__in=job_ids, status=Job.Status.OPEN).only("id", *JOB_SCORE_FIELDS)
+    total = 0
+    for job in jobs:
+        profiles = UserProfile.objects.filter(user__role="USER").only(*CANDIDATE_FIELDS).order_by("id")
+        skill_ids = job_skill_ids(job)
+        if skill_ids:  # only profiles sharing an interned skill can match
+            profiles = profiles.filter(id__in=profile_ids_with_skills(skill_ids))
+        chunk = []
+        for prof in profiles.iterator(chunk_size=chunk_size):
+            chunk.append(prof)
+            if len(chunk) >= chunk_size:
+                total += len(JobMatch.objects.bulk_create(_rows(job, chunk), batch_size=chunk_size))
+                chunk = []
+        if chunk:
+            total += len(JobMatch.objects.bulk_create(_rows(job, chunk), batch_size=chunk_size))
+    return total
+
+
+def refresh_users(user_ids, chunk_size=2000):
+    """
+    Recompute the JobMatch rows of each candidate: one pass over the open jobs that share
+    a skill with anyone in the group (or have no interned skills), not over every open job.
+    """
+    JobMatch.objects.filter(user_id__in=user_ids).delete()
+    profiles = list(UserProfile.objects.filter(user_id__in=user_ids, user__role="USER").only(*CANDIDATE_FIELDS))
+    if not profiles:
+        return 0
+    skill_ids = set().union(*(p.skill_ids or [] for p in profiles))
+    jobs = (Job.objects.filter(status=Job.Status.OPEN)
+            .filter(Q(id__in=job_ids_with_skills(skill_ids)) | ~Exists(JobSkill.objects.filter(job=OuterRef("pk"))))
+            .only("id", *JOB_SCORE_FIELDS).order_by("id"))
+    rows, total = [], 0
+    for job in jobs.iterator(chunk_size=chunk_size):
+        # the same pairs refresh_jobs would score: a job with interned skills only sees profiles sharing one
+        want = job_skill_ids(job)
+        rows.extend(_rows(job, [p for p in profiles if not want or want & set(p.skill_ids or [])]))
+        if len(rows) >= chunk_size:
+            total += len(JobMatch.objects.bulk_create(rows, batch_size=chunk_size))
+            rows = []
+    if rows:
+        total += len(JobMatch.objects.bulk_create(rows, batch_size=chunk_size))
+    return total
@@ -0,0 +1,52 @@
+from django.db import migrations, OperationalError
+
+# full-text index for jobs.search; the backend is picked per database vendor
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE jobs_job_fts USING fts5("
+    "title, role_purpose, description_md, responsibilities_md, tokenize = 'porter unicode61')",
+    "INSERT INTO jobs_job_fts (rowid, title, role_purpose, description_md, responsibilities_md) "
+    "SELECT id, title, role_purpose, description_md, responsibilities_md FROM jobs_job",
+]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE jobs_job_fts ("
+    "job_id integer PRIMARY KEY REFERENCES jobs_job (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX jobs_job_fts_document_gin ON jobs_job_fts USING GIN (document)",
+    "INSERT INTO jobs_job_fts (job_id, document) SELECT id, "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(role_purpose, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description_md, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(responsibilities_md, '')), 'C') FROM jobs_job",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}.get(vendor)
+    if not statements:
+        return  # no full-text backend: jobs.search falls back to icontains
+    try:
+        for sql in statements:
+            schema_editor.execute(sql)
+    except OperationalError:
+        if vendor != "sqlite":
+            raise
+        # SQLite compiled without FTS5; jobs.search detects the missing table
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS jobs_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_req_skill_ids_job_tool_skill_ids'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_salary_max_annual_usd_job_salary_min_annual_usd_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='interview_panel_size',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_job_interview_panel_size'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='salary_max_annual_usd',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='salary_min_annual_usd',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
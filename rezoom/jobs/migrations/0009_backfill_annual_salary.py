@@ -0,0 +1,84 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import migrations
+from django.utils import timezone
+
+# jobs.salary as of this migration, frozen: later rate changes go through backfill_salaries
+SALARY_TABLE_VERSION = "2026-10"
+
+# USD per 1 unit of currency
+USD_RATES = {
+    "USD": Decimal("1"),
+    "EUR": Decimal("1.08"),
+    "GBP": Decimal("1.27"),
+    "CAD": Decimal("0.73"),
+    "AUD": Decimal("0.66"),
+    "NZD": Decimal("0.60"),
+    "CHF": Decimal("1.12"),
+    "SEK": Decimal("0.095"),
+    "NOK": Decimal("0.093"),
+    "DKK": Decimal("0.145"),
+    "PLN": Decimal("0.25"),
+    "INR": Decimal("0.012"),
+    "SGD": Decimal("0.74"),
+    "JPY": Decimal("0.0067"),
+    "CNY": Decimal("0.14"),
+    "BRL": Decimal("0.18"),
+    "MXN": Decimal("0.055"),
+    "ZAR": Decimal("0.055"),
+    "AED": Decimal("0.27"),
+}
+
+PERIODS_PER_YEAR = {
+    "year": Decimal("1"),
+    "month": Decimal("12"),
+    "week": Decimal("52"),
+    "day": Decimal("260"),
+    "hour": Decimal("2080"),
+}
+PERIOD_ALIASES = {"yearly": "year", "annual": "year", "annually": "year", "monthly": "month",
+                  "weekly": "week", "daily": "day", "hourly": "hour"}
+
+
+def annual_usd(amount, currency, period):
+    if amount is None:
+        return None
+    rate = USD_RATES.get((currency or "USD").strip().upper())
+    p = (period or "year").strip().lower()
+    per_year = PERIODS_PER_YEAR.get(PERIOD_ALIASES.get(p, p))
+    if rate is None or per_year is None:
+        return None
+    return int((Decimal(amount) * rate * per_year).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+FIELDS = ["salary_min_annual_usd", "salary_max_annual_usd", "salary_table_version", "updated_at"]
+
+
+def backfill(apps, schema_editor):
+    """
+    Annualize the salaries of jobs saved before the columns existed, so they show up in
+    the min-salary filter and the salary sort without a manual backfill_salaries run.
+    """
+    Job = apps.get_model("jobs", "Job")
+    batch = []
+    for job in (Job.objects.exclude(salary_table_version=SALARY_TABLE_VERSION)
+                .only("id", "salary_min", "salary_max", "currency", "pay_period").iterator(chunk_size=2000)):
+        job.salary_min_annual_usd = annual_usd(job.salary_min, job.currency, job.pay_period)
+        job.salary_max_annual_usd = annual_usd(job.salary_max, job.currency, job.pay_period)
+        job.salary_table_version = SALARY_TABLE_VERSION
+        job.updated_at = timezone.now()  # served by the API: moves its ETags
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, FIELDS)
+            batch = []
+    Job.objects.bulk_update(batch, FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_annual_salary_bigint'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from companies.models import Company, Employee
-from accounts.models import User
+from accounts.models import User, UserProfile
 
 class Job(models.Model):
     class Mode(models.TextChoices):
@@ -35,6 +35,7 @@ class Job(models.Model):
 
     # --- Qualifications (checkbox-like in UI, flexible here) ---
     req_quals = models.JSONField(default=list, blank=True)  # e.g. ["3+ years Django","PostgreSQL","React"]
+    req_skill_ids = models.JSONField(default=list, blank=True)  # interned skills.Skill ids for req_quals
     pref_quals = models.JSONField(default=list, blank=True)
     perf_metrics = models.JSONField(default=list, blank=True)  # how success is measured
 
@@ -43,14 +44,20 @@ class Job(models.Model):
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     currency = models.CharField(max_length=8, blank=True, default="USD")
     pay_period = models.CharField(max_length=16, blank=True, default="year")  # year/month/hour
+    # derived by jobs.salary at save time: whole USD per year, for filters/sorts
+    salary_min_annual_usd = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    salary_max_annual_usd = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    salary_table_version = models.CharField(max_length=16, blank=True, editable=False)
     benefits = models.JSONField(default=list, blank=True)  # pick-list in UI, stored as list of strings
 
     # --- Work Environment ---
     team_size = models.PositiveIntegerField(null=True, blank=True)
     tools = models.JSONField(default=list, blank=True)  # ["Django","Docker","Jira"]
+    tool_skill_ids = models.JSONField(default=list, blank=True)  # interned skills.Skill ids for tools
 
     # --- Legal & Compliance ---
     visa_sponsorship = models.BooleanField(default=False)
+    interview_panel_size = models.PositiveSmallIntegerField(default=1)  # accepted assignees per interview
     background_check_required = models.BooleanField(default=False)
     security_clearance = models.CharField(max_length=64, blank=True)
     eeo_text = models.TextField(blank=True)
@@ -65,6 +72,8 @@ class Job(models.Model):
             models.Index(fields=["company", "status"]),
             models.Index(fields=["title"]),
             models.Index(fields=["deadline"]),
+            models.Index(fields=["status", "created_at", "id"]),  # browse keyset order
+            models.Index(fields=["status", "salary_min_annual_usd", "id"]),  # min-salary filter / sort
         ]
 
     def __str__(self):
@@ -93,3 +102,57 @@ class JobAssignee(models.Model):
 
     def __str__(self):
         return f"{self.employee} → {self.job} ({self.status})"
+
+
+class JobMatch(models.Model):
+    """
+    Materialized profile match: a candidate's ATS-blend score for an open job they share
+    at least one skill with. Kept current by the jobmatch.* tasks (jobs.matches).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="job_matches")
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="matches")
+    score = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "job")
+        indexes = [models.Index(fields=["user", "-score", "-job"])]  # browse: ORDER BY score DESC
+
+    def __str__(self):
+        return f"{self.user_id} × job {self.job_id}: {self.score}"
+
+# keep the full-text index (jobs.search) in step with job text
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tasks.queue import enqueue
+from applications.ats import JOB_SCORE_FIELDS, PROFILE_SCORE_FIELDS
+from . import facets, search
+
+@receiver(post_save, sender=Job)
+def index_job_text(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(search.SEARCH_FIELDS):
+        return
+    search.index_job(instance)
+
+@receiver(post_delete, sender=Job)
+def unindex_job_text(sender, instance, **kwargs):
+    search.remove_job(instance.pk)
+
+# cached browse facet counts start a new generation on any job change
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_job_facets(sender, **kwargs):
+    facets.bump_generation()
+
+# ...and JobMatch, off the request path: the worker recomputes one job's column / one user's row
+@receiver(post_save, sender=Job)
+def queue_job_matches(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & {"status", *JOB_SCORE_FIELDS}:
+        return
+    transaction.on_commit(lambda: enqueue("jobmatch.job", {"job_id": instance.pk}))
+
+@receiver(post_save, sender=UserProfile)
+def queue_profile_matches(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not set(update_fields) & set(PROFILE_SCORE_FIELDS)):
+        return
+    transaction.on_commit(lambda: enqueue("jobmatch.profile", {"user_id": instance.user_id}))
@@ -0,0 +1,67 @@
+"""
+Salary normalization: every job's range as whole US dollars per year, so min-salary
+filters and salary sorts compare like with like and run off an index.
+
+The conversion table is local and versioned. When rates change, edit USD_RATES,
+bump SALARY_TABLE_VERSION and run `manage.py backfill_salaries`; only jobs stored
+under an older version are recomputed.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+SALARY_TABLE_VERSION = "2026-10"
+
+# USD per 1 unit of currency
+USD_RATES = {
+    "USD": Decimal("1"),
+    "EUR": Decimal("1.08"),
+    "GBP": Decimal("1.27"),
+    "CAD": Decimal("0.73"),
+    "AUD": Decimal("0.66"),
+    "NZD": Decimal("0.60"),
+    "CHF": Decimal("1.12"),
+    "SEK": Decimal("0.095"),
+    "NOK": Decimal("0.093"),
+    "DKK": Decimal("0.145"),
+    "PLN": Decimal("0.25"),
+    "INR": Decimal("0.012"),
+    "SGD": Decimal("0.74"),
+    "JPY": Decimal("0.0067"),
+    "CNY": Decimal("0.14"),
+    "BRL": Decimal("0.18"),
+    "MXN": Decimal("0.055"),
+    "ZAR": Decimal("0.055"),
+    "AED": Decimal("0.27"),
+}
+
+# pay periods per year (full-time: 40 h/week, 52 weeks, 260 working days)
+PERIODS_PER_YEAR = {
+    "year": Decimal("1"),
+    "month": Decimal("12"),
+    "week": Decimal("52"),
+    "day": Decimal("260"),
+    "hour": Decimal("2080"),
+}
+_PERIOD_ALIASES = {"yearly": "year", "annual": "year", "annually": "year", "monthly": "month",
+                   "weekly": "week", "daily": "day", "hourly": "hour"}
+
+SALARY_FIELDS = ("salary_min", "salary_max", "currency", "pay_period")
+
+
+def annual_usd(amount, currency, period):
+    """Whole USD per year, or None when the amount, currency or period is unknown."""
+    if amount is None:
+        return None
+    rate = USD_RATES.get((currency or "USD").strip().upper())
+    p = (period or "year").strip().lower()
+    per_year = PERIODS_PER_YEAR.get(_PERIOD_ALIASES.get(p, p))
+    if rate is None or per_year is None:
+        return None
+    return int((Decimal(amount) * rate * per_year).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def apply_annual_salary(job):
+    """Fill job.salary_min/max_annual_usd for the current table (no save)."""
+    job.salary_min_annual_usd = annual_usd(job.salary_min, job.currency, job.pay_period)
+    job.salary_max_annual_usd = annual_usd(job.salary_max, job.currency, job.pay_period)
+    job.salary_table_version = SALARY_TABLE_VERSION
+    return job
@@ -0,0 +1,238 @@
+"""
+Full-text search over job text, one interface for every database:
+
+  - SQLite:     FTS5 virtual table `jobs_job_fts` (rowid = job id), ranked with bm25()
+  - PostgreSQL: `jobs_job_fts(job_id, document tsvector)` + GIN index, ranked with ts_rank_cd()
+  - anything else (or SQLite built without FTS5): icontains scans, newest first
+
+Tables are created by migration 0003 and kept in sync by the Job post_save/post_delete
+receivers. Query syntax: plain words (all must match), `word*` prefixes, "quoted phrases".
+"""
+import math
+import re
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rezoom.pagination import decode_cursor, encode_cursor
+
+SEARCH_FIELDS = ("title", "role_purpose", "description_md", "responsibilities_md")
+
+_PHRASE = re.compile(r'"([^"]*)"')
+_TERM = re.compile(r"(\w+)(\*)?")
+
+
+def parse_query(q) -> list:
+    """[("word"|"prefix"|"phrase", [words]), ...] from the user's search box."""
+    terms = []
+    for phrase in _PHRASE.findall(q or ""):
+        words = re.findall(r"\w+", phrase)
+        if len(words) > 1:
+            terms.append(("phrase", words))
+        elif words:
+            terms.append(("word", words))
+    for m in _TERM.finditer(_PHRASE.sub(" ", q or "")):
+        terms.append(("prefix" if m.group(2) else "word", [m.group(1)]))
+    return terms
+
+
+class SQLiteBackend:
+    table = "jobs_job_fts"
+    # bm25 column weights, in SEARCH_FIELDS order: a title hit beats a body hit
+    weights = (10.0, 4.0, 1.0, 1.0)
+
+    @staticmethod
+    def available(conn) -> bool:
+        with conn.cursor() as c:
+            c.execute("SELECT 1 FROM sqlite_master WHERE name = %s", ["jobs_job_fts"])
+            return c.fetchone() is not None
+
+    @staticmethod
+    def expression(terms) -> str:
+        parts = []
+        for kind, words in terms:
+            quoted = '"' + " ".join(words) + '"'  # \w-only words: nothing left to escape
+            parts.append(quoted + "*" if kind == "prefix" else quoted)
+        return " ".join(parts)
+
+    def matches(self, terms):
+        return f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [self.expression(terms)]
+
+    def search(self, terms, within, after, limit):
+        sql, params = within
+        rank = f"bm25({self.table}, {', '.join(map(str, self.weights))})"  # lower is better
+        # rank in the MATCH query's own WHERE: bm25() isn't reliable through a subquery
+        seek, seek_params = "", []
+        if after is not None:
+            seek = f"AND ({rank} > %s OR ({rank} = %s AND rowid > %s)) "
+            seek_params = [after[0], after[0], after[1]]
+        with connection.cursor() as c:
+            c.execute(
+                f"SELECT rowid, {rank} FROM {self.table} WHERE {self.table} MATCH %s AND rowid IN ({sql}) "
+                f"{seek}ORDER BY {rank}, rowid LIMIT %s",
+                [self.expression(terms), *params, *seek_params, limit])
+            return c.fetchall()
+
+    def index(self, job):
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [job.pk])
+            c.execute(f"INSERT INTO {self.table} (rowid, {', '.join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s)",
+                      [job.pk] + [getattr(job, f) or "" for f in SEARCH_FIELDS])
+
+    def remove(self, job_id):
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [job_id])
+
+    def rebuild(self):
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {self.table}")
+            c.execute(f"INSERT INTO {self.table} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                      f"SELECT id, {', '.join(SEARCH_FIELDS)} FROM jobs_job")
+
+
+class PostgresBackend:
+    table = "jobs_job_fts"
+    config = "english"
+    # title A, role purpose B, description/responsibilities C
+    document = ("setweight(to_tsvector('english', coalesce(%s, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(%s, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(%s, '')), 'C') || "
+                "setweight(to_tsvector('english', coalesce(%s, '')), 'C')")
+
+    @staticmethod
+    def available(conn) -> bool:
+        return True  # created unconditionally by the migration
+
+    @staticmethod
+    def expression(terms) -> str:
+        parts = []
+        for kind, words in terms:
+            if kind == "phrase":
+                parts.append("(" + " <-> ".join(words) + ")")
+            else:
+                parts.append(words[0] + (":*" if kind == "prefix" else ""))
+        return " & ".join(parts)
+
+    def matches(self, terms):
+        return (f"SELECT job_id FROM {self.table} WHERE document @@ to_tsquery('{self.config}', %s)",
+                [self.expression(terms)])
+
+    def search(self, terms, within, after, limit):
+        sql, params = within
+        rank = "ts_rank_cd(document, query)"  # higher is better
+        seek, seek_params = "", []
+        if after is not None:
+            seek = f"AND ({rank} < %s OR ({rank} = %s AND job_id < %s)) "
+            seek_params = [after[0], after[0], after[1]]
+        with connection.cursor() as c:
+            c.execute(
+                f"SELECT job_id, {rank} FROM {self.table}, to_tsquery('{self.config}', %s) query "
+                f"WHERE document @@ query AND job_id IN ({sql}) "
+                f"{seek}ORDER BY {rank} DESC, job_id DESC LIMIT %s",
+                [self.expression(terms), *params, *seek_params, limit])
+            return c.fetchall()
+
+    def index(self, job):
+        with connection.cursor() as c:
+            c.execute(
+                f"INSERT INTO {self.table} (job_id, document) VALUES (%s, {self.document}) "
+                f"ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document",
+                [job.pk] + [getattr(job, f) or "" for f in SEARCH_FIELDS])
+
+    def remove(self, job_id):
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {self.table} WHERE job_id = %s", [job_id])
+
+    def rebuild(self):
+        with connection.cursor() as c:
+            c.execute(f"DELETE FROM {self.table}")
+            c.execute(f"INSERT INTO {self.table} (job_id, document) "
+                      f"SELECT id, {self.document % SEARCH_FIELDS} FROM jobs_job")
+
+
+_BACKENDS = {"sqlite": SQLiteBackend, "postgresql": PostgresBackend}
+_backend = {}  # per-process, keyed by connection alias
+
+
+def get_backend():
+    """The full-text backend for the default database, or None (→ icontains fallback)."""
+    if connection.alias not in _backend:
+        cls = _BACKENDS.get(connection.vendor)
+        _backend[connection.alias] = cls() if cls and cls.available(connection) else None
+    return _backend[connection.alias]
+
+
+def _icontains(terms) -> Q:
+    cond = Q()
+    for _, words in terms:
+        text = " ".join(words)
+        cond &= Q(*[Q(**{f"{f}__icontains": text}) for f in SEARCH_FIELDS], _connector=Q.OR)
+    return cond
+
+
+def _rank_cursor(token):
+    """(rank, id) from a search cursor, or None (→ first page) for anything else."""
+    values = decode_cursor(token)
+    if values is None or len(values) != 2:
+        return None
+    rank, job_id = values
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)) or not math.isfinite(rank):
+        return None
+    if isinstance(job_id, bool) or not isinstance(job_id, int) or not 0 < job_id < 2 ** 63:
+        return None
+    return rank, job_id
+
+
+def search(qs, q, cursor=None, size=50):
+    """
+    (jobs, next_cursor) for one page of the jobs in `qs` matching `q`, best match
+    first; None without a full-text backend or search terms (then filter with
+    matching() and page some other way). Keyset-paged on (rank, id) like
+    rezoom.pagination, so every match is reachable and page N is one index query,
+    as cheap as page 1. The index holds every job: `qs` (open jobs, plus any facet
+    filters) is applied inside the full-text query.
+    """
+    terms = parse_query(q)
+    backend = get_backend() if terms else None
+    if backend is None:
+        return None
+    within = qs.order_by().values("pk").query.sql_with_params()
+    rows = backend.search(terms, within, _rank_cursor(cursor), size + 1)  # [(id, rank)] best first
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor([rows[-1][1], rows[-1][0]])
+    by_id = qs.in_bulk([job_id for job_id, _ in rows])
+    return [by_id[job_id] for job_id, _ in rows if job_id in by_id], next_cursor
+
+
+def matching(qs, q):
+    """
+    `qs` narrowed to every job matching `q`, unranked: for facet counts and for
+    listings sorted some other way (the API, profile matches).
+    """
+    terms = parse_query(q)
+    if not terms:
+        return qs
+    backend = get_backend()
+    if backend is None:
+        return qs.filter(_icontains(terms))
+    return qs.filter(pk__in=RawSQL(*backend.matches(terms)))
+
+
+def index_job(job):
+    backend = get_backend()
+    if backend is not None:
+        backend.index(job)
+
+
+def remove_job(job_id):
+    backend = get_backend()
+    if backend is not None:
+        backend.remove(job_id)
+
+
+def rebuild():
+    backend = get_backend()
+    if backend is not None:
+        backend.rebuild()
+    return backend
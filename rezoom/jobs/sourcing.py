@@ -0,0 +1,40 @@
+import heapq
+from accounts.models import UserProfile
+from applications.ats import score_profiles_against_job
+from skills.index import profile_ids_with_skills
+
+def top_candidates(job, k=20, chunk_size=2000):
+    """
+    Best-matching candidate profiles for a job, by the same blend as the ATS.
+    Only profiles sharing at least one of the job's skills (via the inverted index)
+    are loaded and scored; a size-k heap keeps memory flat.
+    Returns [(profile, score, summary)] sorted by score desc.
+    """
+    skill_ids = set(job.req_skill_ids or []) | set(job.tool_skill_ids or [])
+    if not skill_ids:
+        return []
+    qs = (UserProfile.objects
+          .filter(id__in=profile_ids_with_skills(skill_ids), user__role="USER")
+          .select_related("user")
+          .only("id", "user__id", "user__username", "user__first_name", "user__last_name",
+                "skills", "skill_ids", "projects", "github_url", "visa_status")
+          .order_by("id"))
+
+    heap, chunk = [], []
+
+    def flush():
+        for prof, (score, summary) in zip(chunk, score_profiles_against_job(chunk, job)):
+            item = (score, -prof.id, prof, summary)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        chunk.clear()
+
+    for prof in qs.iterator(chunk_size=chunk_size):
+        chunk.append(prof)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    return [(prof, score, summary) for score, _, prof, summary in sorted(heap, key=lambda x: x[:2], reverse=True)]
@@ -0,0 +1,12 @@
+from tasks.queue import register
+from .matches import refresh_jobs, refresh_users
+
+@register("jobmatch.job")
+def refresh_job_matches(tasks):
+    """Recompute JobMatch for saved jobs (one column each). Payload: {"job_id"}."""
+    refresh_jobs({t.payload["job_id"] for t in tasks})
+
+@register("jobmatch.profile")
+def refresh_profile_matches(tasks):
+    """Recompute JobMatch for saved profiles (one row each). Payload: {"user_id"}."""
+    refresh_users({t.payload["user_id"] for t in tasks})
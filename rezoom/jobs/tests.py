@@ -1,3 +1,266 @@
-from django.test import TestCase
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from accounts.models import User, UserProfile
+from companies.models import Company
+from rezoom.testing import BAD_CURSORS
+from applications.ats import score_profile_against_job
+from skills.models import ProfileSkill
+from skills.utils import intern_job_skills, intern_profile_skills
+from . import search, views
+from .matches import refresh_jobs, refresh_users
+from .models import Job, JobMatch
+from .salary import SALARY_TABLE_VERSION
+from .sourcing import top_candidates
 
-# Create your tests here.
+BASE = datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc)
+
+
+class JobPaginationTests(TestCase):
+    """Walking every page yields each matching job exactly once, in order; bad cursors give page 1."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("cand", password="x", role=User.Role.USER)
+        company = Company.objects.create(name="Acme")
+        jobs = []
+        for i in range(130):
+            jobs.append(Job(
+                company=company, title=f"Engineer {i}",
+                status=Job.Status.CLOSED if i % 10 == 9 else Job.Status.OPEN,
+                created_at=BASE + timedelta(minutes=i // 4),           # ties: several jobs per timestamp
+                salary_min_annual_usd=None if i % 6 == 5 else 50_000 + (i % 7) * 1000,
+            ))
+        Job.objects.bulk_create(jobs)
+        search.rebuild()  # bulk_create skips the indexing receivers
+        cls.open = list(Job.objects.filter(status=Job.Status.OPEN))
+        JobMatch.objects.bulk_create(
+            [JobMatch(user=cls.user, job=j, score=j.id % 5 * 10) for j in cls.open if j.id % 4]
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _walk_html(self, params):
+        ids, query, pages = [], "&".join(f"{k}={v}" for k, v in params.items()), 0
+        while query is not None:
+            resp = self.client.get(reverse("job_browse") + "?" + query)
+            self.assertEqual(resp.status_code, 200)
+            ids += [j.id for j in resp.context["jobs"]]
+            query = resp.context["next_query"]
+            pages += 1
+            self.assertLess(pages, 20)
+        return ids
+
+    def _walk_api(self, params):
+        ids, url = [], reverse("job_list_api") + "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        while url:
+            data = self.client.get(url).json()
+            ids += [r["id"] for r in data["results"]]
+            url = data["next"]
+        return ids
+
+    def test_browse_walks_all_pages_newest_first(self):
+        ids = self._walk_html({})
+        expected = [j.id for j in sorted(self.open, key=lambda j: (j.created_at, j.id), reverse=True)]
+        self.assertEqual(ids, expected)
+
+    def test_salary_sort_walks_all_pages(self):
+        ids = self._walk_html({"sort": "salary"})
+        with_salary = [j for j in self.open if j.salary_min_annual_usd is not None]
+        expected = [j.id for j in sorted(with_salary, key=lambda j: (j.salary_min_annual_usd, j.id), reverse=True)]
+        self.assertEqual(ids, expected)
+
+    def test_profile_matches_walk_all_pages(self):
+        ids = self._walk_html({"profile": "1"})
+        matches = JobMatch.objects.filter(user=self.user).values_list("score", "job_id")
+        self.assertEqual(ids, [job_id for _, job_id in sorted(matches, reverse=True)])
+
+    def test_search_walks_all_pages(self):
+        ids = self._walk_html({"q": "engineer"})
+        # equal ranks (same title text): ties page in id order, with no job lost or repeated at a boundary
+        self.assertEqual(ids, sorted(j.id for j in self.open))
+
+    def test_api_walks_all_pages(self):
+        ids = self._walk_api({"limit": 17})
+        expected = [j.id for j in sorted(self.open, key=lambda j: (j.created_at, j.id), reverse=True)]
+        self.assertEqual(ids, expected)
+
+    def test_bad_cursor_gives_first_page(self):
+        for params in ({}, {"sort": "salary"}, {"profile": "1"}, {"q": "engineer"}):
+            first = self.client.get(reverse("job_browse"), params).context["jobs"]
+            for cursor in BAD_CURSORS:
+                with self.subTest(params=params, cursor=cursor):
+                    resp = self.client.get(reverse("job_browse"), {**params, "cursor": cursor})
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual([j.id for j in resp.context["jobs"]], [j.id for j in first])
+
+    def test_api_bad_cursor_gives_first_page(self):
+        first = self.client.get(reverse("job_list_api")).json()["results"]
+        for cursor in BAD_CURSORS:
+            with self.subTest(cursor=cursor):
+                resp = self.client.get(reverse("job_list_api"), {"cursor": cursor})
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp.json()["results"], first)
+
+
+class JobMatchRefreshTests(TestCase):
+    """A profile save (refresh_users) and a job save (refresh_jobs) agree on every JobMatch row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = Company.objects.create(name="Acme")
+        specs = [(["Python", "Django"], ["Docker"]), (["Go"], ["k8s"]), (["React", "TypeScript"], []),
+                 (["Underwater basket weaving"], []), (["postgres"], ["Redis", "Python"])]
+        for i, (req, tools) in enumerate(specs):
+            job = Job(company=company, title=f"Job {i}", req_quals=req, tools=tools)
+            intern_job_skills(job)
+            job.save()
+        Job.objects.create(company=company, title="Closed", req_quals=["Python"], status=Job.Status.CLOSED)
+        skills = [["python"], ["golang", "docker"], ["basket weaving"], [], ["React", "Redis"], ["Rust"]]
+        for i, sk in enumerate(skills):
+            profile = User.objects.create_user(f"cand{i}", password="x", role=User.Role.USER).profile
+            profile.skills = sk
+            intern_profile_skills(profile)
+            profile.save()
+        cls.users = list(User.objects.filter(role=User.Role.USER).values_list("id", flat=True))
+
+    def _rows(self):
+        return set(JobMatch.objects.values_list("user_id", "job_id", "score"))
+
+    def test_user_refresh_matches_job_refresh(self):
+        refresh_jobs(list(Job.objects.values_list("id", flat=True)))
+        by_job = self._rows()
+        self.assertTrue(by_job)
+        JobMatch.objects.all().delete()
+        refresh_users(self.users)
+        self.assertEqual(self._rows(), by_job)
+        JobMatch.objects.all().delete()
+        for u in self.users:  # batch composition doesn't matter
+            refresh_users([u])
+        self.assertEqual(self._rows(), by_job)
+
+    def test_profile_browse_says_how_many_jobs_are_hidden(self):
+        refresh_users(self.users)
+        user = User.objects.get(username="cand0")
+        self.client.force_login(user)
+        resp = self.client.get(reverse("job_browse"), {"profile": "1"})
+        n = JobMatch.objects.filter(user=user).count()
+        self.assertEqual(resp.context["matched_total"], n)
+        self.assertContains(resp, f"showing the {n} of 5 jobs")
+        self.assertContains(resp, "Show all 5 jobs")
+
+
+class JobSearchTests(TestCase):
+    """Facet filters apply inside the ranked search, every match is reachable, and facets count them all."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("cand", password="x")
+        cls.a, cls.b = Company.objects.create(name="Acme"), Company.objects.create(name="Bolt")
+        for i in range(10):  # title hits: rank above every job at B
+            Job.objects.create(company=cls.a, title=f"Python developer {i}")
+        cls.b_jobs = [Job.objects.create(company=cls.b, title=f"Engineer {i}", description_md="Some python.")
+                      for i in range(3)]
+        Job.objects.create(company=cls.b, title="Java developer")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        patcher = mock.patch.object(views, "PAGE_SIZE", 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_filtered_matches_below_the_limit(self):
+        resp = self.client.get(reverse("job_browse"), {"q": "python", "company": self.b.id})
+        self.assertEqual({j.id for j in resp.context["jobs"]}, {j.id for j in self.b_jobs})
+        facet = resp.context["facets"]
+        self.assertEqual(facet["total"], 3)
+        self.assertEqual(facet["company"], [(self.a.id, "Acme", 10), (self.b.id, "Bolt", 3)])
+        data = self.client.get(reverse("job_list_api"), {"q": "python", "company": self.b.id}).json()
+        self.assertEqual(sorted(r["id"] for r in data["results"]), sorted(j.id for j in self.b_jobs))
+
+    def test_walks_every_match_best_first(self):
+        ids, query = [], "q=python"
+        while query:
+            resp = self.client.get(reverse("job_browse") + "?" + query)
+            self.assertLessEqual(len(resp.context["jobs"]), 5)
+            ids += [j.id for j in resp.context["jobs"]]
+            query = resp.context["next_query"]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual({j.company_id for j in Job.objects.filter(id__in=ids[:10])}, {self.a.id})  # title hits first
+        self.assertEqual(set(ids[10:]), {j.id for j in self.b_jobs})
+        self.assertEqual(resp.context["facets"]["total"], 13)
+        self.assertEqual(self.client.get(reverse("job_list_api"), {"q": "python"}).json()["count"], 13)
+
+
+class JobApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("cand", password="x")
+        company = Company.objects.create(name="Acme")
+        cls.job = Job.objects.create(company=company, title="Engineer", salary_min=40, pay_period="hour")
+
+    def test_signed_in_only_unless_public(self):
+        url = reverse("job_list_api")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(reverse("job_detail_api", args=[self.job.id])).status_code, 401)
+        with override_settings(JOBS_API_PUBLIC=True):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_salary_backfill_changes_etags(self):
+        self.client.force_login(self.user)
+        list_url, detail_url = reverse("job_list_api"), reverse("job_detail_api", args=[self.job.id])
+        etags = [self.client.get(u)["ETag"] for u in (list_url, detail_url)]
+        Job.objects.filter(pk=self.job.pk).update(salary_table_version="old")  # as if the rate table moved on
+        call_command("backfill_salaries", stdout=StringIO())
+        self.assertEqual(Job.objects.get(pk=self.job.pk).salary_table_version, SALARY_TABLE_VERSION)
+        for url, etag in zip((list_url, detail_url), etags):
+            with self.subTest(url=url):
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(resp.status_code, 200)
+
+
+class TopCandidatesTests(TestCase):
+    """top_candidates equals scoring every candidate and keeping the best k."""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(6)
+        vocab = ["Python", "Django", "Docker", "React", "Go", "Redis", "aws", "Excel", "Cobol"]
+        for i in range(60):
+            role = User.Role.HR if i % 15 == 0 else User.Role.USER  # only candidates are sourced
+            profile = User.objects.create_user(f"u{i}", role=role).profile
+            profile.skills = rng.sample(vocab, rng.randint(0, 4))
+            profile.projects = [{"title": "p", "technologies": rng.sample(vocab, 2)}] * rng.randint(0, 3)
+            profile.github_url = "https://github.com/u" if i % 3 else ""
+            intern_profile_skills(profile)
+            profile.save()
+        cls.job = Job(company=Company.objects.create(name="Acme"), title="Backend",
+                      req_quals=["Python", "Django", "Cobol"], tools=["Docker", "Redis"])
+        intern_job_skills(cls.job)
+        cls.job.save()
+
+    def _brute_force(self, k):
+        shared = set(self.job.req_skill_ids) | set(self.job.tool_skill_ids)
+        scored = [(score_profile_against_job(p, self.job)[0], -p.id)
+                  for p in UserProfile.objects.filter(user__role=User.Role.USER) if shared & set(p.skill_ids)]
+        return [(-neg_id, score) for score, neg_id in sorted(scored, reverse=True)[:k]]
+
+    def test_matches_brute_force(self):
+        for k, chunk_size in ((1, 2000), (5, 3), (20, 7), (100, 2000)):
+            with self.subTest(k=k, chunk_size=chunk_size):
+                got = top_candidates(self.job, k=k, chunk_size=chunk_size)
+                self.assertEqual([(p.id, score) for p, score, _ in got], self._brute_force(k))
+
+    def test_rebuilt_index_gives_the_same_answer(self):
+        before = [(p.id, score) for p, score, _ in top_candidates(self.job, k=10)]
+        ProfileSkill.objects.all().delete()
+        self.assertEqual(top_candidates(self.job, k=10), [])
+        call_command("rebuild_skill_index", "--batch-size", "7", stdout=StringIO())
+        self.assertEqual([(p.id, score) for p, score, _ in top_candidates(self.job, k=10)], before)
@@ -1,10 +1,14 @@
 from django.urls import path
-from .views import job_create, job_detail, employees_json, job_browse, job_public_detail
+from .views import job_create, job_detail, employees_json, job_browse, job_public_detail, job_candidates
+from .api import job_list_api, job_detail_api
 
 urlpatterns = [
     path("", job_browse, name="job_browse"),                     # /jobs/
     path("new/", job_create, name="job_create"),                 # HR
     path("<int:pk>/", job_detail, name="job_detail"),            # HR private detail
+    path("<int:pk>/candidates/", job_candidates, name="job_candidates"),  # HR sourcing (JSON)
     path("view/<int:pk>/", job_public_detail, name="job_public_detail"),  # user-facing detail
     path("employees-json/<int:company_id>/", employees_json, name="employees_json"),
+    path("api/", job_list_api, name="job_list_api"),                     # public JSON (conditional GET)
+    path("api/<int:pk>/", job_detail_api, name="job_detail_api"),
 ]
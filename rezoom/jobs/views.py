@@ -6,7 +6,8 @@ from .forms import JobForm
 from .models import Job, JobAssignee
 from companies.models import Company, Employee
 
-from django.db.models import Q
+from django.db.models import F
+from . import facets, search
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
@@ -14,6 +15,8 @@ from applications.models import Application
 from .models import Job
 from companies.models import Company
 from accounts.models import UserProfile
+from rezoom.pagination import keyset_page
+from .sourcing import top_candidates
 
 
 def hr_required(view):
@@ -37,6 +40,9 @@ def job_create(request):
                 for emp in qs:
                     JobAssignee.objects.get_or_create(job=job, employee=emp)
             messages.success(request, "Job posted.")
+            if form.unmatched_skills:
+                messages.info(request, "Not in the skill list, so not used for skill matching: "
+                                       + ", ".join(form.unmatched_skills))
             return redirect("job_detail", pk=job.pk)
     else:
         form = JobForm(user=request.user)
@@ -61,58 +67,92 @@ def job_detail(request, pk):
     assignees = job.assignees.select_related("employee__user")
     return render(request, "jobs/job_detail.html", {"job": job, "assignees": assignees})
 
+PAGE_SIZE = 50
+
 @login_required
 def job_browse(request):
-    qs = Job.objects.select_related("company").filter(status="open").order_by("-created_at")
+    qs = Job.objects.select_related("company").filter(status="open")
 
     # --- filters ---
     q = request.GET.get("q", "").strip()
-    mode = request.GET.get("mode", "").strip()          # onsite/remote/hybrid
-    company_id = request.GET.get("company", "").strip()
-    min_salary = request.GET.get("min", "").strip()
+    selected = facets.selected_filters(request.GET)     # mode / company / type / min
     use_profile = request.GET.get("profile", "") == "1"
+    sort = "salary" if request.GET.get("sort") == "salary" else ""
+    cursor = request.GET.get("cursor", "")
+
+    # counts before the facet filters themselves, over every match (not just the ranked cut)
+    facet = facets.facet_counts(search.matching(qs, q), q, selected)
+    qs = facets.apply_filters(qs, selected)
 
-    if q:
-        qs = qs.filter(
-            Q(title__icontains=q) |
-            Q(description_md__icontains=q) |
-            Q(responsibilities_md__icontains=q) |
-            Q(role_purpose__icontains=q)
-        )
-    if mode in {"onsite","remote","hybrid"}:
-        qs = qs.filter(location_mode=mode)
-    if company_id.isdigit():
-        qs = qs.filter(company_id=int(company_id))
-    if min_salary.isdigit():
-        qs = qs.filter(salary_min__gte=int(min_salary))
-
-    # simple "match" score using candidate skills vs job req_quals/tools
-    matches = {}
-    profile_skills = set()
+    profile = None
     if use_profile and request.user.is_authenticated:
         try:
-            profile_skills = set((request.user.profile.skills or []))
+            profile = request.user.profile
         except UserProfile.DoesNotExist:
-            profile_skills = set()
-    jobs = list(qs[:50])
-    if profile_skills:
-        for j in jobs:
-            req = set((j.req_quals or []) + (j.tools or []))
-            inter = len(req & profile_skills)
-            denom = max(1, len(req))
-            matches[j.id] = round(100 * inter / denom)
-
-        # sort by match score desc if using profile
-        jobs.sort(key=lambda j: matches.get(j.id, 0), reverse=True)
-
-    companies = Company.objects.all().order_by("name")
+            profile = None
+
+    page = None
+    if q and profile is None:
+        page = search.search(qs, q, cursor, PAGE_SIZE)  # relevance order; None without a full-text index
+    if q and page is None:
+        qs = search.matching(qs, q)  # sorted some other way: every text match competes
+
+    matched_total = None
+    if profile is not None:
+        # "match" = materialized JobMatch score; jobs sharing no skill with the profile drop out,
+        # so the page says how many did and links to the unranked list
+        qs = (qs.filter(matches__user=request.user)
+              .annotate(match=F("matches__score"), match_job=F("matches__job_id")))  # sorts on the JobMatch index
+        jobs, next_cursor = keyset_page(qs, ("-match", "-match_job"), cursor, PAGE_SIZE)
+        matched_total = qs.count() if cursor or next_cursor else len(jobs)
+    elif page is not None:
+        jobs, next_cursor = page
+    elif sort == "salary":
+        # annualized USD, so hourly/monthly/foreign-currency jobs rank correctly; unknown salaries drop out
+        qs = qs.filter(salary_min_annual_usd__isnull=False)
+        jobs, next_cursor = keyset_page(qs, ("-salary_min_annual_usd", "-id"), cursor, PAGE_SIZE)
+    else:
+        jobs, next_cursor = keyset_page(qs, ("-created_at", "-id"), cursor, PAGE_SIZE)
+
+    def query(**changes):
+        params = request.GET.copy()
+        params.pop("cursor", None)
+        for k, v in changes.items():
+            if v is None:
+                params.pop(k, None)
+            else:
+                params[k] = v
+        return params.urlencode()
+
+    salary_links = [(step, n, query(min=step), selected.get("min") == step) for step, n in facet["salary"]]
     return render(request, "jobs/browse.html", {
         "jobs": jobs,
-        "companies": companies,
-        "matches": matches,
-        "params": {"q": q, "mode": mode, "company": company_id, "min": min_salary, "profile": use_profile},
+        "facets": facet,
+        "salary_links": salary_links,
+        "matches": profile is not None,
+        "matched_total": matched_total,
+        "unranked_query": query(profile=None),
+        "next_query": query(cursor=next_cursor) if next_cursor else None,
+        "params": {"q": q, "mode": selected.get("mode", ""), "company": str(selected.get("company", "")),
+                   "type": selected.get("emp_type", ""), "min": selected.get("min", ""), "profile": use_profile, "sort": sort},
     })
 
+@login_required
+@hr_required
+def job_candidates(request, pk):
+    """HR sourcing: top-K candidate profiles for this job (including people who haven't applied)."""
+    job = get_object_or_404(Job, pk=pk, company__created_by=request.user)
+    k = request.GET.get("k", "")
+    k = min(int(k), 200) if k.isdigit() and int(k) > 0 else 20
+    data = [{
+        "user_id": prof.user.id,
+        "username": prof.user.username,
+        "name": prof.user.get_full_name(),
+        "score": score,
+        "summary": summary,
+    } for prof, score, summary in top_candidates(job, k=k)]
+    return JsonResponse({"job": job.id, "candidates": data})
+
 @login_required
 def job_public_detail(request, pk):
     job = get_object_or_404(Job.objects.select_related("company"), pk=pk, status="open")
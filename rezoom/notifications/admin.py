@@ -1,8 +1,26 @@
 from django.contrib import admin
-from .models import Notification
+from .models import ArchivedNotification, Notification, NotificationPreference, OutboundEmail
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ("user","title","is_read","created_at","email_sent","url")
     list_filter = ("is_read","email_sent")
     search_fields = ("user__username","title","message","url")
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("id","to_email","subject","status","attempts","send_after","sent_at")
+    list_filter = ("status",)
+    search_fields = ("to_email","subject","last_error")
+    readonly_fields = ("notification","created_at","sent_at","locked_by","locked_at")
+
+@admin.register(NotificationPreference)
+class NotificationPreferenceAdmin(admin.ModelAdmin):
+    list_display = ("user","email_frequency")
+    list_filter = ("email_frequency",)
+    search_fields = ("user__username","user__email")
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(admin.ModelAdmin):
+    list_display = ("user","title","created_at","archived_at")
+    search_fields = ("user__username","title","message")
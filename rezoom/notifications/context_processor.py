@@ -1,8 +1,5 @@
 def unread_notifications(request):
+    # the counter rides on the already-loaded user row: no query per page
     if not request.user.is_authenticated:
-        return {"unread_count": 0, "recent_notifications": []}
-    qs = request.user.notifications.filter(is_read=False)[:10]
-    return {
-        "unread_count": qs.count(),
-        "recent_notifications": qs,
-    }
+        return {"unread_count": 0}
+    return {"unread_count": request.user.unread_notifications}
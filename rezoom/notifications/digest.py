@@ -0,0 +1,41 @@
+"""
+Email coalescing. Outbox rows are not due the moment they are written: each gets a
+send_after from its recipient's NotificationPreference:
+
+  immediate  now + NOTIFY_COALESCE_SECONDS (bursts of events become one email)
+  hourly     the next top of the hour
+  daily      the next NOTIFY_DIGEST_HOUR o'clock, local time
+
+When any row for a recipient falls due, the outbox claims all of that recipient's
+pending rows, and `compose` merges them into a single message.
+"""
+from django.conf import settings
+from django.utils import timezone
+from .models import NotificationPreference
+
+Frequency = NotificationPreference.Frequency
+
+
+def email_frequencies(user_ids) -> dict:
+    """user id → frequency for users with a preference row (one query)."""
+    return dict(NotificationPreference.objects.filter(user_id__in=list(user_ids))
+                .values_list("user_id", "email_frequency"))
+
+
+def send_after(frequency, now=None):
+    now = now or timezone.now()
+    if frequency == Frequency.HOURLY:
+        return now.replace(minute=0, second=0, microsecond=0) + timezone.timedelta(hours=1)
+    if frequency == Frequency.DAILY:
+        local = timezone.localtime(now)
+        at = local.replace(hour=getattr(settings, "NOTIFY_DIGEST_HOUR", 8), minute=0, second=0, microsecond=0)
+        return at if at > local else at + timezone.timedelta(days=1)
+    return now + timezone.timedelta(seconds=getattr(settings, "NOTIFY_COALESCE_SECONDS", 120))
+
+
+def compose(emails):
+    """(subject, body) for one recipient's claimed rows, oldest first."""
+    if len(emails) == 1:
+        return emails[0].subject, emails[0].body
+    sections = [f"{e.subject}\n{'-' * len(e.subject)}\n{e.body}" for e in emails]
+    return f"{len(emails)} updates from Rezoom", "\n\n".join(sections)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from notifications.retention import archive_read
+
+class Command(BaseCommand):
+    help = "Move read notifications older than --days (default NOTIFY_RETENTION_DAYS) into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        total = 0
+        for n in archive_read(days=opts["days"], batch_size=opts["batch_size"]):
+            total += n
+            self.stdout.write(f"archived {total}")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} notifications."))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from notifications.utils import recount_unread
+
+class Command(BaseCommand):
+    help = "Recompute every user's unread-notification counter from the Notification table."
+
+    def handle(self, *args, **opts):
+        n = recount_unread()
+        self.stdout.write(self.style.SUCCESS(f"Recounted unread notifications for {n} users."))
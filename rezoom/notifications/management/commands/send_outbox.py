@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from notifications.outbox import drain
+
+class Command(BaseCommand):
+    help = ("Deliver due notification emails (merged into one digest per recipient) in batches "
+            "over one mail connection per batch. Run from cron, or with --loop.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Recipients per batch.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when empty.")
+        parser.add_argument("--sleep", type=float, default=5.0, help="Idle poll interval with --loop.")
+
+    def handle(self, *args, **opts):
+        sent, failed = drain(batch_size=opts["batch_size"], loop=opts["loop"],
+                             idle_sleep=opts["sleep"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Outbox drained: {sent} sent, {failed} failed."))
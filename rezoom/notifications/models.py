@@ -13,7 +13,94 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
-        indexes = [models.Index(fields=["user","is_read","created_at"])]
+        indexes = [
+            models.Index(fields=["user","is_read","created_at"]),
+            models.Index(fields=["user","-created_at","-id"]),  # history keyset
+        ]
 
     def __str__(self):
         return f"{self.user} · {self.title}"
+
+
+class ArchivedNotification(models.Model):
+    """
+    Read notification past retention, moved out of the hot table by
+    `archive_notifications`. Keeps the original id, so history pages run on across both.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="archived_notifications")
+    title = models.CharField(max_length=140)
+    message = models.TextField(blank=True)
+    url = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    is_read = True
+    archived = True
+
+    class Meta:
+        indexes = [models.Index(fields=["user","-created_at","-id"])]
+
+    def __str__(self):
+        return f"{self.user} · {self.title} (archived)"
+
+
+class OutboundEmail(models.Model):
+    """
+    Transactional outbox: `notify` writes the row in the caller's transaction, and
+    `send_outbox` delivers pending rows in batches over one mail connection.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT    = "sent", "Sent"
+        FAILED  = "failed", "Failed"   # gave up after max attempts
+
+    notification = models.ForeignKey(Notification, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name="emails")
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    send_after = models.DateTimeField(default=timezone.now)   # retry backoff pushes this forward
+    locked_by = models.CharField(max_length=64, blank=True)   # claim token of the sender holding it
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "send_after"]),
+            models.Index(fields=["to_email", "status"]),  # a recipient's pending rows, coalesced per batch
+            models.Index(fields=["locked_by"]),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} · {self.subject} [{self.status}]"
+
+
+class NotificationPreference(models.Model):
+    """How often a user wants notification email; users without a row get IMMEDIATE."""
+    class Frequency(models.TextChoices):
+        IMMEDIATE = "immediate", "Immediately (bursts merged)"
+        HOURLY    = "hourly", "Hourly digest"
+        DAILY     = "daily", "Daily digest"
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                related_name="notification_preference")
+    email_frequency = models.CharField(max_length=10, choices=Frequency.choices, default=Frequency.IMMEDIATE)
+
+    def __str__(self):
+        return f"{self.user} · {self.email_frequency}"
+
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .utils import adjust_unread
+
+@receiver(post_delete, sender=Notification)
+def drop_unread_count(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread(instance.user_id, -1)
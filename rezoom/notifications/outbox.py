@@ -0,0 +1,152 @@
+"""
+Email outbox delivery. `notify` only writes OutboundEmail rows; this module claims due
+recipients in batches and sends each batch over a single mail connection, one digest
+message per recipient (see digest.py), recording the outcome on every row. Failed
+messages are retried with exponential backoff.
+
+Delivery is at-least-once: a sender that dies between sending and marking a batch
+leaves it in "sending", and the rows are re-queued after OUTBOX_STALE_SECONDS.
+"""
+import logging
+import smtplib
+import time
+import uuid
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from .digest import compose
+from .models import Notification, OutboundEmail
+
+log = logging.getLogger(__name__)
+
+# errors that mean the connection itself is gone, not that this message was refused
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def claim(limit, token=None) -> list:
+    """
+    Atomically take the pending emails of up to `limit` recipients that have something
+    due (same conditional-UPDATE claim as tasks.queue). A recipient's not-yet-due rows
+    come along, so everything queued for them goes out as one digest, except rows
+    backing off after a failed send: they wait out their retry delay.
+    """
+    token = token or uuid.uuid4().hex
+    now = timezone.now()
+    stale = now - timezone.timedelta(seconds=getattr(settings, "OUTBOX_STALE_SECONDS", 600))
+    OutboundEmail.objects.filter(status=OutboundEmail.Status.SENDING, locked_at__lt=stale).update(
+        status=OutboundEmail.Status.PENDING, locked_by="", locked_at=None
+    )
+    recipients = list(
+        OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING, send_after__lte=now)
+        .order_by().values_list("to_email", flat=True).distinct()[:limit]
+    )
+    if not recipients:
+        return []
+    (OutboundEmail.objects.filter(to_email__in=recipients, status=OutboundEmail.Status.PENDING)
+     .exclude(attempts__gt=0, send_after__gt=now)
+     .update(status=OutboundEmail.Status.SENDING, locked_by=token, locked_at=now))
+    return list(OutboundEmail.objects.filter(locked_by=token, status=OutboundEmail.Status.SENDING).order_by("id"))
+
+
+def _mark_sent(emails):
+    now = timezone.now()
+    for e in emails:
+        e.status, e.sent_at, e.locked_by, e.locked_at, e.last_error = OutboundEmail.Status.SENT, now, "", None, ""
+    OutboundEmail.objects.bulk_update(emails, ["status", "sent_at", "locked_by", "locked_at", "last_error"])
+    Notification.objects.filter(id__in=[e.notification_id for e in emails if e.notification_id]).update(
+        email_sent=True
+    )
+
+
+def _fail(failures):
+    """Retry with exponential backoff; give up after OUTBOX_MAX_ATTEMPTS. `failures` is [(email, error)]."""
+    now = timezone.now()
+    max_attempts = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 6)
+    base = getattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 60)
+    emails = []
+    for e, error in failures:
+        e.attempts += 1
+        e.last_error = str(error)[:2000]
+        e.locked_by, e.locked_at = "", None
+        if e.attempts >= max_attempts:
+            e.status = OutboundEmail.Status.FAILED
+        else:
+            e.status = OutboundEmail.Status.PENDING
+            e.send_after = now + timezone.timedelta(seconds=base * 2 ** (e.attempts - 1))
+        emails.append(e)
+    OutboundEmail.objects.bulk_update(emails, ["attempts", "last_error", "locked_by", "locked_at", "status", "send_after"])
+
+
+def _release(emails):
+    """Back to pending without charging an attempt (never handed to the relay)."""
+    OutboundEmail.objects.filter(id__in=[e.id for e in emails]).update(
+        status=OutboundEmail.Status.PENDING, locked_by="", locked_at=None
+    )
+
+
+def send_batch(emails):
+    """
+    Send claimed `emails` over one connection, one (digest) message per recipient.
+    Returns (sent, failed) counts of outbox rows.
+    """
+    groups = {}
+    for e in emails:
+        groups.setdefault(e.to_email, []).append(e)
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        log.warning("outbox: cannot open mail connection: %s", e)
+        _fail([(m, e) for m in emails])
+        return 0, len(emails)
+    sent, failures = [], []
+    try:
+        pending = list(groups.items())
+        for i, (to_email, rows) in enumerate(pending):
+            subject, body = compose(rows)
+            msg = EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email], connection=connection)
+            try:
+                # one message per call on the open connection, so a refused
+                # recipient fails only its own rows instead of the rest of the batch
+                if connection.send_messages([msg]):
+                    sent += rows
+                else:
+                    failures += [(e, "not accepted by the mail backend") for e in rows]
+            except _CONNECTION_ERRORS as exc:
+                log.warning("outbox: connection lost after %d messages: %s", i, exc)
+                failures += [(e, exc) for e in rows]
+                _release([e for _, later in pending[i + 1:] for e in later])
+                break
+            except Exception as exc:
+                failures += [(e, exc) for e in rows]
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    if sent:
+        _mark_sent(sent)
+    if failures:
+        _fail(failures)
+    return len(sent), len(failures)
+
+
+def drain(batch_size=100, loop=False, idle_sleep=5.0, stdout=None):
+    """
+    Deliver due emails, `batch_size` recipients at a time, until none are left (or
+    forever with `loop`). Returns (sent, failed) row counts.
+    """
+    sent = failed = 0
+    while True:
+        emails = claim(batch_size)
+        if not emails:
+            if not loop:
+                break
+            time.sleep(idle_sleep)
+            continue
+        ok, bad = send_batch(emails)
+        sent += ok
+        failed += bad
+        if stdout:
+            stdout.write(f"batch: {len(emails)} emails, {ok} sent, {bad} failed")
+    return sent, failed
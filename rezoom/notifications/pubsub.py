@@ -0,0 +1,118 @@
+"""
+In-process pub/sub for pushing new notifications to connected browsers (see
+views.notification_stream). Each open stream is one asyncio.Queue: an idle
+connection costs a queue and a suspended coroutine, not a thread.
+
+The backend is chosen by NOTIFY_PUBSUB_BACKEND (dotted path):
+
+  DatabaseBroker  the default. One poller task per process reads new Notification
+                  rows for all of its connected users with a single query every
+                  NOTIFY_PUBSUB_POLL_SECONDS, so rows written by WSGI workers, the
+                  task worker and management commands reach the stream too;
+                  publish() is a no-op.
+  MemoryBroker    publish() hands messages straight to this process's subscribers.
+                  Only sees notifications created by the process serving the
+                  stream, so it is for tests and single-process setups.
+"""
+import asyncio
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from .models import Notification
+
+log = logging.getLogger(__name__)
+
+QUEUE_SIZE = 100  # per connection; also the page size of the Last-Event-ID replay
+
+
+def message(n) -> dict:
+    """Wire format for a Notification (model instance or .values() dict)."""
+    get = n.get if isinstance(n, dict) else lambda f: getattr(n, f)
+    return {"id": get("id"), "title": get("title"), "message": get("message"), "url": get("url"),
+            "read_url": reverse("notifications_read", args=[get("id")])}
+
+
+class MemoryBroker:
+    def __init__(self):
+        self._subscribers = {}  # user id → {(loop, queue)}
+
+    def subscribe(self, user_id) -> asyncio.Queue:
+        queue = asyncio.Queue(QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        subs = self._subscribers.get(user_id, set())
+        subs.discard(next((s for s in subs if s[1] is queue), None))
+        if not subs:
+            self._subscribers.pop(user_id, None)
+
+    def connected_users(self):
+        return list(self._subscribers)
+
+    def deliver(self, user_id, msg):
+        """Queue `msg` for every stream of `user_id` in this process; safe from any thread."""
+        for loop, queue in list(self._subscribers.get(user_id, ())):
+            loop.call_soon_threadsafe(_put, queue, msg)
+
+    def publish(self, user_id, msg):
+        self.deliver(user_id, msg)
+
+
+def _put(queue, msg):
+    try:
+        queue.put_nowait(msg)
+    except asyncio.QueueFull:
+        pass  # slow client; it catches up from Last-Event-ID on reconnect
+
+
+class DatabaseBroker(MemoryBroker):
+    def __init__(self):
+        super().__init__()
+        self._poller = None
+        self._last_id = None
+
+    def subscribe(self, user_id):
+        queue = super().subscribe(user_id)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+        return queue
+
+    def publish(self, user_id, msg):
+        pass  # the poller sees the committed row, in this process and every other
+
+    @sync_to_async
+    def _fetch(self, user_ids):
+        qs = Notification.objects.order_by("id")
+        # high-water mark first, then the window below it: rows inserted meanwhile wait for the next poll.
+        # It advances past everyone's rows, not only connected users', so each scan stays short.
+        top = qs.values_list("id", flat=True).last() or 0
+        if self._last_id is None or top <= self._last_id:
+            self._last_id = top if self._last_id is None else self._last_id
+            return []
+        rows = list(qs.filter(id__gt=self._last_id, id__lte=top, user_id__in=user_ids)
+                    .values("id", "user_id", "title", "message", "url"))
+        self._last_id = top
+        return rows
+
+    async def _poll(self):
+        interval = getattr(settings, "NOTIFY_PUBSUB_POLL_SECONDS", 2.0)
+        while self._subscribers:
+            try:
+                for row in await self._fetch(self.connected_users()):
+                    self.deliver(row["user_id"], message(row))
+            except Exception:
+                log.exception("notification poller failed; retrying")
+            await asyncio.sleep(interval)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, "NOTIFY_PUBSUB_BACKEND", "notifications.pubsub.DatabaseBroker"))()
+    return _broker
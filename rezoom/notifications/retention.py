@@ -0,0 +1,55 @@
+"""
+Notification retention. Read notifications older than NOTIFY_RETENTION_DAYS move from
+the hot table to ArchivedNotification in bounded batches (`archive_notifications`),
+so the per-user indexes stay small. History pages merge both tables on one
+(created_at, id) keyset and only touch the archive once a page reaches back that far.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rezoom.pagination import after, cursor_values, encode_cursor
+from .models import ArchivedNotification, Notification
+
+HISTORY_KEYS = ("-created_at", "-id")
+ARCHIVE_FIELDS = ("id", "user_id", "title", "message", "url", "created_at")
+
+
+def archive_read(days=None, batch_size=1000):
+    """Move read notifications older than `days`; yields the number moved per batch (one transaction each)."""
+    days = getattr(settings, "NOTIFY_RETENTION_DAYS", 90) if days is None else days
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(Notification.objects.filter(id__gt=last_id, is_read=True, created_at__lt=cutoff)
+                        .order_by("id").values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                return
+            last_id = rows[-1]["id"]
+            ArchivedNotification.objects.bulk_create([ArchivedNotification(**r) for r in rows],
+                                                     ignore_conflicts=True)  # safe to rerun a half-done batch
+            Notification.objects.filter(id__in=[r["id"] for r in rows], is_read=True).delete()
+        yield len(rows)
+
+
+def _page(qs, user, values, size):
+    qs = qs.filter(user=user).order_by(*HISTORY_KEYS)
+    if values is not None:
+        qs = qs.filter(after(HISTORY_KEYS, values))
+    return list(qs[:size + 1])
+
+
+def history_page(user, cursor=None, size=50):
+    """(rows, next_cursor) over the user's notifications, newest first, hot and archived."""
+    values = cursor_values(Notification.objects.all(), HISTORY_KEYS, cursor)  # archive keys have the same types
+    rows = _page(Notification.objects.all(), user, values, size)
+    newest_archived = (ArchivedNotification.objects.filter(user=user).order_by(*HISTORY_KEYS)
+                       .values_list("created_at", "id").first())
+    # the archive only matters once the page runs out of hot rows newer than everything archived
+    if newest_archived and (len(rows) <= size or (rows[-1].created_at, rows[-1].id) < newest_archived):
+        rows += _page(ArchivedNotification.objects.all(), user, values, size)
+        rows = sorted(rows, key=lambda n: (n.created_at, n.id), reverse=True)[:size + 1]
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor([rows[-1].created_at, rows[-1].id])
@@ -1,3 +1,95 @@
-from django.test import TestCase
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User
+from rezoom.testing import BAD_CURSORS
+from .models import ArchivedNotification, Notification, OutboundEmail
+from . import pubsub
+from .outbox import claim
+from .retention import history_page
 
-# Create your tests here.
+BASE = datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc)
+
+
+class HistoryPaginationTests(TestCase):
+    """History pages run across the hot table and the archive; bad cursors give page 1."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("cand", password="x")
+        other = User.objects.create_user("other", password="x")
+        rows = [Notification(user=cls.user if i % 5 else other, title=f"n{i}", is_read=i < 80,
+                             created_at=BASE + timedelta(minutes=i // 3))
+                for i in range(150)]
+        Notification.objects.bulk_create(rows)
+        # the oldest read rows move to the archive, ids preserved
+        old = list(Notification.objects.filter(is_read=True).order_by("id")[:60])
+        ArchivedNotification.objects.bulk_create(
+            [ArchivedNotification(id=n.id, user_id=n.user_id, title=n.title, created_at=n.created_at) for n in old])
+        Notification.objects.filter(id__in=[n.id for n in old]).delete()
+        cls.expected = sorted(
+            list(Notification.objects.filter(user=cls.user).values_list("created_at", "id"))
+            + list(ArchivedNotification.objects.filter(user=cls.user).values_list("created_at", "id")),
+            reverse=True)
+
+    def test_walks_hot_and_archive(self):
+        for size in (1, 7, 50, 500):
+            with self.subTest(size=size):
+                seen, cursor = [], None
+                while True:
+                    rows, cursor = history_page(self.user, cursor, size)
+                    seen += [(n.created_at, n.id) for n in rows]
+                    if cursor is None:
+                        break
+                self.assertEqual(seen, self.expected)
+
+    def test_bad_cursor_gives_first_page(self):
+        self.client.force_login(self.user)
+        first = [n.id for n in self.client.get(reverse("notifications_list")).context["items"]]
+        for cursor in BAD_CURSORS:
+            with self.subTest(cursor=cursor):
+                resp = self.client.get(reverse("notifications_list"), {"cursor": cursor})
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual([n.id for n in resp.context["items"]], first)
+
+
+class OutboxClaimTests(TestCase):
+    def test_coalesced_claim_leaves_rows_in_retry_backoff(self):
+        now = timezone.now()
+        later = now + timedelta(minutes=30)
+        new = OutboundEmail.objects.create(to_email="a@example.com", subject="new", body="", send_after=now)
+        queued = OutboundEmail.objects.create(to_email="a@example.com", subject="digest", body="", send_after=later)
+        OutboundEmail.objects.create(to_email="a@example.com", subject="failing", body="", send_after=later,
+                                     attempts=2, last_error="refused")
+        self.assertEqual({e.id for e in claim(10)}, {new.id, queued.id})
+
+    def test_retry_goes_out_once_due(self):
+        failing = OutboundEmail.objects.create(to_email="a@example.com", subject="failing", body="",
+                                               send_after=timezone.now(), attempts=2)
+        self.assertEqual([e.id for e in claim(10)], [failing.id])
+
+
+class StreamReplayTests(TestCase):
+    @override_settings(NOTIFY_SSE_HEARTBEAT_SECONDS=0.1)
+    async def test_reconnect_replays_the_whole_gap(self):
+        user = await User.objects.acreate_user("cand", password="x")
+        await Notification.objects.abulk_create(
+            [Notification(user=user, title=f"n{i}") for i in range(pubsub.QUEUE_SIZE * 2 + 5)])
+        ids = [i async for i in Notification.objects.order_by("id").values_list("id", flat=True)]
+        await self.async_client.aforce_login(user)
+        with mock.patch.object(pubsub, "_broker", pubsub.MemoryBroker()):
+            resp = await self.async_client.get(reverse("notifications_stream"), headers={"Last-Event-ID": str(ids[0])})
+            replayed = []
+            async for chunk in resp.streaming_content:
+                if chunk.startswith(b": keepalive"):
+                    break  # replay done, now waiting for live messages
+                if b"event: notification" in chunk:
+                    replayed.append(json.loads(chunk.decode().split("data: ")[1])["id"])
+        self.assertEqual(replayed, ids[1:])
+
+    def test_default_broker_sees_other_processes(self):
+        with mock.patch.object(pubsub, "_broker", None):
+            self.assertIsInstance(pubsub.get_broker(), pubsub.DatabaseBroker)
@@ -1,9 +1,13 @@
 # notifications/urls.py
 from django.urls import path
-from .views import list_notifications, mark_read, mark_all_read
+from .views import (list_notifications, recent_notifications, notification_stream, mark_read, mark_all_read,
+                    email_preferences)
 
 urlpatterns = [
     path("", list_notifications, name="notifications_list"),
+    path("recent/", recent_notifications, name="notifications_recent"),
+    path("stream/", notification_stream, name="notifications_stream"),
     path("read/<int:pk>/", mark_read, name="notifications_read"),
     path("read-all/", mark_all_read, name="notifications_read_all"),
+    path("preferences/", email_preferences, name="notifications_preferences"),
 ]
@@ -1,18 +1,117 @@
-from django.core.mail import send_mail
-from django.urls import reverse
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
-from .models import Notification
+from django.contrib.auth import get_user_model
+from .models import Notification, OutboundEmail
+from .digest import email_frequencies, send_after
+from . import pubsub
+
+def adjust_unread(user_id, delta):
+    """Move a user's denormalized unread counter by `delta` in one UPDATE (never below zero)."""
+    if delta:
+        get_user_model().objects.filter(pk=user_id).update(
+            unread_notifications=Greatest(F("unread_notifications") + delta, 0)
+        )
+
+def recount_unread(user_ids=None):
+    """Recompute counters from the Notification table (repair after bulk edits)."""
+    unread = (Notification.objects.filter(user=OuterRef("pk"), is_read=False)
+              .order_by().values("user").annotate(n=Count("id")).values("n"))
+    users = get_user_model().objects.all()
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    return users.update(unread_notifications=Coalesce(Subquery(unread), Value(0)))
+
+def mark_read(user, pk):
+    """Mark one notification read; the counter only moves if it was actually unread."""
+    with transaction.atomic():
+        changed = Notification.objects.filter(pk=pk, user=user, is_read=False).update(is_read=True)
+        adjust_unread(user.pk, -changed)
+    return changed
+
+def mark_all_read(user):
+    with transaction.atomic():
+        changed = Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+        adjust_unread(user.pk, -changed)
+    return changed
+
+def _publish(rows):
+    """Push new rows to connected notification streams once the transaction commits."""
+    def send():
+        broker = pubsub.get_broker()
+        for n in rows:
+            broker.publish(n.user_id, pubsub.message(n))
+    transaction.on_commit(send)
+
+def email_body(message, title, url=None):
+    body = message or title
+    if url:
+        body += f"\n\nOpen: {url}"
+    return body
 
 def notify(user, title, message="", url=None, send_email=True, email_subject=None):
-    n = Notification.objects.create(
-        user=user, title=title, message=message or "", url=url or ""
-    )
-    if send_email and getattr(settings, "EMAIL_BACKEND", ""):
-        subj = email_subject or title
-        body = message or title
-        if url:
-            body += f"\n\nOpen: {url}"
-        send_mail(subj, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=True)
-        n.email_sent = True
-        n.save(update_fields=["email_sent"])
+    """
+    Create an in-app notification and, with send_email, queue its email in the same
+    transaction. Delivery happens in `send_outbox`, never inside the request, and is
+    delayed per the user's NotificationPreference so bursts merge into one digest.
+    """
+    with transaction.atomic():
+        n = Notification.objects.create(
+            user=user, title=title, message=message or "", url=url or ""
+        )
+        adjust_unread(user.pk, 1)
+        if send_email and user.email and getattr(settings, "EMAIL_BACKEND", ""):
+            OutboundEmail.objects.create(
+                notification=n, to_email=user.email, subject=email_subject or title,
+                body=email_body(message, title, url),
+                send_after=send_after(email_frequencies([user.pk]).get(user.pk)),
+            )
+        _publish([n])
     return n
+
+def notify_many(recipients, title, message="", url=None, send_email=True, email_subject=None, batch_size=1000):
+    """
+    notify() for many users with the same content: Notification rows, their outbox
+    emails and the unread counters are written with one statement each per chunk
+    instead of per recipient. Duplicate recipients are notified once.
+    """
+    users = {u.pk: u for u in recipients}.values()
+    return notify_bulk([(u, title, message, url) for u in users], send_email=send_email,
+                       email_subject=email_subject, batch_size=batch_size)
+
+def notify_bulk(entries, send_email=True, email_subject=None, batch_size=1000):
+    """
+    Batched notify() for per-recipient content: `entries` are (user, title, message, url).
+    A user may appear more than once (e.g. an interviewer on several interviews).
+    """
+    entries = list(entries)
+    queue_email = send_email and getattr(settings, "EMAIL_BACKEND", "")
+    created = []
+    with transaction.atomic():
+        for i in range(0, len(entries), batch_size):
+            chunk = entries[i:i + batch_size]
+            # bulk_create sets pks on PostgreSQL/SQLite, which the outbox rows need
+            rows = Notification.objects.bulk_create(
+                [Notification(user=u, title=title, message=message or "", url=url or "")
+                 for u, title, message, url in chunk]
+            )
+            per_user = Counter(u.pk for u, *_ in chunk)
+            by_count = {}
+            for pk, k in per_user.items():
+                by_count.setdefault(k, []).append(pk)
+            for k, pks in by_count.items():  # usually a single UPDATE (everyone +1)
+                get_user_model().objects.filter(pk__in=pks).update(
+                    unread_notifications=F("unread_notifications") + k
+                )
+            if queue_email:
+                freq = email_frequencies(per_user)
+                OutboundEmail.objects.bulk_create(
+                    [OutboundEmail(notification=n, to_email=u.email, subject=email_subject or title,
+                                   body=email_body(message, title, url), send_after=send_after(freq.get(u.pk)))
+                     for n, (u, title, message, url) in zip(rows, chunk) if u.email]
+                )
+            created += rows
+        _publish(created)
+    return created
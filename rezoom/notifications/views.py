@@ -1,18 +1,109 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
 from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
-from .models import Notification
+from django.views.decorators.http import require_GET, require_POST
+from .models import Notification, NotificationPreference
+from . import pubsub, utils
+from .retention import history_page
+
+PAGE_SIZE = 50
+RECENT_LIMIT = 10
 
 @login_required
 def list_notifications(request):
-    items = request.user.notifications.all()[:200]
-    return render(request, "notifications/list.html", {"items": items})
+    items, next_cursor = history_page(request.user, request.GET.get("cursor", ""), PAGE_SIZE)
+    pref = NotificationPreference.objects.filter(user=request.user).first()
+    return render(request, "notifications/list.html", {
+        "items": items,
+        "next_cursor": next_cursor,
+        "email_frequency": pref.email_frequency if pref else NotificationPreference.Frequency.IMMEDIATE,
+        "frequency_choices": NotificationPreference.Frequency.choices,
+    })
+
+@login_required
+@require_POST
+def email_preferences(request):
+    freq = request.POST.get("email_frequency", "")
+    if freq not in NotificationPreference.Frequency.values:
+        messages.error(request, "Pick a valid email frequency.")
+    else:
+        NotificationPreference.objects.update_or_create(user=request.user, defaults={"email_frequency": freq})
+        messages.success(request, "Email preferences saved.")
+    return redirect("notifications_list")
+
+@login_required
+@require_GET
+def recent_notifications(request):
+    """Unread dropdown contents, fetched only when the bell menu is opened."""
+    items = list(request.user.notifications.filter(is_read=False)
+                 .values("id", "title", "message", "created_at")[:RECENT_LIMIT])
+    for n in items:
+        n["read_url"] = reverse("notifications_read", args=[n["id"]])
+    return JsonResponse({"unread_count": request.user.unread_notifications, "items": items})
+
+def _sse(event, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _stream(user, last_event_id):
+    broker = pubsub.get_broker()
+    queue = broker.subscribe(user.pk)  # before the catch-up query, so nothing falls in between
+    heartbeat = getattr(settings, "NOTIFY_SSE_HEARTBEAT_SECONDS", 25)
+    sent = 0
+    try:
+        yield "retry: 5000\n\n" + _sse("unread", {"count": user.unread_notifications})
+        if last_event_id.isdigit():  # reconnect: replay everything the client missed, a page at a time
+            sent = int(last_event_id)
+            while True:
+                missed = await sync_to_async(list)(
+                    user.notifications.filter(id__gt=sent).order_by("id")
+                    .values("id", "title", "message", "url")[:pubsub.QUEUE_SIZE]
+                )
+                for row in missed:
+                    sent = row["id"]
+                    yield _sse("notification", pubsub.message(row), sent)
+                if len(missed) < pubsub.QUEUE_SIZE:
+                    break
+        while True:
+            try:
+                msg = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"  # keeps proxies from closing an idle stream
+                continue
+            if msg["id"] > sent:
+                sent = msg["id"]
+                yield _sse("notification", msg, sent)
+    finally:
+        broker.unsubscribe(user.pk, queue)
+
+async def notification_stream(request):
+    """
+    Server-Sent Events: pushes the user's new notifications as they are created. Needs
+    an ASGI server; under WSGI it answers 204, which tells EventSource not to retry.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await sync_to_async(get_user)(request)  # social_core backends have no aget_user()
+    if not user.is_authenticated:
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(_stream(user, request.headers.get("Last-Event-ID", "")),
+                                     content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+    return response
 
 @login_required
 def mark_read(request, pk):
-    n = get_object_or_404(Notification, pk=pk, user=request.user)
-    n.is_read = True
-    n.save(update_fields=["is_read"])
+    n = get_object_or_404(Notification.objects.only("id", "url"), pk=pk, user=request.user)
+    utils.mark_read(request.user, n.pk)
     if n.url:
         return redirect(n.url)
     messages.info(request, "Notification marked as read.")
@@ -20,6 +111,6 @@ def mark_read(request, pk):
 
 @login_required
 def mark_all_read(request):
-    request.user.notifications.filter(is_read=False).update(is_read=True)
+    utils.mark_all_read(request.user)
     messages.success(request, "All notifications marked as read.")
     return redirect("notifications_list")
@@ -0,0 +1,100 @@
+"""
+Keyset (cursor) pagination. The next page is fetched with
+WHERE (k1, k2, ...) after (last row's k1, k2, ...) instead of OFFSET, so page N
+costs one index range scan, the same as page 1. Cursors are opaque url-safe tokens.
+"""
+import base64
+import binascii
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+def _default(o):
+    # full isoformat: DjangoJSONEncoder drops microseconds, which breaks key equality
+    return o.isoformat() if hasattr(o, "isoformat") else str(o)
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps(list(values), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """The key values in `token`, or None for a missing/garbled cursor (→ first page)."""
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)),
+                            parse_constant=_reject)  # no NaN/Infinity
+    except (ValueError, binascii.Error):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _reject(name):
+    raise ValueError(name)
+
+
+def _output_field(qs, name):
+    if name in qs.query.annotations:
+        return qs.query.annotations[name].output_field
+    try:
+        return qs.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def cursor_values(qs, keys, cursor):
+    """
+    decode_cursor(), checked against the key fields of `qs` and converted to their
+    Python types. A cursor holding the wrong number or kind of values (None, lists,
+    strings that aren't dates, out-of-range ints...) is treated as no cursor.
+    """
+    values = decode_cursor(cursor)
+    if values is None or len(values) != len(keys):
+        return None
+    out = []
+    for key, v in zip(keys, values):
+        field = _output_field(qs, key.lstrip("-"))
+        if field is None or v is None or isinstance(v, (bool, list, dict)):
+            return None
+        try:
+            out.append(field.clean(v, None))  # to_python + the field's validators (integer range, ...)
+        except (ValidationError, TypeError, ValueError, OverflowError):
+            return None
+    return out
+
+
+def after(keys, values) -> Q:
+    """Rows strictly after `values` in the order given by `keys`, e.g. ("-created_at", "-id")."""
+    cond = Q()
+    for i, key in enumerate(keys):
+        clause = Q(**{f"{key.lstrip('-')}__{'lt' if key.startswith('-') else 'gt'}": values[i]})
+        for prev, v in zip(keys[:i], values):
+            clause &= Q(**{prev.lstrip("-"): v})
+        cond |= clause
+    # redundant bound on the leading key: lets the planner seek instead of scanning to the cursor
+    first = keys[0]
+    return Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]}) & cond
+
+
+def _key(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def keyset_page(qs, keys, cursor=None, size=50):
+    """
+    (rows, next_cursor) for the page after `cursor`. `keys` must end in a unique
+    field (usually the pk) so the order is total. next_cursor is None on the last page;
+    an unusable cursor gives the first page.
+    """
+    values = cursor_values(qs, keys, cursor)
+    qs = qs.order_by(*keys)
+    if values is not None:
+        qs = qs.filter(after(keys, values))
+    rows = list(qs[:size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor(_key(rows[-1], k.lstrip("-")) for k in keys)
@@ -52,6 +52,8 @@ INSTALLED_APPS = [
     'interviews',
     'social_django',
     'notifications',
+    'skills',
+    'tasks',
 
 ]
 
@@ -69,6 +71,10 @@ LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "portal"
 LOGOUT_REDIRECT_URL = "login"
 
+# /jobs/api/ follows the site: signed-in users only, like the HTML job pages.
+# Set True to serve the (open jobs only) listing to anonymous clients too.
+JOBS_API_PUBLIC = False
+
 # read from .env (create it next)
 SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = os.getenv("GOOGLE_CLIENT_ID", "")
 SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -95,6 +101,7 @@ TEMPLATES = [{
         "django.template.context_processors.request",
         "django.contrib.auth.context_processors.auth",
         "django.contrib.messages.context_processors.messages",
+        "notifications.context_processor.unread_notifications",
         # social-auth context
         "social_django.context_processors.backends",
         "social_django.context_processors.login_redirect",
@@ -113,6 +120,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # background workers write concurrently; take the write lock up front and wait for it
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+        # a file, not shared-cache memory, so concurrent test threads wait for the lock instead of failing
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -0,0 +1,12 @@
+"""
+Helpers shared by the apps' tests.
+"""
+import base64
+from .pagination import encode_cursor
+
+# cursors that decode cleanly but hold unusable values, plus undecodable ones
+BAD_CURSORS = [encode_cursor(v) for v in (
+    ["x", "y"], [{"a": 1}, 2], [None, None], [[1], 2], [True, 1], [1], [1, 2, 3],
+    ["2026-01-01T00:00:00+00:00", 10 ** 40], [10 ** 40, 10 ** 40], [-1, "1"],
+)] + [encode_cursor([]), "not-base64!", base64.urlsafe_b64encode(b"[NaN, 1]").decode(),
+      base64.urlsafe_b64encode(b'{"a": 1}').decode(), base64.urlsafe_b64encode(b"[1e999, 1]").decode()]
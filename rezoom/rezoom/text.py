@@ -0,0 +1,22 @@
+"""
+Tokenizer shared by resume extraction (accounts) and the TF-IDF text signal
+(applications), so both count the same terms.
+"""
+import re
+from collections import Counter
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#]+")
+_STOPWORDS = frozenset("""
+    a about above after all also an and any are as at be been being both but by can could did do does
+    doing during each for from further had has have having he her here hers him his how i if in into is
+    it its itself just me more most my no nor not of off on once only or other our ours out over own
+    same she should so some such than that the their theirs them then there these they this those
+    through to too under until up very was we were what when where which while who whom why will with
+    would you your yours within across using use used etc per via well new work working team teams
+""".split())
+
+def tokenize(text) -> list:
+    return [t for t in _TOKEN.findall(str(text or "").lower()) if t not in _STOPWORDS]
+
+def term_counts(text) -> Counter:
+    return Counter(tokenize(text))
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import Skill, SkillAlias
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ("name","created_at")
+    search_fields = ("name","aliases__alias")
+    inlines = [SkillAliasInline]
+
+@admin.register(SkillAlias)
+class SkillAliasAdmin(admin.ModelAdmin):
+    list_display = ("alias","skill")
+    search_fields = ("alias","skill__name")
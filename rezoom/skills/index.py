@@ -0,0 +1,53 @@
+from .models import JobSkill, ProfileSkill
+
+def sync_profile_skills(profile):
+    """Diff profile.skill_ids against its index rows; only changed skills are written."""
+    want = set(profile.skill_ids or [])
+    have = set(ProfileSkill.objects.filter(profile_id=profile.pk).values_list("skill_id", flat=True))
+    if have - want:
+        ProfileSkill.objects.filter(profile_id=profile.pk, skill_id__in=have - want).delete()
+    if want - have:
+        ProfileSkill.objects.bulk_create(
+            [ProfileSkill(profile_id=profile.pk, skill_id=s) for s in want - have], ignore_conflicts=True
+        )
+
+def sync_many_profile_skills(profiles):
+    """
+    Rewrite the index rows of a batch of profiles from their skill_ids: one DELETE and
+    one INSERT. For code that bulk_updates skill_ids, which skips the post_save sync.
+    """
+    ids = [p.pk for p in profiles]
+    ProfileSkill.objects.filter(profile_id__in=ids).delete()
+    ProfileSkill.objects.bulk_create(
+        [ProfileSkill(profile_id=p.pk, skill_id=s) for p in profiles for s in set(p.skill_ids or [])],
+        ignore_conflicts=True,
+    )
+
+def job_skill_ids(job) -> set:
+    return set(job.req_skill_ids or []) | set(job.tool_skill_ids or [])
+
+def sync_job_skills(job):
+    """Diff the job's req/tool skill ids against its index rows."""
+    want = job_skill_ids(job)
+    have = set(JobSkill.objects.filter(job_id=job.pk).values_list("skill_id", flat=True))
+    if have - want:
+        JobSkill.objects.filter(job_id=job.pk, skill_id__in=have - want).delete()
+    if want - have:
+        JobSkill.objects.bulk_create([JobSkill(job_id=job.pk, skill_id=s) for s in want - have],
+                                     ignore_conflicts=True)
+
+def sync_many_job_skills(jobs):
+    """sync_many_profile_skills for jobs."""
+    JobSkill.objects.filter(job_id__in=[j.pk for j in jobs]).delete()
+    JobSkill.objects.bulk_create([JobSkill(job_id=j.pk, skill_id=s) for j in jobs for s in job_skill_ids(j)],
+                                 ignore_conflicts=True)
+
+def profile_ids_with_skills(skill_ids):
+    """Queryset of profile ids sharing at least one of `skill_ids`."""
+    return (ProfileSkill.objects.filter(skill_id__in=list(skill_ids))
+            .values_list("profile_id", flat=True).distinct())
+
+def job_ids_with_skills(skill_ids):
+    """Queryset of job ids sharing at least one of `skill_ids`."""
+    return (JobSkill.objects.filter(skill_id__in=list(skill_ids))
+            .values_list("job_id", flat=True).distinct())
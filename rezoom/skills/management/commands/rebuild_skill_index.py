@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import UserProfile
+from jobs.models import Job
+from skills.models import JobSkill, ProfileSkill
+
+class Command(BaseCommand):
+    help = "Rebuild the skill → profile and skill → job inverted indexes from the interned skill ids."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        size = max(1, opts["batch_size"])
+        profiles = UserProfile.objects.values_list("id", "skill_ids").iterator(chunk_size=size)
+        jobs = Job.objects.values_list("id", "req_skill_ids", "tool_skill_ids").iterator(chunk_size=size)
+        n_prof = self._rebuild(ProfileSkill, "profile_id", profiles, size)
+        n_job = self._rebuild(JobSkill, "job_id", ((i, (r or []) + (t or [])) for i, r, t in jobs), size)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {n_prof} profile skills and {n_job} job skills."))
+
+    def _rebuild(self, model, owner, owners, size):
+        rows, total = [], 0
+        with transaction.atomic():
+            model.objects.all().delete()
+            for pk, skill_ids in owners:
+                rows.extend(model(**{owner: pk}, skill_id=s) for s in set(skill_ids or []))
+                if len(rows) >= size:
+                    model.objects.bulk_create(rows, ignore_conflicts=True)
+                    total += len(rows)
+                    rows = []
+            if rows:
+                model.objects.bulk_create(rows, ignore_conflicts=True)
+                total += len(rows)
+        return total
@@ -0,0 +1,59 @@
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import UserProfile
+from jobs.models import Job
+from skills.index import sync_many_job_skills, sync_many_profile_skills
+from skills.utils import intern_profile_skills, intern_job_skills
+
+class Command(BaseCommand):
+    help = ("Backfill interned Skill ids on every UserProfile and Job (run after editing aliases). "
+            "Lists the most common phrases the vocabulary doesn't know.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--show-unmatched", type=int, default=20, help="How many unmatched phrases to list.")
+
+    def handle(self, *args, **opts):
+        size = max(1, opts["batch_size"])
+        unmatched = Counter()
+
+        batch, n_prof = [], 0
+        for prof in UserProfile.objects.only("id", "skills", "projects", "skill_ids").iterator(chunk_size=size):
+            unmatched.update(intern_profile_skills(prof))
+            batch.append(prof)
+            if len(batch) >= size:
+                self._save_profiles(batch)
+                n_prof += len(batch)
+                batch = []
+        if batch:
+            self._save_profiles(batch)
+            n_prof += len(batch)
+
+        batch, n_job = [], 0
+        for job in Job.objects.only("id", "req_quals", "tools", "req_skill_ids", "tool_skill_ids").iterator(chunk_size=size):
+            unmatched.update(intern_job_skills(job))
+            batch.append(job)
+            if len(batch) >= size:
+                self._save_jobs(batch)
+                n_job += len(batch)
+                batch = []
+        if batch:
+            self._save_jobs(batch)
+            n_job += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Resolved skills for {n_prof} profiles and {n_job} jobs."))
+        if unmatched and opts["show_unmatched"]:
+            self.stdout.write(f"{len(unmatched)} phrases not in the vocabulary; most common:")
+            for phrase, n in unmatched.most_common(opts["show_unmatched"]):
+                self.stdout.write(f"  {n:6d}  {phrase}")
+
+    def _save_profiles(self, batch):
+        with transaction.atomic():
+            UserProfile.objects.bulk_update(batch, ["skill_ids", "projects"])
+            sync_many_profile_skills(batch)  # bulk_update skips the post_save index sync
+
+    def _save_jobs(self, batch):
+        with transaction.atomic():
+            Job.objects.bulk_update(batch, ["req_skill_ids", "tool_skill_ids"])
+            sync_many_job_skills(batch)
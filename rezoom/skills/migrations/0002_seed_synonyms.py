@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# canonical name → normalized aliases (the canonical name's own normalized form is added automatically)
+SYNONYMS = {
+    "PostgreSQL": ["postgres", "postgresql", "psql", "pg"],
+    "JavaScript": ["js", "javascript", "ecmascript", "es6"],
+    "TypeScript": ["ts", "typescript"],
+    "Python": ["python", "python3", "py"],
+    "Django": ["django", "django rest framework", "drf"],
+    "React": ["react", "reactjs", "react.js"],
+    "Node.js": ["node", "nodejs", "node.js"],
+    "Vue.js": ["vue", "vuejs", "vue.js"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Docker": ["docker"],
+    "Amazon Web Services": ["aws", "amazon web services"],
+    "Google Cloud Platform": ["gcp", "google cloud", "google cloud platform"],
+    "Microsoft Azure": ["azure", "microsoft azure"],
+    "Go": ["go", "golang"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongo", "mongodb"],
+    "Redis": ["redis"],
+    "GraphQL": ["graphql", "gql"],
+    "Machine Learning": ["ml", "machine learning"],
+    "CI/CD": ["ci/cd", "ci", "cicd", "continuous integration"],
+    "Git": ["git"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+}
+
+
+def seed(apps, schema_editor):
+    Skill = apps.get_model("skills", "Skill")
+    SkillAlias = apps.get_model("skills", "SkillAlias")
+    for name, aliases in SYNONYMS.items():
+        skill, _ = Skill.objects.get_or_create(name=name)
+        for alias in {name.lower(), *aliases}:
+            SkillAlias.objects.get_or_create(alias=alias, defaults={"skill": skill})
+
+
+def unseed(apps, schema_editor):
+    apps.get_model("skills", "Skill").objects.filter(name__in=SYNONYMS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, unseed),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_resumetext_userprofile_resume_text'),
+        ('skills', '0002_seed_synonyms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='accounts.userprofile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['profile'], name='skills_prof_profile_b16d55_idx')],
+                'unique_together': {('skill', 'profile')},
+            },
+        ),
+    ]
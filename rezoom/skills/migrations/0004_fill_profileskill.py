@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def fill(apps, schema_editor):
+    """Index the skill_ids profiles already had when ProfileSkill was introduced."""
+    UserProfile = apps.get_model("accounts", "UserProfile")
+    ProfileSkill = apps.get_model("skills", "ProfileSkill")
+    Skill = apps.get_model("skills", "Skill")
+    known = set(Skill.objects.values_list("id", flat=True))
+    rows = []
+    for pid, skill_ids in UserProfile.objects.values_list("id", "skill_ids").iterator(chunk_size=2000):
+        rows.extend(ProfileSkill(profile_id=pid, skill_id=s) for s in set(skill_ids or []) if s in known)
+        if len(rows) >= 2000:
+            ProfileSkill.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    ProfileSkill.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_profileskill'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
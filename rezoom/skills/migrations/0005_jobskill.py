@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    JobSkill = apps.get_model("skills", "JobSkill")
+    known = set(apps.get_model("skills", "Skill").objects.values_list("id", flat=True))
+    rows = []
+    for job_id, req, tools in Job.objects.values_list("id", "req_skill_ids", "tool_skill_ids").iterator(chunk_size=2000):
+        rows.extend(JobSkill(job_id=job_id, skill_id=s) for s in set(req or []) | set(tools or []) if s in known)
+        if len(rows) >= 2000:
+            JobSkill.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    JobSkill.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_job_interview_panel_size'),
+        ('skills', '0004_fill_profileskill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.job')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job'], name='skills_jobs_job_id_f23285_idx')],
+                'unique_together': {('skill', 'job')},
+            },
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+from django.utils import timezone
+
+class Skill(models.Model):
+    """
+    Canonical skill. Profiles and jobs store Skill ids (interned once at save time)
+    so matching works on small int sets instead of free text.
+    """
+    name = models.CharField(max_length=100, unique=True)   # display name, e.g. "PostgreSQL"
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Normalized spelling → Skill (synonym map). "postgres", "postgresql", "psql" → PostgreSQL."""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+    alias = models.CharField(max_length=100, unique=True)  # always stored normalized (see skills.utils.normalize)
+
+    def __str__(self):
+        return f"{self.alias} → {self.skill.name}"
+
+
+class ProfileSkill(models.Model):
+    """
+    Inverted index: skill → candidate profiles that list it (from UserProfile.skill_ids).
+    Kept in sync on profile save; lets sourcing touch only profiles sharing a job skill.
+    """
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="+")
+    profile = models.ForeignKey("accounts.UserProfile", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        unique_together = ("skill", "profile")        # also serves skill → profiles lookups
+        indexes = [models.Index(fields=["profile"])]
+
+    def __str__(self):
+        return f"skill {self.skill_id} ← profile {self.profile_id}"
+
+
+class JobSkill(models.Model):
+    """
+    Inverted index: skill → jobs that list it (Job.req_skill_ids + tool_skill_ids).
+    Kept in sync on job save; lets a profile change touch only jobs sharing one of its skills.
+    """
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="+")
+    job = models.ForeignKey("jobs.Job", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        unique_together = ("skill", "job")
+        indexes = [models.Index(fields=["job"])]
+
+    def __str__(self):
+        return f"skill {self.skill_id} ← job {self.job_id}"
+
+
+# keep the indexes current whenever a profile or job is saved
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from accounts.models import UserProfile
+
+@receiver(post_save, sender=UserProfile)
+def index_profile_skills(sender, instance, **kwargs):
+    from .index import sync_profile_skills
+    sync_profile_skills(instance)
+
+@receiver(post_save, sender="jobs.Job")
+def index_job_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & {"req_skill_ids", "tool_skill_ids"}:
+        return
+    from .index import sync_job_skills
+    sync_job_skills(instance)
@@ -0,0 +1,73 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from accounts.models import User, UserProfile
+from applications.ats import score_profile_against_job
+from companies.models import Company
+from jobs.models import Job
+from .models import JobSkill, ProfileSkill, Skill
+from .utils import intern_job_skills, intern_profile_skills, normalize, resolve_skill_ids, unmatched_terms
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_normalize(self):
+        for raw, want in [("  PostgreSQL  14 ", "postgresql"), ("Python 3.12", "python"), ("vue v3", "vue"),
+                          ("Amazon   Web\tServices", "amazon web services"), ("C++", "c++"), ("3", "3"),
+                          (None, ""), ("", "")]:
+            with self.subTest(raw=raw):
+                self.assertEqual(normalize(raw), want)
+
+
+class ResolveTests(TestCase):
+    """Synonyms from the seeded vocabulary resolve to one Skill; unknown phrases are reported, not created."""
+
+    def test_synonyms_share_a_skill(self):
+        pg = Skill.objects.get(name="PostgreSQL").id
+        self.assertEqual(resolve_skill_ids(["postgres", "PostgreSQL 14", "psql", "pg"]), [pg])
+        self.assertEqual(resolve_skill_ids(["k8s", "Golang", "Kubernetes"]),
+                         [Skill.objects.get(name="Kubernetes").id, Skill.objects.get(name="Go").id])
+
+    def test_unknown_phrases_are_not_created(self):
+        skills = Skill.objects.count()
+        terms = ["Python", "3+ years Django", "Underwater basket weaving", "3+ years Django"]
+        self.assertEqual(resolve_skill_ids(terms), [Skill.objects.get(name="Python").id])
+        self.assertEqual(unmatched_terms(terms, {"python": 1}), ["3+ years Django", "Underwater basket weaving"])
+        self.assertEqual(Skill.objects.count(), skills)
+
+    def test_intern_profile_and_job(self):
+        profile = UserProfile(skills=["py", "Docker", "Cobol"],
+                              projects=[{"title": "x", "technologies": ["reactjs", "Fortran"]}])
+        self.assertEqual(intern_profile_skills(profile), ["Cobol", "Fortran"])
+        self.assertEqual(profile.skill_ids, resolve_skill_ids(["Python", "docker"]))
+        self.assertEqual(profile.projects[0]["technology_ids"], resolve_skill_ids(["React"]))
+        job = Job(req_quals=["Python 3", "Jira"], tools=["docker"])
+        self.assertEqual(intern_job_skills(job), ["Jira"])
+        self.assertEqual(job.req_skill_ids, resolve_skill_ids(["python"]))
+
+    def test_synonyms_match_when_scoring(self):
+        job = Job(req_quals=["PostgreSQL", "Kubernetes"], tools=["JavaScript"])
+        profile = UserProfile(skills=["postgres", "k8s", "js"])
+        self.assertEqual(score_profile_against_job(profile, job)[1]["req_match"], 0)  # free text: no overlap
+        intern_job_skills(job)
+        intern_profile_skills(profile)
+        _, summary = score_profile_against_job(profile, job)
+        self.assertEqual((summary["req_match"], summary["tools_match"]), (100, 100))
+
+
+class ResolveSkillsCommandTests(TestCase):
+    def test_backfills_ids_and_indexes(self):
+        company = Company.objects.create(name="Acme")
+        users = [User.objects.create_user(f"cand{i}") for i in range(5)]
+        UserProfile.objects.filter(user__in=users).update(skills=["golang", "Haskell"])
+        for i in range(3):
+            Job.objects.create(company=company, title=f"Job {i}", req_quals=["go"], tools=["Haskell"])
+        self.assertFalse(JobSkill.objects.exists())  # created without going through the form: not interned yet
+        out = StringIO()
+        call_command("resolve_skills", "--batch-size", "2", stdout=out)
+        go = Skill.objects.get(name="Go").id
+        for ids in UserProfile.objects.filter(user__in=users).values_list("skill_ids", flat=True):
+            self.assertEqual(ids, [go])
+        self.assertEqual(ProfileSkill.objects.filter(skill_id=go).count(), 5)
+        self.assertEqual(JobSkill.objects.filter(skill_id=go).count(), 3)
+        self.assertIn("Resolved skills for", out.getvalue())
+        self.assertIn("Haskell", out.getvalue())
@@ -0,0 +1,65 @@
+import re
+from .models import SkillAlias
+
+_SPACES = re.compile(r"\s+")
+_VERSION_SUFFIX = re.compile(r"(\s+v?\d+(\.\d+)*[a-z]?)+$")  # "postgresql 14", "python 3.12", "vue v3"
+
+def normalize(term) -> str:
+    """Lower-case, collapse whitespace, drop a trailing version number."""
+    t = _SPACES.sub(" ", str(term or "")).strip().lower()
+    return _VERSION_SUFFIX.sub("", t) or t
+
+def resolve_skill_map(terms) -> dict:
+    """
+    normalized term → Skill id, in one alias lookup. Only the existing vocabulary
+    matches: free text such as "3+ years Django" is never turned into a Skill
+    (see unmatched_terms; add an alias in the admin and re-run resolve_skills).
+    """
+    display = {}
+    for t in terms or []:
+        n = normalize(t)
+        if n:
+            display.setdefault(n, str(t).strip())
+    if not display:
+        return {}
+    return dict(SkillAlias.objects.filter(alias__in=display).values_list("alias", "skill_id"))
+
+def resolve_skill_ids(terms) -> list:
+    """Skill ids for `terms`, de-duplicated, in input order."""
+    return _ids(terms, resolve_skill_map(terms))
+
+def unmatched_terms(terms, m) -> list:
+    """The phrases in `terms` that `m` (a resolve_skill_map result) has no Skill for."""
+    out = []
+    for t in terms or []:
+        n = normalize(t)
+        if n and n not in m and str(t).strip() not in out:
+            out.append(str(t).strip())
+    return out
+
+def intern_profile_skills(profile):
+    """Fill profile.skill_ids and each project's technology_ids (no save). Returns the unmatched phrases."""
+    projects = profile.projects or []
+    techs = [t for p in projects if isinstance(p, dict) for t in (p.get("technologies") or [])]
+    m = resolve_skill_map(list(profile.skills or []) + techs)
+    profile.skill_ids = _ids(profile.skills, m)
+    for p in projects:
+        if isinstance(p, dict):
+            p["technology_ids"] = _ids(p.get("technologies"), m)
+    return unmatched_terms(list(profile.skills or []) + techs, m)
+
+def intern_job_skills(job):
+    """Fill job.req_skill_ids / job.tool_skill_ids (no save). Returns the unmatched phrases."""
+    terms = list(job.req_quals or []) + list(job.tools or [])
+    m = resolve_skill_map(terms)
+    job.req_skill_ids = _ids(job.req_quals, m)
+    job.tool_skill_ids = _ids(job.tools, m)
+    return unmatched_terms(terms, m)
+
+def _ids(terms, m):
+    out = []
+    for t in terms or []:
+        sid = m.get(normalize(t))
+        if sid is not None and sid not in out:
+            out.append(sid)
+    return out
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Task
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("id","kind","status","attempts","run_after","created_at")
+    list_filter  = ("status","kind")
+    search_fields = ("kind","last_error")
+    readonly_fields = ("created_at","updated_at","locked_by","locked_at")
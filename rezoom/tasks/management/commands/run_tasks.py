@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from tasks.queue import registered_kinds
+from tasks.worker import run
+
+class Command(BaseCommand):
+    help = "Drain the background task queue (all registered kinds unless --kind is given)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", action="append", help="Only run this task kind (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--processes", type=int, default=1)
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when empty.")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Idle poll interval with --loop.")
+
+    def handle(self, *args, **opts):
+        kinds = opts["kind"] or registered_kinds()
+        unknown = set(kinds) - set(registered_kinds())
+        if unknown:
+            raise CommandError(f"Unknown task kind(s): {', '.join(sorted(unknown))}")
+        done, failed = run(kinds, batch_size=opts["batch_size"], processes=opts["processes"],
+                           loop=opts["loop"], idle_sleep=opts["sleep"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Tasks complete: {done} ok, {failed} failed."))
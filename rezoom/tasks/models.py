@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+
+class Task(models.Model):
+    """
+    DB-backed background job. Request handlers enqueue rows; `run_tasks` claims and
+    executes them in batches (`run_ats_worker` is `run_tasks --kind ats.score`).
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        FAILED  = "failed", "Failed"   # gave up after max attempts; successful tasks are deleted
+
+    kind = models.CharField(max_length=64)                     # handler name, e.g. "ats.score"
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)     # retry backoff pushes this forward
+    locked_by = models.CharField(max_length=64, blank=True)    # claim token of the worker holding it
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "kind", "run_after"]),
+            models.Index(fields=["locked_by"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} [{self.status}]"
@@ -0,0 +1,78 @@
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from .models import Task
+
+_HANDLERS = {}
+
+def register(kind, group_by=None):
+    """
+    Register a batch handler: handler(tasks: list[Task]).
+    `group_by` names a payload key; a claimed batch is split so each call only
+    sees tasks sharing that value (e.g. one job's applications).
+    """
+    def deco(fn):
+        _HANDLERS[kind] = (fn, group_by)
+        return fn
+    return deco
+
+def get_handler(kind):
+    return _HANDLERS[kind]
+
+def registered_kinds():
+    return sorted(_HANDLERS)
+
+def enqueue(kind, payload=None, run_after=None) -> Task:
+    return Task.objects.create(kind=kind, payload=payload or {}, run_after=run_after or timezone.now())
+
+def enqueue_many(kind, payloads, batch_size=1000):
+    now = timezone.now()
+    return Task.objects.bulk_create(
+        [Task(kind=kind, payload=p, run_after=now) for p in payloads], batch_size=batch_size
+    )
+
+def claim(kinds, limit, token=None) -> list:
+    """
+    Atomically take up to `limit` due tasks. Works without row locks: the conditional
+    UPDATE only flips rows still pending, and the token tells us which ones we won.
+    """
+    token = token or uuid.uuid4().hex
+    now = timezone.now()
+    stale = now - timezone.timedelta(seconds=getattr(settings, "TASKS_STALE_SECONDS", 600))
+    # tasks held by a worker that died mid-batch go back to the queue
+    Task.objects.filter(status=Task.Status.RUNNING, locked_at__lt=stale).update(
+        status=Task.Status.PENDING, locked_by="", locked_at=None
+    )
+    ids = list(
+        Task.objects.filter(status=Task.Status.PENDING, kind__in=kinds, run_after__lte=now)
+        .order_by("id").values_list("id", flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    Task.objects.filter(id__in=ids, status=Task.Status.PENDING).update(
+        status=Task.Status.RUNNING, locked_by=token, locked_at=now
+    )
+    return list(Task.objects.filter(locked_by=token, status=Task.Status.RUNNING).order_by("id"))
+
+def complete(tasks, token=None) -> int:
+    """Delete finished tasks (only those still held by `token`, if given). Returns how many."""
+    qs = Task.objects.filter(id__in=[t.id for t in tasks])
+    if token is not None:
+        qs = qs.filter(locked_by=token)
+    return qs.delete()[0]
+
+def fail(tasks, error):
+    """Retry with exponential backoff; give up after TASKS_MAX_ATTEMPTS."""
+    now = timezone.now()
+    max_attempts = getattr(settings, "TASKS_MAX_ATTEMPTS", 5)
+    base = getattr(settings, "TASKS_RETRY_BASE_SECONDS", 30)
+    for t in tasks:
+        t.attempts += 1
+        t.last_error = str(error)[:2000]
+        t.locked_by, t.locked_at = "", None
+        if t.attempts >= max_attempts:
+            t.status = Task.Status.FAILED
+        else:
+            t.status = Task.Status.PENDING
+            t.run_after = now + timezone.timedelta(seconds=base * 2 ** (t.attempts - 1))
+    Task.objects.bulk_update(tasks, ["attempts", "last_error", "locked_by", "locked_at", "status", "run_after"])
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from companies.models import Company
+from . import queue
+from .models import Task
+from .queue import claim, enqueue, enqueue_many, fail
+from .worker import run, run_group
+
+
+class QueueTests(TestCase):
+    def test_claim_takes_due_pending_tasks_once(self):
+        due = enqueue_many("t.a", [{"n": i} for i in range(3)])
+        enqueue("t.a", {"n": 9}, run_after=timezone.now() + timedelta(hours=1))
+        enqueue("t.b", {"n": 0})
+        first = claim(["t.a"], 2)
+        self.assertEqual([t.id for t in first], [t.id for t in due[:2]])
+        self.assertEqual({t.locked_by for t in first} - {""}, {first[0].locked_by})
+        self.assertEqual([t.id for t in claim(["t.a"], 10)], [due[2].id])
+        self.assertEqual(claim(["t.a"], 10), [])
+
+    @override_settings(TASKS_MAX_ATTEMPTS=2, TASKS_RETRY_BASE_SECONDS=30)
+    def test_fail_backs_off_then_gives_up(self):
+        enqueue("t.a")
+        task = claim(["t.a"], 1)[0]
+        fail([task], ValueError("boom"))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts, task.last_error, task.locked_by),
+                         (Task.Status.PENDING, 1, "boom", ""))
+        self.assertGreater(task.run_after, timezone.now() + timedelta(seconds=25))
+        Task.objects.filter(pk=task.pk).update(run_after=timezone.now())
+        fail(claim(["t.a"], 1), ValueError("boom"))
+        self.assertEqual(Task.objects.get(pk=task.pk).status, Task.Status.FAILED)
+
+    @override_settings(TASKS_STALE_SECONDS=600)
+    def test_stale_claims_go_back_to_the_queue(self):
+        enqueue("t.a")
+        held = claim(["t.a"], 1)[0]
+        self.assertEqual(claim(["t.a"], 1), [])
+        Task.objects.filter(pk=held.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+        again = claim(["t.a"], 1)
+        self.assertEqual([t.id for t in again], [held.id])
+        self.assertNotEqual(again[0].locked_by, held.locked_by)
+
+
+class WorkerTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.dict(queue._HANDLERS, {"t.group": (self._handler, "key")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _handler(self, tasks):
+        self.calls.append(sorted(t.payload["key"] for t in tasks))
+        Company.objects.create(name=f"written by batch {len(self.calls)}")
+        if any(t.payload.get("boom") for t in tasks):
+            raise RuntimeError("boom")
+
+    def test_groups_by_payload_key_and_isolates_failures(self):
+        enqueue_many("t.group", [{"key": k} for k in "abab"] + [{"key": "c", "boom": True}])
+        with self.assertLogs("tasks.worker", "ERROR"):
+            done, failed = run(["t.group"])
+        self.assertEqual((done, failed), (4, 1))
+        self.assertEqual(sorted(self.calls), [["a", "a"], ["b", "b"], ["c"]])
+        self.assertEqual(list(Task.objects.values_list("status", flat=True)), [Task.Status.PENDING])
+        self.assertEqual(Company.objects.count(), 2)  # the failed batch rolled back
+
+    def test_reclaimed_batch_rolls_back(self):
+        enqueue("t.group", {"key": "a"})
+        task = claim(["t.group"], 1)[0]
+
+        def slow_handler(tasks):
+            self._handler(tasks)
+            # meanwhile the claim went stale and another worker took the task (here on the
+            # same connection, so the takeover rolls back with the batch)
+            Task.objects.filter(pk=task.pk).update(locked_by="other-worker")
+
+        with mock.patch.dict(queue._HANDLERS, {"t.group": (slow_handler, "key")}), \
+                self.assertLogs("tasks.worker", "WARNING"):
+            self.assertEqual(run_group("t.group", [task.id], task.locked_by), 0)
+        self.assertFalse(Company.objects.exists())  # nothing from the losing run is kept
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())  # not completed by the losing run
@@ -0,0 +1,83 @@
+import logging
+import multiprocessing
+import time
+import uuid
+from django.db import connections, transaction
+from .models import Task
+from .queue import claim, complete, fail, get_handler
+
+log = logging.getLogger(__name__)
+
+def _init_process():
+    import django
+    django.setup()  # no-op under fork; needed for spawn start method
+
+class Reclaimed(Exception):
+    """The claim went stale (TASKS_STALE_SECONDS) and another worker took the tasks."""
+
+def run_group(kind, ids, token) -> int:
+    """
+    Run one handler call for task ids claimed under `token`. Safe to call in a child process.
+    The tasks are completed inside the handler's transaction: if a slow batch was
+    requeued and picked up by another worker meanwhile, only one run commits.
+    """
+    tasks = list(Task.objects.filter(id__in=ids, locked_by=token).order_by("id"))
+    if not tasks:
+        return 0
+    handler, _ = get_handler(kind)
+    try:
+        with transaction.atomic():
+            handler(tasks)
+            if complete(tasks, token) < len(tasks):
+                raise Reclaimed
+    except Reclaimed:
+        log.warning("task %s: %d tasks were reclaimed by another worker; rolled back", kind, len(tasks))
+        return 0
+    except Exception as e:
+        log.exception("task %s failed for %d tasks", kind, len(tasks))
+        fail(tasks, e)
+        return 0
+    return len(tasks)
+
+def _groups(tasks):
+    groups = {}
+    for t in tasks:
+        _, key = get_handler(t.kind)
+        groups.setdefault((t.kind, t.payload.get(key) if key else None), []).append(t.id)
+    return groups
+
+def run(kinds, batch_size=500, processes=1, loop=False, idle_sleep=2.0, stdout=None):
+    """
+    Drain tasks of `kinds`. The parent claims a batch, splits it by handler group and
+    fans groups out to a process pool (processes > 1) or runs them inline.
+    Returns (done, failed) counts.
+    """
+    pool = None
+    if processes > 1:
+        connections.close_all()  # children must open their own DB connections
+        pool = multiprocessing.Pool(processes, initializer=_init_process)
+    done = failed = 0
+    try:
+        while True:
+            token = uuid.uuid4().hex
+            tasks = claim(kinds, batch_size, token)
+            if not tasks:
+                if not loop:
+                    break
+                time.sleep(idle_sleep)
+                continue
+            groups = list(_groups(tasks).items())
+            if pool:
+                results = pool.starmap(run_group, [(kind, ids, token) for (kind, _), ids in groups])
+            else:
+                results = [run_group(kind, ids, token) for (kind, _), ids in groups]
+            ok = sum(results)
+            done += ok
+            failed += len(tasks) - ok
+            if stdout:
+                stdout.write(f"batch: {len(tasks)} tasks in {len(groups)} groups, {ok} ok")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return done, failed